@@ -11,11 +11,14 @@ from nfem.model import Model
 from nfem.node import Node
 from nfem.truss import Truss
 from nfem.spring import Spring
-from nfem.assembler import Assembler
+from nfem.assembler import Assembler, ElementMethod
+from nfem.eigen_solver import EigenTracker
 
 from nfem.newton_raphson import newton_raphson_solve
 
 from nfem.bracketing import bracketing
+from nfem.critical_point import solve_critical_point
+from nfem.parameter_sweep import CriticalLoad, LoadDisplacementCurve, sweep
 
 from nfem.visualization import *
 
@@ -50,8 +53,14 @@ __all__ = [
     'Truss',
     'Spring',
     'Assembler',
+    'ElementMethod',
+    'EigenTracker',
     'newton_raphson_solve',
     'bracketing',
+    'solve_critical_point',
+    'sweep',
+    'LoadDisplacementCurve',
+    'CriticalLoad',
     'info',
     'show_load_displacement_curve',
     'show_animation',
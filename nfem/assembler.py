@@ -1,12 +1,207 @@
-"""This module only contains the Assembler class.
+"""This module contains the Assembler class.
 
 Author: Thomas Oberbichler
 """
 
+import itertools
+from copy import copy
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, diags
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import splu
+
+from nfem.truss import Truss
+from nfem.truss_batch import TrussBatch
+
+
+class ElementMethod:
+    """Callback which calls a method of an element e.g. `calculate_stiffness_matrix`.
+
+    Unlike a lambda function, the callback declares which method it calls. An ElementGroup
+    with a batch evaluates it for all elements at once if the batch provides the method
+    (see `TrussBatch.batch_methods`).
+
+    Attributes
+    ----------
+    name : str
+        Name of the method.
+    args : tuple
+        Positional arguments of the method.
+    kwargs : dict
+        Keyword arguments of the method.
+    """
+
+    def __init__(self, name, *args, **kwargs):
+        """Create a new ElementMethod
+
+        Parameters
+        ----------
+        name : str
+            Name of the method e.g. 'calculate_stiffness_matrix'.
+        args, kwargs :
+            Arguments of the method e.g. `linear=True`.
+        """
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self, element):
+        return getattr(element, self.name)(*self.args, **self.kwargs)
+
+
+class ElementGroup:
+    """An ElementGroup contains elements of the same type and the precomputed scatter indices
+    to add their element matrices/vectors to the system.
+
+    Attributes
+    ----------
+    elements : list
+        List of the elements in the group.
+    batch : object
+        Object which evaluates all elements at once (e.g. a `TrussBatch`) or `None` if the
+        elements are evaluated one by one.
+    indices : ndarray
+        Global index of each local dof (N, m). Inactive dofs have the index -1.
+    vector_entries : ndarray
+        Flat indices of the active entries in a stack of element vectors (N, m).
+    vector_rows : ndarray
+        Global rows of the `vector_entries`.
+    matrix_entries : ndarray
+        Flat indices of the active entries in a stack of element matrices (N, m, m).
+    matrix_rows : ndarray
+        Global rows of the `matrix_entries`.
+    matrix_cols : ndarray
+        Global columns of the `matrix_entries`.
+    """
+
+    def __init__(self, elements, indices, batch=None):
+        """Create a new ElementGroup
+
+        Parameters
+        ----------
+        elements : list
+            List of elements with the same number of dofs.
+        indices : ndarray
+            Global index of each local dof (N, m). Inactive dofs have the index -1.
+        batch : object, optional
+            Object which evaluates all elements at once.
+        """
+        element_count, m = indices.shape
+
+        is_active = indices != -1
+
+        matrix_mask = is_active[:, :, None] & is_active[:, None, :]
+
+        self._elements = elements
+        self._source = None
+        self._get_elements = None
+        self.batch = batch
+        self.indices = indices
+        self.vector_entries = np.flatnonzero(is_active)
+        self.vector_rows = indices.reshape(-1)[self.vector_entries]
+        self.matrix_entries = np.flatnonzero(matrix_mask)
+        self.matrix_rows = np.broadcast_to(indices[:, :, None], (element_count, m, m)).reshape(-1)[self.matrix_entries]
+        self.matrix_cols = np.broadcast_to(indices[:, None, :], (element_count, m, m)).reshape(-1)[self.matrix_entries]
+
+    def __len__(self):
+        return len(self.indices)
+
+    @property
+    def elements(self):
+        if self._elements is None:
+            # the elements of a rebound group are looked up by the ids of the original ones
+            elements = self._get_elements()
+            self._elements = [elements[element.id] for element in self._source]
+            self._source = None
+            self._get_elements = None
+        return self._elements
+
+    def _rebind(self, dof_state, element_state, get_elements):
+        # group with the same indices for the elements of a copy of the model. The elements
+        # are only requested if they are evaluated one by one
+        group = copy(self)
+        group._source = self._elements if self._elements is not None else self._source
+        group._elements = None
+        group._get_elements = get_elements
+        if self.batch is not None:
+            group.batch = self.batch._rebind(dof_state, element_state, lambda: group.elements)
+        return group
+
+    def calculate(self, calculate_element_function, shape):
+        """Evaluate the callback for all elements of the group.
+
+        An `ElementMethod` is evaluated by the batch if the batch provides the method. Other
+        callbacks are evaluated element by element.
+
+        Parameters
+        ----------
+        calculate_element_function : function Element -> ndarray
+            Function to calculate the element matrix or vector.
+        shape : tuple
+            Shape of a single element result.
+
+        Returns
+        -------
+        stack : ndarray or None
+            Stack with the results of all elements or `None` if no element has a result.
+        """
+        if self.batch is not None and isinstance(calculate_element_function, ElementMethod) and \
+                calculate_element_function.name in self.batch.batch_methods:
+            return calculate_element_function(self.batch)
+
+        stack = None
+
+        for i, element in enumerate(self.elements):
+            result = calculate_element_function(element)
+
+            if result is None:
+                continue
+
+            if stack is None:
+                stack = np.zeros((len(self.elements),) + shape)
+
+            stack[i] = result
+
+        return stack
+
+
+ORDERINGS = [None, 'rcm', 'mmd']
+
+_numberings = itertools.count(1)
+
+
+def _dof_permutation(rows, cols, dof_count, ordering):
+    """Get the new order of the dofs for the sparsity pattern given by rows and cols.
+
+    Returns
+    -------
+    permutation : ndarray
+        Old index of the dof at each new index.
+    """
+    pattern = coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(dof_count, dof_count)).tocsr()
+
+    if ordering == 'rcm':
+        return np.asarray(reverse_cuthill_mckee(pattern, symmetric_mode=True), dtype=int)
+
+    # the column ordering of SuperLU is only available after a factorization. A diagonally
+    # dominant matrix with the same pattern is factorized without pivoting
+    pattern.data[:] = -1.0
+    degree = np.asarray(abs(pattern).sum(axis=1)).ravel()
+    matrix = csc_matrix(pattern + diags(degree + 1.0))
+
+    return np.asarray(splu(matrix, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0,
+                           options=dict(SymmetricMode=True)).perm_c.argsort(), dtype=int)
+
 
 class Assembler:
     """An Assembler helps to generate system matrices/vectors from elements.
 
+    By default the dofs are numbered in the order of the elements. An ordering reduces the
+    bandwidth (reverse Cuthill-McKee) or the fill-in of a factorization (minimum degree). It
+    is computed once when the Assembler is created, so it applies to all vectors and matrices
+    of the Assembler. `dofs`, `dof_indices` and `state_indices` map the entries back to the dofs.
+
     Attributes
     ----------
     dofs : list
@@ -16,56 +211,158 @@ class Assembler:
         in the dofs-list.
     dof_count : int
         Total number of dofs.
-    element_freedom_table : list
-        List with tuples containing the elements and the coresponding dof indices.
+    ordering : str or None
+        Ordering of the dofs.
+    bandwidth : int
+        Largest distance between the row and the column of an entry in a system matrix.
+    state_indices : ndarray
+        Index of each dof in the `DofState` of the model.
+    element_groups : list
+        List of `ElementGroup` objects. All trusses are evaluated as one `TrussBatch`. Other
+        elements are grouped by type and number of dofs.
+    sparse_rows : ndarray
+        Row indices of all nonzero entries in a sparse system matrix.
+    sparse_cols : ndarray
+        Column indices of all nonzero entries in a sparse system matrix.
+    numbering : int
+        Token which identifies the numbering of the dofs. The Assemblers for the copies of a
+        model with the same topology share the token (see `rebind`).
     """
 
-    def __init__(self, model):
+    def __init__(self, model, ordering=None):
         """Create a new Assembler
 
         Parameters
         ----------
         model : Model
             Model to assemble.
+        ordering : str, optional
+            Ordering of the dofs. Available options:
+            - None: order of the elements
+            - rcm: reverse Cuthill-McKee ordering for a small bandwidth
+            - mmd: multiple minimum degree ordering (SuperLU) for a small fill-in
         """
+        if ordering not in ORDERINGS:
+            raise ValueError(f'Invalid dof ordering: {ordering}')
 
         # --- dof indices
 
-        dofs = list()
+        dof_indices = dict()
 
         for element in model.elements:
             for dof in element.dofs:
-                if dof in dofs or not dof.is_active:
+                if not dof.is_active or dof in dof_indices:
                     continue
-                dofs.append(dof)
+                dof_indices[dof] = len(dof_indices)
 
-        dofs = dofs
+        dofs = list(dof_indices)
 
-        dof_indices = {dof: index for index, dof in enumerate(dofs)}
+        # --- element groups
 
-        # --- element freedom table
-
-        element_freedom_table = list()
+        grouped_elements = dict()
 
         for element in model.elements:
-            indices = []
+            element_dofs = element.dofs
 
-            for local_index, dof in enumerate(element.dofs):
-                if not dof.is_active:
-                    continue
+            key = (type(element), len(element_dofs))
+
+            if key not in grouped_elements:
+                grouped_elements[key] = (list(), list())
+
+            elements, indices = grouped_elements[key]
+
+            elements.append(element)
+            indices.append([dof_indices[dof] if dof.is_active else -1 for dof in element_dofs])
+
+        grouped_indices = [np.array(indices, dtype=int).reshape(-1, m)
+                           for (_, m), (_, indices) in grouped_elements.items()]
+
+        # --- reordering
+
+        if ordering is not None and len(dofs) > 1:
+            rows = list()
+            cols = list()
 
-                global_index = dof_indices[dof]
+            for indices in grouped_indices:
+                m = indices.shape[1]
+                rows.append(np.repeat(indices, m, axis=1).reshape(-1))
+                cols.append(np.tile(indices, (1, m)).reshape(-1))
 
-                indices.append((local_index, global_index))
+            rows = np.concatenate(rows)
+            cols = np.concatenate(cols)
+            is_active = (rows != -1) & (cols != -1)
 
-            element_freedom_table.append((element, indices))
+            permutation = _dof_permutation(rows[is_active], cols[is_active], len(dofs), ordering)
+
+            new_indices = np.empty(len(dofs), dtype=int)
+            new_indices[permutation] = np.arange(len(dofs))
+
+            dofs = [dofs[i] for i in permutation]
+            dof_indices = {dof: i for i, dof in enumerate(dofs)}
+
+            grouped_indices = [np.where(indices != -1, new_indices[indices], -1) for indices in grouped_indices]
+
+        element_groups = list()
+
+        for ((element_type, m), (elements, _)), indices in zip(grouped_elements.items(), grouped_indices):
+            batch = TrussBatch(elements) if element_type is Truss else None
+            element_groups.append(ElementGroup(elements, indices, batch))
 
         # --- store
 
-        self.dofs = dofs
+        self._dofs = dofs
+        self._dof_source = None
+        self._get_nodes = None
         self.dof_indices = dof_indices
         self.dof_count = len(dofs)
-        self.element_freedom_table = element_freedom_table
+        self.state_indices = np.array([dof._index for dof in dofs], dtype=int)
+        self.element_groups = element_groups
+        self.sparse_rows = np.concatenate([group.matrix_rows for group in element_groups] + [np.zeros(0, int)])
+        self.sparse_cols = np.concatenate([group.matrix_cols for group in element_groups] + [np.zeros(0, int)])
+        self.ordering = ordering
+        self.bandwidth = int(np.max(np.abs(self.sparse_rows - self.sparse_cols), initial=0))
+        self.numbering = next(_numberings)
+
+    def rebind(self, model):
+        """Create an Assembler with the same numbering for a copy of the model.
+
+        The copy has to have the same topology (nodes, elements and supports) as the model of
+        this Assembler. The numbering and the scatter indices are shared. The batches gather
+        the values from the `DofState` and the `ElementState` of the copy through the stored
+        indices, so the nodes and elements of the copy are not created. The dofs and the
+        elements which are evaluated one by one are requested from the copy on first use.
+
+        Parameters
+        ----------
+        model : Model
+            Copy of the model.
+
+        Returns
+        -------
+        assembler : Assembler
+            Assembler for the copy.
+        """
+        assembler = copy(self)
+
+        # the dofs are compared by their ids, so the indices are shared. The dofs of the copy
+        # are only created on request
+        assembler._dof_source = self._dofs if self._dofs is not None else self._dof_source
+        assembler._dofs = None
+        assembler._get_nodes = lambda: model.nodes
+        assembler.element_groups = [group._rebind(model._dof_state, model._element_state, lambda: model.elements)
+                                    for group in self.element_groups]
+
+        return assembler
+
+    @property
+    def dofs(self):
+        """List of all dofs in the system."""
+        if self._dofs is None:
+            nodes = self._get_nodes()
+            self._dofs = [nodes[node_id].dof(dof_type) for node_id, dof_type in (dof.id for dof in self._dof_source)]
+            self._dof_source = None
+            self._get_nodes = None
+        return self._dofs
 
     def index_of_dof(self, dof):
         """Get the index of the given dof.
@@ -82,6 +379,17 @@ class Assembler:
         """
         return self.dof_indices[dof]
 
+    def _matrix_values(self, calculate_element_matrix):
+        for group in self.element_groups:
+            m = group.indices.shape[1]
+
+            element_matrices = group.calculate(calculate_element_matrix, (m, m))
+
+            if element_matrices is None:
+                yield group, None
+            else:
+                yield group, np.asarray(element_matrices, dtype=float).reshape(-1)[group.matrix_entries]
+
     def assemble_matrix(self, system_matrix, calculate_element_matrix):
         """Assemble element matrices into a system matrix.
 
@@ -92,16 +400,62 @@ class Assembler:
         calculate_element_matrix : function Element -> ndarray
             Function to calculate the element matrix.
         """
-        for element, indices in self.element_freedom_table:
-            element_matrix = calculate_element_matrix(element)
+        for group, values in self._matrix_values(calculate_element_matrix):
+            if values is None:
+                continue
 
-            if element_matrix is None:
+            np.add.at(system_matrix, (group.matrix_rows, group.matrix_cols), values)
+
+    def assemble_sparse_matrix(self, calculate_element_matrix):
+        """Assemble element matrices into a new sparse system matrix.
+
+        Parameters
+        ----------
+        calculate_element_matrix : function Element -> ndarray
+            Function to calculate the element matrix.
+
+        Returns
+        -------
+        system_matrix : scipy.sparse.csr_matrix
+            Sparse system matrix.
+        """
+        values = [np.zeros(len(group.matrix_entries)) if group_values is None else group_values
+                  for group, group_values in self._matrix_values(calculate_element_matrix)]
+
+        values = np.concatenate(values + [np.zeros(0)])
+
+        shape = (self.dof_count, self.dof_count)
+
+        return coo_matrix((values, (self.sparse_rows, self.sparse_cols)), shape=shape).tocsr()
+
+    def assemble_banded_matrix(self, calculate_element_matrix):
+        """Assemble the lower band of a symmetric system matrix.
+
+        The band is stored in the LAPACK format band[i - j, j] = a[i, j] and can be factorized
+        with `BandedCholesky.from_lower_band`.
+
+        Parameters
+        ----------
+        calculate_element_matrix : function Element -> ndarray
+            Function to calculate the element matrix.
+
+        Returns
+        -------
+        band : ndarray
+            Lower band of the system matrix (bandwidth + 1, n).
+        """
+        band = np.zeros((self.bandwidth + 1, self.dof_count))
+
+        for group, values in self._matrix_values(calculate_element_matrix):
+            if values is None:
                 continue
 
-            for element_row, system_row in indices:
-                for element_col, system_col in indices:
-                    value = element_matrix[element_row, element_col]
-                    system_matrix[system_row, system_col] += value
+            lower = group.matrix_rows >= group.matrix_cols
+            rows, cols = group.matrix_rows[lower], group.matrix_cols[lower]
+
+            np.add.at(band, (rows - cols, cols), values[lower])
+
+        return band
 
     def assemble_vector(self, system_vector, calculate_element_vector):
         """Assemble element vectors into a system vector.
@@ -113,11 +467,14 @@ class Assembler:
         calculate_element_vector : function Element -> ndarray
             Function to calculate the element vector.
         """
-        for element, indices in self.element_freedom_table:
-            element_vector = calculate_element_vector(element)
+        for group in self.element_groups:
+            m = group.indices.shape[1]
+
+            element_vectors = group.calculate(calculate_element_vector, (m,))
 
-            if element_vector is None:
+            if element_vectors is None:
                 continue
 
-            for element_row, system_row in indices:
-                system_vector[system_row] += element_vector[element_row]
+            values = np.asarray(element_vectors, dtype=float).reshape(-1)[group.vector_entries]
+
+            system_vector[:self.dof_count] += np.bincount(group.vector_rows, values, minlength=self.dof_count)
@@ -11,7 +11,8 @@ def bracketing(model, tol=1e-7, max_steps=100, raise_error=True, **options):
     - A first nonlinear step needs to be solved already.
     - Det(K) has to be solved for the model.
 
-    1. The algorithm searches for a sign change of Det(K).
+    1. The algorithm searches for a sign change of Det(K). The sign and log|Det(K)| of the
+        factorization are used, so Det(K) does not over- or underflow for large models.
         This is done by using a 'last-increment-prediction' and 'arc-length-control'
     2. A bisection algorithm is used to find the Det(K)=0 point.
         Again 'arc-length-control' strategy is used.
@@ -48,14 +49,19 @@ def bracketing(model, tol=1e-7, max_steps=100, raise_error=True, **options):
     if model_1 is None:
         raise RuntimeError('One step has to be solved before using the bracketing function.')
 
-    if model_0.det_k is None:
+    if model_0.log_det_k is None:
         model_0.solve_det_k()
-    det_k_0 = model_0.det_k
 
-    if model_1.det_k is None:
+    if model_1.log_det_k is None:
         model_1.solve_det_k()
-    det_k_1 = model_1.det_k
 
+    # det(K) is scaled by |det(K)| of the initial model to avoid over- and underflows.
+    # The signs and the checks of the tolerances are evaluated with the logarithms.
+    log_det_k_initial = initial_model.log_det_k
+    log_tol = np.log(tol)
+
+    det_k_0 = _scaled_det_k(model_0, log_det_k_initial)
+    det_k_1 = _scaled_det_k(model_1, log_det_k_initial)
     det_k_2 = None
 
     delta_0 = det_k_0 - det_k_1
@@ -69,17 +75,21 @@ def bracketing(model, tol=1e-7, max_steps=100, raise_error=True, **options):
     while step < max_steps and not success:
 
         # check if critical point has been found
-        if abs(det_k_0) < tol:
+        with np.errstate(divide='ignore'):
+            log_delta_0 = np.log(abs(delta_0)) + log_det_k_initial
+
+        if model_0.log_det_k < log_tol:
             print('\n=================================')
-            print('Converged to Det(K) = {}'.format(det_k_0))
+            print('Converged to Det(K) = {}'.format(model_0.det_k))
             success = True
             break
-        elif abs(det_k_0 / initial_model.det_k) < tol:
+        elif model_0.log_det_k - log_det_k_initial < log_tol:
             print('\n=================================')
-            print('Converged to relative value Det(K)/Det(K)_initial = {}'.format(det_k_0 / initial_model.det_k))
+            print('Converged to relative value Det(K)/Det(K)_initial = {}'.format(
+                det_k_0 * initial_model.det_k_sign))
             success = True
             break
-        elif abs(det_k_0 - det_k_1) < tol:
+        elif log_delta_0 < log_tol:
             print('\n=================================')
             print('WARNING: Converged at stationary point for Det(K)!')
             success = True
@@ -94,7 +104,8 @@ def bracketing(model, tol=1e-7, max_steps=100, raise_error=True, **options):
 
             model_0 = model_0.get_duplicate()
 
-            model_0.predict_tangential(strategy="arc-length")
+            model_0.predict_tangential(strategy="arc-length", sparse=options.get('sparse', False),
+                                       solver=options.get('solver', None))
 
             model_0.perform_non_linear_solution_step(strategy='arc-length-control', **options)
 
@@ -116,9 +127,9 @@ def bracketing(model, tol=1e-7, max_steps=100, raise_error=True, **options):
         model_1 = model_0.get_previous_model()
         model_2 = model_1.get_previous_model()
 
-        det_k_2 = model_2.det_k
-        det_k_1 = model_1.det_k
-        det_k_0 = model_0.det_k
+        det_k_2 = _scaled_det_k(model_2, log_det_k_initial)
+        det_k_1 = _scaled_det_k(model_1, log_det_k_initial)
+        det_k_0 = _scaled_det_k(model_0, log_det_k_initial)
 
         delta_1 = det_k_1 - det_k_2
         delta_0 = det_k_0 - det_k_1
@@ -132,6 +143,12 @@ def bracketing(model, tol=1e-7, max_steps=100, raise_error=True, **options):
     return model_0
 
 
+def _scaled_det_k(model, log_reference):
+    """Get det(K) of the model divided by the positive reference exp(log_reference)."""
+    with np.errstate(over='ignore'):
+        return model.det_k_sign * np.exp(model.log_det_k - log_reference)
+
+
 def minmax(model, **options):
     """does a 3-point node search for a local mininmum/maximum. where model is the middle point.
     It returns the estimated position inside model +- arclength"""
@@ -140,16 +157,18 @@ def minmax(model, **options):
     model_2 = model
     model_3 = model_2.get_duplicate()
 
-    model_3.predict_tangential(strategy="arc-length")
+    model_3.predict_tangential(strategy="arc-length", sparse=options.get('sparse', False),
+                               solver=options.get('solver', None))
 
     model_3.perform_non_linear_solution_step(strategy='arc-length-control', **options)
 
     x1 = 0.0
     x2 = np.linalg.norm(model_2.get_increment_vector())
     x3 = x2 + np.linalg.norm(model_3.get_increment_vector())
-    y1 = model_1.det_k
-    y2 = model_2.det_k
-    y3 = model_3.det_k
+    # the position of the extremum does not depend on the scaling of det(K)
+    y1 = _scaled_det_k(model_1, model_1.log_det_k)
+    y2 = _scaled_det_k(model_2, model_1.log_det_k)
+    y3 = _scaled_det_k(model_3, model_1.log_det_k)
 
     denom = (x1 - x2) * (x1 - x3) * (x2 - x3)
     A = (x3 * (y2 - y1) + x2 * (y1 - y3) + x1 * (y3 - y2)) / denom
@@ -163,7 +182,8 @@ def minmax(model, **options):
     elif xv >= x2:
         model = model_2.get_duplicate()
 
-        model.predict_tangential(strategy="arc-length")
+        model.predict_tangential(strategy="arc-length", sparse=options.get('sparse', False),
+                                 solver=options.get('solver', None))
 
         model.scale_prediction((xv-x2)/(x3-x2))
 
@@ -173,7 +193,8 @@ def minmax(model, **options):
     elif xv >= x1:
         model = model_1.get_duplicate()
 
-        model.predict_tangential(strategy="arc-length")
+        model.predict_tangential(strategy="arc-length", sparse=options.get('sparse', False),
+                                 solver=options.get('solver', None))
 
         model.scale_prediction((xv)/(x2))
 
@@ -205,7 +226,7 @@ def bisection(model, **options):
 
     tmp_model.perform_non_linear_solution_step(strategy='arc-length-control', **options)
 
-    if np.sign(lower_limit_model.det_k) == np.sign(tmp_model.det_k):
+    if lower_limit_model.det_k_sign == tmp_model.det_k_sign:
         model._previous_model = tmp_model
     else:
         model = tmp_model
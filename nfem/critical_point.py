@@ -0,0 +1,151 @@
+"""This file contains the direct solver for critical points"""
+
+import numpy as np
+from numpy.linalg import norm
+from scipy.sparse import bmat, csr_matrix
+
+from nfem.assembler import ElementMethod
+from nfem.model_status import ModelStatus
+from nfem.solve import assemble_matrix, newton_raphson_solve
+
+
+def _initial_mode(model, assembler, sparse, solver):
+    """Get an approximation of the critical mode from a previous critical point, the attendant
+    eigenvalue analysis or by inverse iteration with the tangent stiffness."""
+    eigenvector_model = model.critical_mode_model or model.first_eigenvector_model
+
+    if eigenvector_model is not None:
+        phi = eigenvector_model.get_displacement_vector(assembler)
+        if norm(phi) > 0:
+            return phi / norm(phi)
+
+    factorization = model.get_stiffness_factorization(assembler, sparse, solver)
+
+    phi = np.ones(assembler.dof_count)
+
+    for _ in range(3):
+        phi = factorization.solve(phi)
+        phi /= norm(phi)
+
+    return phi
+
+
+def solve_critical_point(model, tolerance=1e-7, max_iterations=20, sparse=False, solver=None, **options):
+    """Computes the critical point close to the state of the model directly.
+
+    Newton's method is applied to the extended system
+
+        R(u, lambda) = 0
+        K(u) phi = 0
+        (phi^T phi - 1) / 2 = 0
+
+    The derivative of K(u) phi with respect to u is the directional derivative of K along
+    phi. It is approximated by central differences with two additional assemblies of K.
+
+    The state of the model should be close to the critical point, e.g. the result of a few
+    bracketing steps. The extended system is regular at limit points and at simple
+    bifurcation points.
+
+    Parameters
+    ----------
+    model : Model
+        Model in equilibrium close to the critical point.
+    tolerance : float
+        Tolerance for the norm of the residual of the extended system.
+    max_iterations : int
+        Maximum number of Newton iterations.
+    sparse : bool
+        Flag if the system is assembled and solved as a sparse matrix.
+    solver : str or callable
+        Linear solver backend for the factorizations of the tangent stiffness.
+    options :
+        additional options e.g.
+        - solve_det_k=True: for solving the determinant of k at convergence
+        - solve_attendant_eigenvalue=True: for solving the attendant eigenvalue problem at convergence
+
+    Returns
+    -------
+    critical_model : Model
+        Duplicate of the model at the critical point. The critical mode is stored as
+        `critical_mode_model`. It is also the `first_eigenvector_model` unless the attendant
+        eigenvalue problem is solved, which stores its own eigenvector there.
+    """
+    phi = _initial_mode(model, model.get_assembler(), sparse, solver)
+
+    critical_model = model.get_duplicate()
+
+    assembler = critical_model.get_assembler()
+    n = assembler.dof_count
+
+    def calculate_stiffness(u):
+        critical_model.set_displacement_vector(u, assembler)
+        return assemble_matrix(assembler, ElementMethod('calculate_stiffness_matrix'), sparse)
+
+    def calculate_system(x):
+        u, lam, phi = x[:n], x[n], x[n + 1:]
+
+        critical_model.status = ModelStatus.iteration
+
+        # directional derivative of K along phi
+        epsilon = np.finfo(float).eps**(1 / 3) * max(1.0, norm(u))
+
+        k_plus = calculate_stiffness(u + epsilon * phi)
+        k_minus = calculate_stiffness(u - epsilon * phi)
+
+        dk = (k_plus - k_minus) / (2 * epsilon)
+
+        critical_model.set_displacement_vector(u, assembler)
+        critical_model.load_factor = lam
+
+        k = assemble_matrix(assembler, ElementMethod('calculate_stiffness_matrix'), sparse)
+
+        external_f = critical_model.get_external_force_vector(assembler)
+
+        internal_f = np.zeros(n)
+        assembler.assemble_vector(internal_f, ElementMethod('calculate_internal_forces'))
+
+        rhs = np.concatenate([internal_f - lam * external_f, k @ phi, [(phi @ phi - 1) / 2]])
+
+        if sparse:
+            lhs = bmat([[k, csr_matrix(-external_f[:, None]), None],
+                        [dk, None, k],
+                        [None, None, csr_matrix(phi[None, :])]], format='csr')
+        else:
+            lhs = np.zeros((2 * n + 1, 2 * n + 1))
+            lhs[:n, :n] = k
+            lhs[:n, n] = -external_f
+            lhs[n:2 * n, :n] = dk
+            lhs[n:2 * n, n + 1:] = k
+            lhs[-1, n + 1:] = phi
+
+        return lhs, rhs
+
+    x = np.concatenate([model.get_displacement_vector(assembler), [model.load_factor], phi])
+
+    residual_norm, iterations = newton_raphson_solve(calculate_system, x, max_iterations, tolerance)
+
+    print('Critical point converged after {} iterations. Residual norm: {}'.format(iterations, residual_norm))
+
+    u, lam, phi = x[:n], x[n], x[n + 1:]
+
+    critical_model.set_displacement_vector(u, assembler)
+    critical_model.load_factor = lam
+    critical_model.status = ModelStatus.equilibrium
+
+    # store critical mode as model
+    eigenvector_model = critical_model._copy()
+    eigenvector_model._previous_model = critical_model
+    eigenvector_model.status = ModelStatus.eigenvector
+    eigenvector_model.load_factor = None
+    eigenvector_model.set_displacement_vector(phi if phi[np.argmax(np.abs(phi))] > 0 else -phi, assembler)
+
+    critical_model.critical_mode_model = eigenvector_model
+    critical_model.first_eigenvector_model = eigenvector_model
+
+    if options.get('solve_det_k', True):
+        critical_model.solve_det_k(assembler=assembler, sparse=sparse, solver=solver)
+
+    if options.get('solve_attendant_eigenvalue', False):
+        critical_model.solve_eigenvalues(assembler=assembler, sparse=sparse, solver=solver)
+
+    return critical_model
@@ -1,10 +1,39 @@
+from nfem.dof_state import DofState
+
+
 class Dof:
-    def __init__(self, id, value, is_active=True, external_force=0.0):
+    """A Dof is a view into a `DofState`.
+
+    Attributes
+    ----------
+    id : object
+        Unique ID of the dof.
+    ref_value : float
+        Value in the undeformed reference configuration.
+    value : float
+        Actual value.
+    delta : float
+        Difference between the actual and the reference value.
+    is_active : bool
+        Flag if the dof is active (not supported).
+    external_force : float
+        External force acting at the dof.
+    """
+
+    def __init__(self, id, value, is_active=True, external_force=0.0, state=None):
+        if state is None:
+            state = DofState()
         self.id = id
-        self.ref_value = value
-        self.value = value
-        self.is_active = is_active
-        self.external_force = 0.0
+        self._state = state
+        self._index = state.add(value, is_active, 0.0)
+
+    def _with_state(self, state):
+        # view of the same dof in another state
+        dof = Dof.__new__(Dof)
+        dof.id = self.id
+        dof._state = state
+        dof._index = self._index
+        return dof
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -17,6 +46,38 @@ class Dof:
     def __hash__(self):
         return hash(self.id)
 
+    @property
+    def ref_value(self):
+        return self._state._ref_value[self._index]
+
+    @ref_value.setter
+    def ref_value(self, value):
+        self._state.set_ref_value(self._index, value)
+
+    @property
+    def value(self):
+        return self._state._value[self._index]
+
+    @value.setter
+    def value(self, value):
+        self._state.set_value(self._index, value)
+
+    @property
+    def is_active(self):
+        return bool(self._state._is_active[self._index])
+
+    @is_active.setter
+    def is_active(self, value):
+        self._state.set_is_active(self._index, value)
+
+    @property
+    def external_force(self):
+        return self._state._external_force[self._index]
+
+    @external_force.setter
+    def external_force(self, value):
+        self._state.set_external_force(self._index, value)
+
     @property
     def delta(self):
         return self.value - self.ref_value
@@ -0,0 +1,237 @@
+"""This module only contains the DofState class."""
+
+import itertools
+
+import numpy as np
+
+
+_revisions = itertools.count(1)
+
+
+class DofState:
+    """A DofState stores the state of many dofs in contiguous arrays. A `Dof` is a view
+    into a DofState which is identified by its index.
+
+    Attributes
+    ----------
+    ref_value : ndarray
+        Values of the dofs in the undeformed reference configuration.
+    value : ndarray
+        Actual values of the dofs.
+    external_force : ndarray
+        External forces acting at the dofs.
+    is_active : ndarray
+        Flags if the dofs are active (not supported).
+    topology_version : int
+        Counter which is incremented if a dof is added or the activity of a dof changes.
+    revision : int
+        Token which changes if any data of the state changes. Different data never has the
+        same revision, so it identifies the data also across copies of the state.
+    reference_revision : int
+        Token like `revision` which only changes if a dof is added or a reference value
+        changes.
+
+    A copy of a state only copies the values. The reference values, external forces and
+    activity flags are shared until one of the states modifies them.
+    """
+
+    def __init__(self):
+        """Create a new empty DofState."""
+        self._count = 0
+        self._ref_value = np.zeros(0)
+        self._value = np.zeros(0)
+        self._external_force = np.zeros(0)
+        self._is_active = np.zeros(0, dtype=bool)
+        self._shared = False
+        self.topology_version = 0
+        self.revision = next(_revisions)
+        self.reference_revision = self.revision
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def ref_value(self):
+        return self._ref_value[:self._count]
+
+    @property
+    def value(self):
+        return self._value[:self._count]
+
+    @property
+    def external_force(self):
+        return self._external_force[:self._count]
+
+    @property
+    def is_active(self):
+        return self._is_active[:self._count]
+
+    @property
+    def delta(self):
+        """Gets the difference between the actual and the reference values."""
+        return self.value - self.ref_value
+
+    def _reserve(self, capacity):
+        count = self._count
+
+        for name in ['_ref_value', '_value', '_external_force', '_is_active']:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:count] = old[:count]
+            setattr(self, name, new)
+
+    def _detach(self):
+        # copy the arrays which are shared with another state
+        self._reserve(len(self._value))
+        self._shared = False
+
+    def copy(self):
+        """Create a copy of the state.
+
+        Returns
+        -------
+        state : DofState
+            Copy with its own values. The remaining arrays are copied on write.
+        """
+        state = DofState()
+        state._count = self._count
+        state._ref_value = self._ref_value
+        state._value = self._value.copy()
+        state._external_force = self._external_force
+        state._is_active = self._is_active
+        state._shared = True
+        state.topology_version = self.topology_version
+        state.revision = self.revision
+        state.reference_revision = self.reference_revision
+
+        self._shared = True
+
+        return state
+
+    def add(self, value, is_active=True, external_force=0.0):
+        """Add a new dof to the state.
+
+        Parameters
+        ----------
+        value : float
+            Reference and actual value of the dof.
+        is_active : bool, optional
+            Flag if the dof is active.
+        external_force : float, optional
+            External force acting at the dof.
+
+        Returns
+        -------
+        index : int
+            Index of the new dof.
+        """
+        index = self._count
+
+        if self._shared:
+            self._detach()
+
+        if index == len(self._value):
+            self._reserve(max(8, 2 * index))
+
+        self._ref_value[index] = value
+        self._value[index] = value
+        self._external_force[index] = external_force
+        self._is_active[index] = is_active
+
+        self._count += 1
+        self.topology_version += 1
+        self.revision = next(_revisions)
+        self.reference_revision = self.revision
+
+        return index
+
+    def set_is_active(self, index, value):
+        """Activate or deactivate a dof.
+
+        Parameters
+        ----------
+        index : int
+            Index of the dof.
+        value : bool
+            Flag if the dof is active.
+        """
+        if self._shared:
+            self._detach()
+
+        self._is_active[index] = value
+        self.topology_version += 1
+        self.revision = next(_revisions)
+
+    def set_ref_value(self, index, value):
+        """Sets the reference value of a dof.
+
+        Parameters
+        ----------
+        index : int
+            Index of the dof.
+        value : float
+            Value in the undeformed reference configuration.
+        """
+        if self._shared:
+            self._detach()
+
+        self._ref_value[index] = value
+        self.revision = next(_revisions)
+        self.reference_revision = self.revision
+
+    def set_value(self, index, value):
+        """Sets the actual value of a dof.
+
+        Parameters
+        ----------
+        index : int
+            Index of the dof.
+        value : float
+            Actual value.
+        """
+        self._value[index] = value
+        self.revision = next(_revisions)
+
+    def set_external_force(self, index, value):
+        """Sets the external force of a dof.
+
+        Parameters
+        ----------
+        index : int
+            Index of the dof.
+        value : float
+            External force acting at the dof.
+        """
+        if self._shared:
+            self._detach()
+
+        self._external_force[index] = value
+        self.revision = next(_revisions)
+
+    def get_delta(self, indices):
+        """Gets the delta of the dofs at the given indices.
+
+        Parameters
+        ----------
+        indices : ndarray
+            Indices of the dofs.
+
+        Returns
+        -------
+        delta : ndarray
+            Difference between the actual and the reference values.
+        """
+        return self._value[indices] - self._ref_value[indices]
+
+    def set_delta(self, indices, delta):
+        """Sets the delta of the dofs at the given indices.
+
+        Parameters
+        ----------
+        indices : ndarray
+            Indices of the dofs.
+        delta : ndarray
+            Difference between the actual and the reference values.
+        """
+        self._value[indices] = self._ref_value[indices] + delta
+        self.revision = next(_revisions)
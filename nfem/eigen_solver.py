@@ -0,0 +1,263 @@
+"""This module contains the solvers for the eigenvalue problems of the stability analysis.
+
+The buckling problem
+
+    [ k + eigval * k_g ] * eigvec = 0
+
+is solved for a few eigenvalues. `k` is the elastic stiffness for the linearized
+prebuckling analysis or the material stiffness for the attendant eigenvalue analysis.
+
+Dense problems are solved as the symmetric problem -k_g * eigvec = mu * k * eigvec with
+mu = 1 / eigval (`scipy.linalg.eigh`). For the smallest positive eigenvalues only the largest
+mu are computed. If k is not positive definite, the general QZ algorithm is used instead.
+
+Sparse problems are solved with ARPACK. Only the requested eigenpairs are computed and a
+single matrix is factorized:
+- without a shift, the largest mu of -k_g * eigvec = mu * k * eigvec with mu = 1 / eigval
+  are computed using the factorization of k (`eigsh`).
+- with a shift, the largest theta = 1 / (eigval - shift) of the shift-invert operator
+  (k + shift * k_g)^-1 * -k_g are computed (`eigs`). k + shift * k_g is the tangent
+  stiffness for the attendant analysis. The operator is not symmetric, so it may be
+  indefinite e.g. beyond a critical point.
+"""
+
+import numpy as np
+from numpy.linalg import norm
+from scipy.linalg import eig, eigh
+from scipy.sparse import issparse
+from scipy.sparse.linalg import ArpackError, ArpackNoConvergence, LinearOperator, eigs, eigsh
+
+from nfem.linear_solver import factorize
+
+
+def _normalize(eigvecs):
+    """Scale the eigenvectors to unit length with a positive largest component."""
+    eigvecs = eigvecs / np.linalg.norm(eigvecs, axis=0)
+    largest = np.argmax(np.abs(eigvecs), axis=0)
+    signs = np.sign(eigvecs[largest, np.arange(eigvecs.shape[1])])
+    signs[signs == 0] = 1
+    return eigvecs * signs
+
+
+def _select(eigvals, eigvecs, shift, count):
+    """Select the smallest positive eigenvalues or the eigenvalues closest to the shift."""
+    if shift is None:
+        idx = np.flatnonzero(eigvals > 0.0)
+        idx = idx[np.argsort(eigvals[idx])]
+    else:
+        idx = np.argsort(np.abs(eigvals - shift))
+
+    idx = idx[:count]
+
+    return eigvals[idx], _normalize(eigvecs[:, idx])
+
+
+def _solve_general(k, k_g, shift, count):
+    eigvals, eigvecs = eig(k, -k_g)
+
+    # extract real parts of eigenvalues
+    eigvals = eigvals.real
+    eigvecs = eigvecs.real
+
+    return _select(eigvals, eigvecs, shift, count)
+
+
+def _solve_symmetric(k, k_g, shift, count):
+    n = k.shape[0]
+
+    if shift is None:
+        # the smallest positive eigenvalues are the largest mu = 1 / eigval
+        mu, eigvecs = eigh(-k_g, k, subset_by_index=[max(n - count, 0), n - 1], check_finite=False)
+    else:
+        mu, eigvecs = eigh(-k_g, k, check_finite=False)
+
+    nonzero = mu != 0.0
+
+    eigvals = 1.0 / mu[nonzero]
+    eigvecs = eigvecs[:, nonzero]
+
+    return _select(eigvals, eigvecs, shift, count)
+
+
+def _solve_dense(k, k_g, shift, count):
+    try:
+        return _solve_symmetric(k, k_g, shift, count)
+    except np.linalg.LinAlgError:
+        # k is not positive definite
+        return _solve_general(k, k_g, shift, count)
+
+
+def _solve_shift_invert(k, k_g, shift, count, v0=None, factorization=None, tolerance=0):
+    is_own_factorization = factorization is None
+
+    if is_own_factorization:
+        factorization = factorize(k + shift * k_g)
+
+    # the largest theta of (k + shift * k_g)^-1 * -k_g are the eigenvalues closest to the
+    # shift with eigval = shift + 1 / theta
+    op = LinearOperator(k.shape, matvec=lambda x: factorization.solve(-(k_g @ x)), dtype=float)
+
+    # a larger Krylov subspace than the default (2 * count + 1) avoids frequent restarts
+    ncv = min(k.shape[0], max(2 * count + 1, 20))
+
+    theta, eigvecs = eigs(op, k=count, which='LM', v0=v0, ncv=ncv, tol=tolerance)
+
+    eigvals = shift + 1.0 / theta.real
+
+    # the eigenvalues are real. Remove the arbitrary complex phase of the eigenvectors
+    largest = np.argmax(np.abs(eigvecs), axis=0)
+    phases = eigvecs[largest, np.arange(eigvecs.shape[1])]
+    eigvecs = (eigvecs * (np.abs(phases) / phases)).real
+
+    # a given factorization has to belong to k + shift * k_g
+    residual = k @ eigvecs + (k_g @ eigvecs) * eigvals
+
+    if norm(residual) > np.sqrt(np.finfo(float).eps) * norm(k @ eigvecs):
+        if is_own_factorization:
+            raise RuntimeError('Eigenvalue solution is inaccurate')
+        return _solve_shift_invert(k, k_g, shift, count, v0, None, tolerance)
+
+    return _select(eigvals, eigvecs, shift, count)
+
+
+def _solve_sparse(k, k_g, shift, count):
+    if shift is not None:
+        return _solve_shift_invert(k, k_g, shift, count)
+
+    # the smallest positive eigenvalues are the largest mu = 1 / eigval
+    mu, eigvecs = eigsh(-k_g, k=count, M=k.tocsc(), which='LA')
+
+    nonzero = mu != 0.0
+
+    eigvals = 1.0 / mu[nonzero]
+    eigvecs = eigvecs[:, nonzero]
+
+    return _select(eigvals, eigvecs, shift, count)
+
+
+def solve_buckling_eigenvalues(k, k_g, shift=None, count=1):
+    """Solve the buckling problem [ k + eigval * k_g ] * eigvec = 0 for a few eigenpairs.
+
+    Parameters
+    ----------
+    k : ndarray or scipy.sparse matrix
+        Symmetric positive definite stiffness matrix.
+    k_g : ndarray or scipy.sparse matrix
+        Symmetric geometric stiffness matrix.
+    shift : float, optional
+        Target of the eigenvalues. If not given, the smallest positive eigenvalues are
+        computed (e.g. for the linearized prebuckling analysis). Otherwise the eigenvalues
+        closest to the shift (e.g. 1 for the attendant eigenvalue analysis).
+    count : int, optional
+        Number of requested eigenpairs.
+
+    Returns
+    -------
+    eigvals : ndarray
+        Eigenvalues sorted by their distance to the target. There might be less than `count`.
+    eigvecs : ndarray
+        Eigenvectors as columns with unit length.
+    """
+    if issparse(k):
+        if count < k.shape[0] - 1:
+            try:
+                return _solve_sparse(k, k_g, shift, count)
+            except (ArpackError, ArpackNoConvergence, RuntimeError, ValueError):
+                # e.g. k is not positive definite or k + shift * k_g is singular
+                pass
+
+        k = k.toarray()
+        k_g = k_g.toarray()
+
+    return _solve_dense(k, k_g, shift, count)
+
+
+class EigenTracker:
+    """An EigenTracker solves the attendant eigenvalue problem along an equilibrium path.
+
+    The eigenpairs closest to the shift are computed with ARPACK in shift-invert mode like
+    in `solve_buckling_eigenvalues`. The eigenvectors of the previous step are used as
+    starting vector. For shift=1 the shifted matrix k_m + k_g is the tangent stiffness, so
+    the factorization of the converged iteration is reused instead of factorizing again.
+
+    The tracker is passed to the solution steps with the option `eigen_tracker`, e.g. for
+    an arc-length run or `bracketing`.
+
+    Attributes
+    ----------
+    count : int
+        Number of tracked eigenpairs.
+    shift : float
+        Target of the eigenvalues.
+    tolerance : float
+        Relative accuracy of the eigenvalues. 0 is machine precision.
+    eigvals : ndarray
+        Eigenvalues of the last step or `None`.
+    eigvecs : ndarray
+        Eigenvectors of the last step as columns or `None`.
+    """
+
+    def __init__(self, count=1, shift=1.0, tolerance=0):
+        """Create a new EigenTracker.
+
+        Parameters
+        ----------
+        count : int, optional
+            Number of tracked eigenpairs.
+        shift : float, optional
+            Target of the eigenvalues.
+        tolerance : float, optional
+            Relative accuracy of the eigenvalues. 0 is machine precision.
+        """
+        self.count = count
+        self.shift = shift
+        self.tolerance = tolerance
+        self.eigvals = None
+        self.eigvecs = None
+
+    def reset(self):
+        """Forget the eigenpairs of the last step."""
+        self.eigvals = None
+        self.eigvecs = None
+
+    def solve(self, k, k_g, factorization=None):
+        """Solve the buckling problem [ k + eigval * k_g ] * eigvec = 0 for the tracked
+        eigenpairs.
+
+        Parameters
+        ----------
+        k : ndarray or scipy.sparse matrix
+            Symmetric positive definite stiffness matrix.
+        k_g : ndarray or scipy.sparse matrix
+            Symmetric geometric stiffness matrix.
+        factorization : object, optional
+            Factorization of k + shift * k_g with a `solve(rhs)` method, e.g. the
+            factorized tangent stiffness for shift=1.
+
+        Returns
+        -------
+        eigvals : ndarray
+            Eigenvalues sorted by their distance to the shift.
+        eigvecs : ndarray
+            Eigenvectors as columns with unit length.
+        """
+        n = k.shape[0]
+
+        v0 = None
+
+        if self.eigvecs is not None and self.eigvecs.shape[0] == n:
+            v0 = self.eigvecs.sum(axis=1)
+
+        if self.count < n - 1:
+            try:
+                eigvals, eigvecs = _solve_shift_invert(k, k_g, self.shift, self.count, v0, factorization,
+                                                       self.tolerance)
+            except (ArpackError, ArpackNoConvergence, RuntimeError, ValueError):
+                eigvals, eigvecs = solve_buckling_eigenvalues(k, k_g, self.shift, self.count)
+        else:
+            eigvals, eigvecs = solve_buckling_eigenvalues(k, k_g, self.shift, self.count)
+
+        self.eigvals = eigvals
+        self.eigvecs = eigvecs
+
+        return eigvals, eigvecs
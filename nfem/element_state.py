@@ -0,0 +1,191 @@
+"""This module contains the ElementState class and the ElementProperty descriptor."""
+
+import itertools
+
+import numpy as np
+
+
+_revisions = itertools.count(1)
+
+
+class ElementState:
+    """An ElementState stores the properties of many elements (e.g. youngs modulus, area,
+    prestress) in contiguous arrays. The elements are views into an ElementState which are
+    identified by their index.
+
+    Each property has its own array. Properties which are not defined for an element (e.g.
+    the stiffness of a spring for a truss) or which are `None` are stored as NaN.
+
+    Attributes
+    ----------
+    revision : int
+        Token which changes if any property changes. Different contents never have the same
+        revision, so it identifies the properties also across copies of the state.
+
+    A copy of a state shares the arrays until one of the states modifies them.
+    """
+
+    def __init__(self):
+        """Create a new empty ElementState."""
+        self._count = 0
+        self._capacity = 0
+        self._values = dict()
+        self._shared = False
+        self.revision = next(_revisions)
+
+    def __len__(self):
+        return self._count
+
+    def _reserve(self, capacity):
+        for name, old in self._values.items():
+            new = np.full(capacity, np.nan)
+            new[:self._count] = old[:self._count]
+            self._values[name] = new
+        self._capacity = capacity
+
+    def _detach(self):
+        # copy the arrays which are shared with another state
+        self._values = {name: values.copy() for name, values in self._values.items()}
+        self._shared = False
+
+    def copy(self):
+        """Create a copy of the state.
+
+        Returns
+        -------
+        state : ElementState
+            Copy which shares the arrays until one of the states modifies them.
+        """
+        state = ElementState()
+        state._count = self._count
+        state._capacity = self._capacity
+        state._values = dict(self._values)
+        state._shared = True
+        state.revision = self.revision
+
+        self._shared = True
+
+        return state
+
+    def add(self, **properties):
+        """Add a new element to the state.
+
+        Parameters
+        ----------
+        properties :
+            Values of the properties of the element.
+
+        Returns
+        -------
+        index : int
+            Index of the new element.
+        """
+        index = self._count
+
+        if self._shared:
+            self._detach()
+
+        if index == self._capacity:
+            self._reserve(max(8, 2 * index))
+
+        for name, value in properties.items():
+            self._set(index, name, value)
+
+        self._count += 1
+        self.revision = next(_revisions)
+
+        return index
+
+    def _set(self, index, name, value):
+        values = self._values.get(name)
+
+        if values is None:
+            values = np.full(self._capacity, np.nan)
+            self._values[name] = values
+
+        values[index] = np.nan if value is None else value
+
+    def get(self, index, name):
+        """Gets a property of an element.
+
+        Parameters
+        ----------
+        index : int
+            Index of the element.
+        name : str
+            Name of the property.
+
+        Returns
+        -------
+        value : float or None
+            Value of the property or `None` if it is not defined.
+        """
+        value = float(self._values[name][index])
+        return None if value != value else value
+
+    def set(self, index, name, value):
+        """Sets a property of an element.
+
+        Parameters
+        ----------
+        index : int
+            Index of the element.
+        name : str
+            Name of the property.
+        value : float or None
+            New value of the property.
+        """
+        if self._shared:
+            self._detach()
+
+        self._set(index, name, value)
+        self.revision = next(_revisions)
+
+    def get_values(self, name, indices):
+        """Gets a property of several elements.
+
+        Parameters
+        ----------
+        name : str
+            Name of the property.
+        indices : ndarray
+            Indices of the elements.
+
+        Returns
+        -------
+        values : ndarray
+            Values of the property. Undefined values are NaN.
+        """
+        return self._values[name][indices]
+
+
+class ElementProperty:
+    """Descriptor for a property which is stored in the `ElementState` of an element.
+
+    The element stores its state as `_state` and its index as `_index`. The values are
+    stored as floats, so an assigned int is read back as float. `None` is only allowed for
+    optional properties (e.g. the strengths of a truss). It is read back as `None`.
+    """
+
+    def __init__(self, optional=False):
+        """Create a new ElementProperty.
+
+        Parameters
+        ----------
+        optional : bool, optional
+            Flag if the property can be `None`.
+        """
+        self.optional = optional
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, element, owner=None):
+        if element is None:
+            return self
+        return element._state.get(element._index, self.name)
+
+    def __set__(self, element, value):
+        if value is None and not self.optional:
+            raise TypeError(f'The property {self.name} can not be None')
+        element._state.set(element._index, self.name, None if value is None else float(value))
@@ -0,0 +1,264 @@
+"""This module contains the globalization strategies for the Newton-Raphson algorithm.
+
+The full Newton step `x -= delta_x` is replaced by a step which reduces the merit function
+|r(x)|^2 / 2. The strategies only require additional evaluations of the residual:
+- backtracking: the step is shortened until the Armijo condition is fulfilled. The step
+  length is estimated by a quadratic interpolation of the merit function.
+- exact: the step length is chosen such that the residual is orthogonal to the Newton
+  direction, delta_x^T r(x - alpha * delta_x) = 0 (line search of M.A. Crisfield, Non-linear
+  Finite Element Analysis of Solids and Structures, 1991). The root is found by the Illinois
+  variant of regula falsi.
+- dogleg: Powell's dogleg trust region method. The step is a combination of the Newton step
+  and the steepest descent step inside a trust region. The radius of the region is adapted
+  from the ratio of the actual and the predicted reduction of the merit function.
+"""
+
+import numpy as np
+from numpy.linalg import norm
+
+
+def _matvec(lhs, v):
+    if hasattr(lhs, 'matvec'):
+        return lhs.matvec(v)
+    return lhs @ v
+
+
+def _rmatvec(lhs, v):
+    if hasattr(lhs, 'rmatvec'):
+        return lhs.rmatvec(v)
+    return lhs.T @ v
+
+
+def _squared_norm(rhs):
+    return rhs @ rhs
+
+
+class BacktrackingLineSearch:
+    """Backtracking line search with the Armijo condition.
+
+    Attributes
+    ----------
+    c : float
+        Required fraction of the predicted decrease of the merit function.
+    max_steps : int
+        Maximum number of step reductions.
+    """
+
+    name = 'backtracking'
+
+    def __init__(self, c=1e-4, max_steps=10):
+        self.c = c
+        self.max_steps = max_steps
+
+    def step(self, calculate_residual, x, delta_x, lhs, rhs):
+        """Get the step which is added to x for the Newton correction `delta_x`."""
+        f_0 = _squared_norm(rhs)
+
+        alpha = 1.0
+
+        for _ in range(self.max_steps):
+            f_alpha = _squared_norm(calculate_residual(x - alpha * delta_x))
+
+            # for the Newton direction the slope of |r|^2 is -2 |r|^2
+            if f_alpha <= (1.0 - 2.0 * self.c * alpha) * f_0:
+                break
+
+            # minimum of the quadratic interpolation, safeguarded to [0.1, 0.5] * alpha
+            denominator = f_alpha - f_0 + 2.0 * alpha * f_0
+
+            if np.isfinite(denominator) and denominator > 0:
+                alpha_new = f_0 * alpha**2 / denominator
+            else:
+                alpha_new = 0.1 * alpha
+
+            alpha = min(max(alpha_new, 0.1 * alpha), 0.5 * alpha)
+
+        return -alpha * delta_x
+
+
+class ExactLineSearch:
+    """Line search for the root of the residual projected on the Newton direction.
+
+    Attributes
+    ----------
+    tolerance : float
+        The search stops if |s(alpha)| <= tolerance * |s(0)| with s(alpha) = delta_x^T r.
+    max_steps : int
+        Maximum number of residual evaluations.
+    max_alpha : float
+        Maximum step length.
+    """
+
+    name = 'exact'
+
+    def __init__(self, tolerance=0.1, max_steps=20, max_alpha=4.0):
+        self.tolerance = tolerance
+        self.max_steps = max_steps
+        self.max_alpha = max_alpha
+
+    def step(self, calculate_residual, x, delta_x, lhs, rhs):
+        """Get the step which is added to x for the Newton correction `delta_x`."""
+        s_0 = delta_x @ rhs
+
+        if s_0 == 0:
+            return -delta_x
+
+        # s(alpha) is s_0 at alpha = 0 and zero at alpha = 1 for a linear residual
+        alpha_0, s_a = 0.0, s_0
+        alpha_1 = 1.0
+        s_b = delta_x @ calculate_residual(x - alpha_1 * delta_x)
+
+        # extrapolate until the sign of s changes
+        steps = 1
+        while np.sign(s_b) == np.sign(s_0) and alpha_1 < self.max_alpha and steps < self.max_steps:
+            if not np.isfinite(s_b):
+                break
+            alpha_0, s_a = alpha_1, s_b
+            alpha_1 = min(2.0 * alpha_1, self.max_alpha)
+            s_b = delta_x @ calculate_residual(x - alpha_1 * delta_x)
+            steps += 1
+
+        if not np.isfinite(s_b):
+            return -delta_x
+
+        if np.sign(s_b) == np.sign(s_0):
+            return -alpha_1 * delta_x
+
+        # regula falsi between alpha_0 and alpha_1. The Illinois modification halves the value
+        # of an endpoint which is retained twice, so the search does not stagnate.
+        alpha = alpha_1
+        side = 0
+
+        while abs(s_b) > self.tolerance * abs(s_0) and steps < self.max_steps:
+            alpha = alpha_1 - s_b * (alpha_1 - alpha_0) / (s_b - s_a)
+            s = delta_x @ calculate_residual(x - alpha * delta_x)
+            steps += 1
+
+            if abs(s) <= self.tolerance * abs(s_0):
+                break
+
+            if np.sign(s) == np.sign(s_a):
+                alpha_0, s_a = alpha, s
+                if side == -1:
+                    s_b /= 2
+                side = -1
+            else:
+                alpha_1, s_b = alpha, s
+                if side == 1:
+                    s_a /= 2
+                side = 1
+
+        return -alpha * delta_x
+
+
+class DoglegTrustRegion:
+    """Powell's dogleg trust region method.
+
+    The trust region radius is kept between the iterations of a solve.
+
+    Attributes
+    ----------
+    radius : float
+        Current trust region radius. If `None`, the norm of the first Newton step is used.
+    max_radius : float
+        Maximum trust region radius.
+    eta : float
+        Minimum ratio of actual and predicted reduction for accepting a step.
+    max_steps : int
+        Maximum number of trial steps per iteration. If none of them is accepted, a
+        RuntimeError is raised instead of taking a step which increases the residual.
+    """
+
+    name = 'dogleg'
+
+    def __init__(self, radius=None, max_radius=np.inf, eta=1e-4, max_steps=10):
+        self.radius = radius
+        self.max_radius = max_radius
+        self.eta = eta
+        self.max_steps = max_steps
+
+    def step(self, calculate_residual, x, delta_x, lhs, rhs):
+        """Get the step which is added to x for the Newton correction `delta_x`."""
+        newton_step = -delta_x
+        newton_length = norm(newton_step)
+
+        if self.radius is None:
+            self.radius = newton_length
+
+        f_0 = _squared_norm(rhs)
+
+        # steepest descent direction of |r|^2 / 2 and the Cauchy point
+        gradient = _rmatvec(lhs, rhs)
+        j_gradient = _matvec(lhs, gradient)
+        cauchy_step = -(gradient @ gradient) / (j_gradient @ j_gradient) * gradient
+
+        for _ in range(self.max_steps):
+            radius = self.radius
+
+            if newton_length <= radius:
+                step = newton_step
+            elif norm(cauchy_step) >= radius:
+                step = cauchy_step * (radius / norm(cauchy_step))
+            else:
+                # intersection of the dogleg path with the trust region boundary
+                d = newton_step - cauchy_step
+                a = d @ d
+                b = 2.0 * (cauchy_step @ d)
+                c = cauchy_step @ cauchy_step - radius**2
+                tau = (-b + np.sqrt(b**2 - 4.0 * a * c)) / (2.0 * a)
+                step = cauchy_step + tau * d
+
+            step_length = norm(step)
+
+            predicted = f_0 - _squared_norm(rhs + _matvec(lhs, step))
+            actual = f_0 - _squared_norm(calculate_residual(x + step))
+
+            rho = actual / predicted if predicted > 0 else -1.0
+
+            if not np.isfinite(rho) or rho < 0.25:
+                self.radius = 0.25 * step_length
+            elif rho > 0.75 and step_length >= 0.99 * radius:
+                self.radius = min(2.0 * radius, self.max_radius)
+
+            if np.isfinite(rho) and rho > self.eta:
+                return step
+
+        raise RuntimeError('Dogleg trust region: No acceptable step found')
+
+
+GLOBALIZATIONS = {
+    'backtracking': BacktrackingLineSearch,
+    'exact': ExactLineSearch,
+    'dogleg': DoglegTrustRegion,
+}
+
+
+def get_globalization(globalization):
+    """Create the globalization strategy of a Newton-Raphson solve.
+
+    Parameters
+    ----------
+    globalization : str or object
+        Available options:
+        - None or 'none': full Newton step
+        - 'backtracking': backtracking line search
+        - 'exact': exact line search
+        - 'dogleg': dogleg trust region
+        An object with a `step(calculate_residual, x, delta_x, lhs, rhs)` method is used as
+        custom strategy.
+
+    Returns
+    -------
+    globalization : object or None
+        Globalization strategy or `None` for the full Newton step.
+    """
+    if globalization is None or globalization == 'none':
+        return None
+
+    if not isinstance(globalization, str):
+        return globalization
+
+    if globalization not in GLOBALIZATIONS:
+        raise ValueError('Invalid globalization: ' + globalization)
+
+    return GLOBALIZATIONS[globalization]()
@@ -0,0 +1,90 @@
+"""This module only contains the IterationHistory class."""
+
+import numpy as np
+
+
+class IterationHistory:
+    """An IterationHistory stores the intermediate states of a nonlinear solution step in a
+    compact array instead of a chain of model duplicates.
+
+    Each state holds the delta of the active dofs and the load factor. The corresponding
+    models are created only if they are requested.
+
+    Attributes
+    ----------
+    previous_model : Model
+        Previous model of the first recorded state.
+    assembler : Assembler
+        Assembler which defines the order of the dofs in the states.
+    statuses : list
+        Status of each recorded state.
+    """
+
+    def __init__(self, previous_model, assembler):
+        """Create a new empty IterationHistory.
+
+        Parameters
+        ----------
+        previous_model : Model
+            Previous model of the first recorded state.
+        assembler : Assembler
+            Assembler which defines the order of the dofs in the states.
+        """
+        self.previous_model = previous_model
+        self.assembler = assembler
+        self.statuses = list()
+        self._states = np.zeros((0, assembler.dof_count + 1))
+
+    def __len__(self):
+        return len(self.statuses)
+
+    @property
+    def states(self):
+        """Gets the recorded states (n, dof_count + 1). The last column is the load factor."""
+        return self._states[:len(self.statuses)]
+
+    def append(self, model):
+        """Record the current state of the model.
+
+        Parameters
+        ----------
+        model : Model
+            Model with the state to record.
+        """
+        index = len(self.statuses)
+
+        if index == len(self._states):
+            states = np.zeros((max(4, 2 * index), self._states.shape[1]))
+            states[:index] = self._states
+            self._states = states
+
+        self._states[index, :-1] = model.get_displacement_vector(self.assembler)
+        self._states[index, -1] = model.load_factor
+
+        self.statuses.append(model.status)
+
+    def materialize(self, model):
+        """Create the models of the recorded states.
+
+        Parameters
+        ----------
+        model : Model
+            Model which is used as template for the recorded states.
+
+        Returns
+        -------
+        previous_model : Model
+            Model of the last recorded state. The models are linked to `previous_model`.
+        """
+        previous_model = self.previous_model
+
+        for status, state in zip(self.statuses, self.states):
+            iterate = model._copy()
+            iterate.set_displacement_vector(state, self.assembler)
+            iterate.load_factor = state[-1]
+            iterate.status = status
+            iterate._previous_model = previous_model
+
+            previous_model = iterate
+
+        return previous_model
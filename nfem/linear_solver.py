@@ -0,0 +1,789 @@
+"""This module contains the backends for solving linear systems.
+
+A backend factorizes a system matrix once. The factorization can be used to solve for
+multiple right hand sides and to compute the determinant of the matrix.
+
+The determinant over- or underflows for larger systems. `log_determinant` returns its sign
+and the logarithm of its absolute value instead. `negative_pivots` returns the number of
+negative eigenvalues of a symmetric matrix (Sylvester's law of inertia). It is exact if
+the factorization is symmetric (LDL^T, Cholesky or an LU factorization with symmetric
+pivoting). Otherwise the backends fall back to a second, symmetric factorization. This is
+avoided by `factorize(matrix, inertia=True)` which selects a symmetric factorization for
+symmetric matrices.
+
+The banded backend stores only the band of a symmetric matrix in the LAPACK format. It is
+selected automatically for large matrices in band storage (DIA format). `solve.assemble_matrix`
+assembles sparse matrices in this format if the bandwidth of the dof numbering is small (e.g.
+for girders and towers after a reordering of the dofs), so dense and CSR matrices are not
+searched for a band.
+
+The Krylov backends (cg, minres, gmres) do not factorize the matrix. They only set up a
+preconditioner and solve iteratively up to the relative residual `tolerance`, so they also
+work for systems which are too large for a sparse direct factorization. The tolerance can be
+changed between the solves e.g. for an inexact Newton method. The determinant and the
+inertia are not available for these backends (`None`).
+"""
+
+import warnings
+from inspect import signature
+
+import numpy as np
+from scipy.linalg import (cho_factor, cho_solve, cho_solve_banded, cholesky_banded, ldl, lu_factor, lu_solve,
+                          solve_banded, solve_triangular)
+from scipy.linalg.lapack import dgbtrf, dgbtrs
+from scipy.sparse import csc_matrix, csr_matrix, dia_matrix, issparse
+from scipy.sparse.linalg import LinearOperator, cg, gmres, minres, spilu, splu
+
+
+def _permutation_sign(permutation):
+    visited = np.zeros(len(permutation), dtype=bool)
+    sign = 1.0
+
+    for start in range(len(permutation)):
+        if visited[start]:
+            continue
+        length = 0
+        index = start
+        while not visited[index]:
+            visited[index] = True
+            index = permutation[index]
+            length += 1
+        if length % 2 == 0:
+            sign = -sign
+
+    return sign
+
+
+def _to_dense(matrix):
+    if issparse(matrix):
+        return matrix.toarray()
+    return np.asarray(matrix, dtype=float)
+
+
+def _log_abs_product(values, sign=1.0):
+    """Get sign and log of the absolute value of the product of `values`."""
+    with np.errstate(divide='ignore'):
+        log_abs = np.sum(np.log(np.abs(values)))
+    return sign * np.prod(np.sign(values)), log_abs
+
+
+def _block_diagonal(d):
+    """Get the determinants and the number of negative eigenvalues of the 1x1 and 2x2
+    diagonal blocks of the block diagonal matrix `d` of an LDL^T factorization."""
+    n = len(d)
+    diagonal = np.diagonal(d)
+    off_diagonal = np.diagonal(d, -1)
+
+    determinants = list()
+    negative = 0
+
+    i = 0
+    while i < n:
+        if i + 1 < n and off_diagonal[i] != 0:
+            a, b, c = diagonal[i], off_diagonal[i], diagonal[i + 1]
+            det = a * c - b * b
+            if det < 0:
+                negative += 1
+            elif a + c < 0:
+                negative += 2
+            determinants.append(det)
+            i += 2
+        else:
+            if diagonal[i] < 0:
+                negative += 1
+            determinants.append(diagonal[i])
+            i += 1
+
+    return np.array(determinants), negative
+
+
+class DenseLU:
+    """LU factorization of a dense matrix with partial pivoting (LAPACK getrf)."""
+
+    name = 'lu'
+
+    def __init__(self, matrix):
+        """Factorize a matrix.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse matrix
+            Square matrix. A sparse matrix is converted to a dense matrix.
+        """
+        matrix = _to_dense(matrix)
+
+        with warnings.catch_warnings():
+            # singular matrices are detected below
+            warnings.simplefilter('ignore')
+            self._lu, self._piv = lu_factor(matrix, check_finite=False)
+
+        if not np.all(np.diagonal(self._lu)):
+            raise RuntimeError('Stiffness matrix is singular')
+
+        self._matrix = matrix
+        self.shape = matrix.shape
+
+    def solve(self, rhs):
+        return lu_solve((self._lu, self._piv), rhs, check_finite=False)
+
+    def determinant(self):
+        sign, log_abs = self.log_determinant()
+        return sign * np.exp(log_abs)
+
+    def log_determinant(self):
+        """Get the sign and the log of the absolute value of the determinant."""
+        sign = -1.0 if np.count_nonzero(self._piv != np.arange(len(self._piv))) % 2 else 1.0
+        return _log_abs_product(np.diagonal(self._lu), sign)
+
+    def negative_pivots(self):
+        """Get the number of negative eigenvalues of the symmetric matrix.
+
+        Without row interchanges the pivots are the ones of an LDL^T factorization. Otherwise
+        the matrix is factorized again with an LDL^T factorization (see `factorize` with
+        `inertia=True`).
+        """
+        if np.all(self._piv == np.arange(len(self._piv))):
+            return int(np.count_nonzero(np.diagonal(self._lu) < 0))
+        return DenseLDL(self._matrix).negative_pivots()
+
+
+class DenseLDL:
+    """LDL^T factorization of a dense symmetric matrix with Bunch-Kaufman pivoting
+    (LAPACK sytrf). It provides the inertia of indefinite matrices without extra cost."""
+
+    name = 'ldl'
+
+    def __init__(self, matrix):
+        """Factorize a matrix.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse matrix
+            Symmetric matrix. A sparse matrix is converted to a dense matrix.
+        """
+        matrix = _to_dense(matrix)
+
+        lu, d, perm = ldl(matrix, check_finite=False)
+
+        self._determinants, self._negative_pivots = _block_diagonal(d)
+
+        if not np.all(self._determinants):
+            raise RuntimeError('Stiffness matrix is singular')
+
+        # lu[perm] is lower triangular
+        self._l = lu[perm]
+        self._d = np.array([np.append(0, np.diagonal(d, 1)), np.diagonal(d), np.append(np.diagonal(d, -1), 0)])
+        self._perm = perm
+
+        self.shape = matrix.shape
+
+    def solve(self, rhs):
+        rhs = np.asarray(rhs, dtype=float)
+        y = solve_triangular(self._l, rhs[self._perm], lower=True, unit_diagonal=True, check_finite=False)
+        y = solve_banded((1, 1), self._d, y, check_finite=False)
+        y = solve_triangular(self._l.T, y, lower=False, unit_diagonal=True, check_finite=False)
+        x = np.empty_like(y)
+        x[self._perm] = y
+        return x
+
+    def determinant(self):
+        sign, log_abs = self.log_determinant()
+        return sign * np.exp(log_abs)
+
+    def log_determinant(self):
+        """Get the sign and the log of the absolute value of the determinant."""
+        return _log_abs_product(self._determinants)
+
+    def negative_pivots(self):
+        """Get the number of negative eigenvalues of the matrix."""
+        return self._negative_pivots
+
+
+class DenseCholesky:
+    """Cholesky factorization of a dense symmetric positive definite matrix (LAPACK potrf)."""
+
+    name = 'cholesky'
+
+    def __init__(self, matrix):
+        """Factorize a matrix.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse matrix
+            Symmetric positive definite matrix. A sparse matrix is converted to a dense matrix.
+        """
+        matrix = _to_dense(matrix)
+
+        try:
+            self._c, self._lower = cho_factor(matrix, check_finite=False)
+        except np.linalg.LinAlgError:
+            raise RuntimeError('Stiffness matrix is not positive definite')
+
+        self.shape = matrix.shape
+
+    def solve(self, rhs):
+        return cho_solve((self._c, self._lower), rhs, check_finite=False)
+
+    def determinant(self):
+        sign, log_abs = self.log_determinant()
+        return sign * np.exp(log_abs)
+
+    def log_determinant(self):
+        """Get the sign and the log of the absolute value of the determinant."""
+        return 1.0, 2.0 * np.sum(np.log(np.diagonal(self._c)))
+
+    def negative_pivots(self):
+        """Get the number of negative eigenvalues of the matrix (always zero)."""
+        return 0
+
+
+class SparseLU:
+    """Sparse LU factorization (SuperLU) with a fill-reducing column ordering."""
+
+    name = 'splu'
+
+    def __init__(self, matrix, permc_spec='COLAMD', symmetric=False):
+        """Factorize a matrix.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse matrix
+            Square matrix. It is converted to the CSC format.
+        permc_spec : str, optional
+            Column ordering of SuperLU e.g. 'COLAMD', 'MMD_AT_PLUS_A' or 'NATURAL'.
+        symmetric : bool, optional
+            Flag for a symmetric matrix. The diagonal is preferred as pivot and the ordering
+            is applied symmetrically ('MMD_AT_PLUS_A'), so the pivots give the inertia.
+        """
+        if not issparse(matrix):
+            matrix = csc_matrix(matrix)
+
+        matrix = matrix.tocsc()
+
+        try:
+            if symmetric:
+                self._lu = splu(matrix, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0,
+                                options=dict(SymmetricMode=True))
+            else:
+                self._lu = splu(matrix, permc_spec=permc_spec)
+        except RuntimeError:
+            raise RuntimeError('Stiffness matrix is singular')
+
+        self._matrix = matrix
+        self.shape = matrix.shape
+
+    def solve(self, rhs):
+        return self._lu.solve(np.asarray(rhs, dtype=float))
+
+    def determinant(self):
+        sign, log_abs = self.log_determinant()
+        return sign * np.exp(log_abs)
+
+    def log_determinant(self):
+        """Get the sign and the log of the absolute value of the determinant."""
+        lu = self._lu
+        sign = _permutation_sign(lu.perm_r) * _permutation_sign(lu.perm_c)
+        return _log_abs_product(lu.U.diagonal(), sign)
+
+    def negative_pivots(self):
+        """Get the number of negative eigenvalues of the symmetric matrix.
+
+        The pivots give the inertia only if rows and columns are permuted symmetrically.
+        Otherwise the matrix is factorized again with `symmetric=True` (see `factorize` with
+        `inertia=True`).
+        """
+        lu = self._lu
+        if not np.array_equal(lu.perm_r, lu.perm_c):
+            lu = SparseLU(self._matrix, symmetric=True)._lu
+        return int(np.count_nonzero(lu.U.diagonal() < 0))
+
+
+def measure_bandwidth(matrix):
+    """Get the largest distance between the row and the column of a nonzero entry.
+
+    For a matrix in band storage (DIA format) it is the largest offset of the stored
+    diagonals.
+    """
+    if issparse(matrix) and matrix.format == 'dia':
+        return int(np.max(np.abs(matrix.offsets), initial=0))
+
+    if issparse(matrix):
+        matrix = matrix.tocoo()
+        rows, cols = matrix.row[matrix.data != 0], matrix.col[matrix.data != 0]
+        return int(np.max(np.abs(rows - cols), initial=0))
+
+    # first and last nonzero column of each row
+    nonzero = np.asarray(matrix) != 0
+    rows = np.flatnonzero(nonzero.any(axis=1))
+    first = np.argmax(nonzero[rows], axis=1)
+    last = nonzero.shape[1] - 1 - np.argmax(nonzero[rows, ::-1], axis=1)
+    return int(max(np.max(rows - first, initial=0), np.max(last - rows, initial=0)))
+
+
+def to_lower_band(matrix, bandwidth):
+    """Get the lower band of a symmetric matrix in the LAPACK format ab[i - j, j] = a[i, j]."""
+    n = matrix.shape[0]
+    band = np.zeros((bandwidth + 1, n))
+
+    if issparse(matrix) and matrix.format == 'dia':
+        # the entries of the diagonal -offset are stored at the index of their column
+        for offset, values in zip(matrix.offsets, matrix.data):
+            if -bandwidth <= offset <= 0:
+                band[-offset, :n + offset] += values[:n + offset]
+    elif issparse(matrix):
+        matrix = matrix.tocoo()
+        matrix.sum_duplicates()
+        mask = (matrix.row >= matrix.col) & (matrix.row - matrix.col <= bandwidth)
+        band[matrix.row[mask] - matrix.col[mask], matrix.col[mask]] = matrix.data[mask]
+    else:
+        for offset in range(bandwidth + 1):
+            band[offset, :n - offset] = np.diagonal(matrix, -offset)
+
+    return band
+
+
+def from_lower_band(band):
+    """Get the symmetric matrix of a lower band in the LAPACK format in band storage.
+
+    Parameters
+    ----------
+    band : ndarray
+        Lower band of the matrix band[i - j, j] = a[i, j] (bandwidth + 1, n).
+
+    Returns
+    -------
+    matrix : scipy.sparse.dia_matrix
+        Symmetric matrix (n, n).
+    """
+    bandwidth, n = band.shape[0] - 1, band.shape[1]
+
+    # the entries of the diagonal +offset are stored at the index of their column
+    upper = np.zeros((bandwidth, n))
+
+    for offset in range(1, bandwidth + 1):
+        upper[offset - 1, offset:] = band[offset, :n - offset]
+
+    offsets = np.concatenate([-np.arange(bandwidth + 1), np.arange(1, bandwidth + 1)])
+
+    return dia_matrix((np.concatenate([band, upper]), offsets), shape=(n, n))
+
+
+class BandedCholesky:
+    """Cholesky factorization of a symmetric band matrix (LAPACK pbtrf).
+
+    Only the lower band is stored, so memory and time scale with n * bandwidth and
+    n * bandwidth^2. If the matrix is not positive definite (e.g. beyond a critical point),
+    a banded LU factorization with partial pivoting (LAPACK gbtrf) is used instead.
+    """
+
+    name = 'banded'
+
+    def __init__(self, matrix, bandwidth=None, pivoting=True):
+        """Factorize a matrix.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse matrix
+            Symmetric matrix. Only the lower band is used.
+        bandwidth : int, optional
+            Number of subdiagonals. By default it is measured.
+        pivoting : bool, optional
+            Flag if the banded LU factorization is used for matrices which are not positive
+            definite. Otherwise a RuntimeError is raised.
+        """
+        if bandwidth is None:
+            bandwidth = measure_bandwidth(matrix)
+
+        self._factorize(to_lower_band(matrix, bandwidth), pivoting)
+
+    @classmethod
+    def from_lower_band(cls, band):
+        """Factorize a matrix given by its lower band (see `Assembler.assemble_banded_matrix`)."""
+        factorization = cls.__new__(cls)
+        factorization._factorize(np.asarray(band, dtype=float))
+        return factorization
+
+    def _factorize(self, band, pivoting=True):
+        self._band = band
+        self.bandwidth = band.shape[0] - 1
+        self.shape = (band.shape[1], band.shape[1])
+
+        try:
+            self._c = cholesky_banded(band, lower=True, check_finite=False)
+            self._lu = None
+            return
+        except np.linalg.LinAlgError:
+            self._c = None
+
+        if not pivoting:
+            raise RuntimeError('Stiffness matrix is not positive definite')
+
+        # general band storage with room for the fill-in of the pivoting
+        b = self.bandwidth
+        n = self.shape[0]
+
+        ab = np.zeros((3 * b + 1, n))
+
+        for offset in range(b + 1):
+            ab[2 * b + offset, :n - offset] = band[offset, :n - offset]
+            ab[2 * b - offset, offset:] = band[offset, :n - offset]
+
+        self._lu, self._piv, info = dgbtrf(ab, b, b)
+
+        if info > 0:
+            raise RuntimeError('Stiffness matrix is singular')
+
+    def solve(self, rhs):
+        rhs = np.asarray(rhs, dtype=float)
+
+        if self._c is not None:
+            return cho_solve_banded((self._c, True), rhs, check_finite=False)
+
+        b = self.bandwidth
+        x, info = dgbtrs(self._lu, b, b, rhs.reshape(len(rhs), -1), self._piv)
+
+        return x.reshape(rhs.shape)
+
+    def determinant(self):
+        sign, log_abs = self.log_determinant()
+        return sign * np.exp(log_abs)
+
+    def log_determinant(self):
+        """Get the sign and the log of the absolute value of the determinant."""
+        if self._c is not None:
+            return 1.0, 2.0 * np.sum(np.log(self._c[0]))
+
+        sign = -1.0 if np.count_nonzero(self._piv != np.arange(len(self._piv))) % 2 else 1.0
+        return _log_abs_product(self._lu[2 * self.bandwidth], sign)
+
+    def negative_pivots(self):
+        """Get the number of negative eigenvalues of the matrix.
+
+        It is zero if the Cholesky factorization exists. Otherwise the matrix is factorized
+        with a sparse LU factorization with symmetric pivoting.
+        """
+        if self._c is not None:
+            return 0
+        return SparseLU(from_lower_band(self._band), symmetric=True).negative_pivots()
+
+
+def _is_symmetric(matrix):
+    """Check if the matrix is symmetric up to round-off."""
+    if issparse(matrix):
+        difference = abs(matrix - matrix.T)
+        return difference.nnz == 0 or difference.max() <= 1e-12 * abs(matrix).max()
+
+    matrix = np.asarray(matrix)
+
+    return np.allclose(matrix, matrix.T, rtol=0.0, atol=1e-12 * np.max(np.abs(matrix), initial=0.0))
+
+
+def _is_small_bandwidth(n, bandwidth):
+    """Check if the band storage is suitable for a matrix with n rows and the given bandwidth."""
+    return n >= BANDED_MIN_SIZE and BANDED_MAX_RATIO * (bandwidth + 1) <= n
+
+
+def _is_banded(matrix):
+    """Check if the banded backend is suitable for a symmetric matrix in band storage."""
+    if not issparse(matrix) or matrix.format != 'dia':
+        return False
+
+    n = matrix.shape[0]
+
+    if not _is_small_bandwidth(n, measure_bandwidth(matrix)):
+        return False
+
+    # compare the diagonals +offset and -offset. Their entries are stored at the index of
+    # their column
+    diagonals = dict(zip(matrix.offsets, matrix.data))
+
+    for offset in set(np.abs(matrix.offsets)) - {0}:
+        upper = diagonals[offset][offset:] if offset in diagonals else np.zeros(n - offset)
+        lower = diagonals[-offset][:n - offset] if -offset in diagonals else np.zeros(n - offset)
+
+        if not np.array_equal(upper, lower):
+            return False
+
+    return True
+
+
+# the banded backend is selected for symmetric matrices in band storage with at least
+# BANDED_MIN_SIZE rows and a bandwidth smaller than n / BANDED_MAX_RATIO
+BANDED_MIN_SIZE = 200
+BANDED_MAX_RATIO = 10
+
+
+def _jacobi_preconditioner(matrix):
+    diagonal = matrix.diagonal().astype(float)
+    diagonal[diagonal == 0] = 1.0
+    inverse = 1.0 / diagonal
+    return LinearOperator(matrix.shape, matvec=lambda x: inverse * x, dtype=float)
+
+
+def _ilu_preconditioner(matrix):
+    try:
+        ilu = spilu(matrix.tocsc(), drop_tol=1e-4, fill_factor=10)
+    except RuntimeError:
+        raise RuntimeError('Incomplete factorization failed')
+    return LinearOperator(matrix.shape, matvec=ilu.solve, dtype=float)
+
+
+def _amg_preconditioner(matrix):
+    try:
+        import pyamg
+    except ImportError:
+        raise ImportError('The amg preconditioner requires the package pyamg')
+    return pyamg.smoothed_aggregation_solver(matrix.tocsr()).aspreconditioner()
+
+
+PRECONDITIONERS = {
+    'jacobi': _jacobi_preconditioner,
+    'ilu': _ilu_preconditioner,
+    'amg': _amg_preconditioner,
+}
+
+
+def _relative_tolerance(method, value):
+    """Keyword argument for the relative tolerance of a Krylov method of scipy.
+
+    The argument `tol` was renamed to `rtol` in scipy 1.12 and removed in scipy 1.14.
+    """
+    if 'rtol' in signature(method).parameters:
+        return {'rtol': value}
+    return {'tol': value}
+
+
+class KrylovSolver:
+    """Iterative solution with a preconditioned Krylov method.
+
+    Attributes
+    ----------
+    method : str
+        Krylov method: 'cg' and 'minres' for symmetric matrices, 'gmres' for general
+        (e.g. bordered) matrices.
+    preconditioner : str or None
+        Name of the preconditioner ('jacobi', 'ilu', 'amg' or None).
+    tolerance : float
+        Relative residual tolerance of the solves.
+    max_iterations : int or None
+        Maximum number of Krylov iterations.
+    iterations : int
+        Number of Krylov iterations of all solves.
+    """
+
+    name = 'krylov'
+
+    def __init__(self, matrix, method='cg', preconditioner='jacobi', tolerance=1e-10, max_iterations=None):
+        """Set up the preconditioner of a matrix.
+
+        Parameters
+        ----------
+        matrix : ndarray or scipy.sparse matrix
+            Square matrix. It is converted to the CSR format.
+        method : str, optional
+            Krylov method ('cg', 'minres' or 'gmres').
+        preconditioner : str, optional
+            Preconditioner: 'jacobi' (diagonal scaling), 'ilu' (incomplete LU factorization
+            of SuperLU), 'amg' (smoothed aggregation multigrid, requires pyamg) or None.
+        tolerance : float, optional
+            Relative residual tolerance of the solves.
+        max_iterations : int, optional
+            Maximum number of Krylov iterations per solve.
+        """
+        if method not in ['cg', 'minres', 'gmres']:
+            raise ValueError('Invalid Krylov method: ' + method)
+
+        if preconditioner is not None and preconditioner not in PRECONDITIONERS:
+            raise ValueError('Invalid preconditioner: ' + preconditioner)
+
+        if not issparse(matrix):
+            matrix = csr_matrix(matrix)
+
+        self._matrix = matrix.tocsr()
+        self._m = None if preconditioner is None else PRECONDITIONERS[preconditioner](self._matrix)
+
+        self.method = method
+        self.preconditioner = preconditioner
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self.shape = matrix.shape
+
+    def with_matrix(self, matrix, method=None):
+        """Create a solver with the same settings for another matrix."""
+        return KrylovSolver(matrix, method or self.method, self.preconditioner, self.tolerance,
+                            self.max_iterations)
+
+    def _solve_vector(self, rhs):
+        rhs_norm = np.linalg.norm(rhs)
+
+        if rhs_norm == 0:
+            return np.zeros_like(rhs)
+
+        def count(_):
+            self.iterations += 1
+
+        x = None
+        rtol = self.tolerance
+
+        # the stopping criteria of the methods use estimated or preconditioned residuals. The
+        # solve is continued with a smaller tolerance until the true residual is small enough
+        for _ in range(5):
+            if self.method == 'cg':
+                x, info = cg(self._matrix, rhs, x0=x, atol=0.0, maxiter=self.max_iterations, M=self._m,
+                             callback=count, **_relative_tolerance(cg, rtol))
+            elif self.method == 'minres':
+                x, info = minres(self._matrix, rhs, x0=x, maxiter=self.max_iterations, M=self._m, callback=count,
+                                 **_relative_tolerance(minres, rtol))
+            else:
+                x, info = gmres(self._matrix, rhs, x0=x, atol=0.0, maxiter=self.max_iterations, M=self._m,
+                                callback=count, callback_type='pr_norm', **_relative_tolerance(gmres, rtol))
+
+            if info < 0 or not np.all(np.isfinite(x)):
+                break
+
+            residual_norm = np.linalg.norm(rhs - self._matrix @ x)
+
+            if residual_norm <= self.tolerance * rhs_norm:
+                return x
+
+            rtol = max(0.01 * rtol * self.tolerance * rhs_norm / residual_norm, np.finfo(float).eps)
+
+        raise RuntimeError(f'{self.method} did not converge')
+
+    def solve(self, rhs):
+        rhs = np.asarray(rhs, dtype=float)
+
+        if rhs.ndim == 1:
+            return self._solve_vector(rhs)
+
+        return np.column_stack([self._solve_vector(column) for column in rhs.T])
+
+    def determinant(self):
+        """The Krylov methods do not provide the determinant. Returns `None`."""
+        return None
+
+    def log_determinant(self):
+        """The Krylov methods do not provide the determinant. Returns `None`.
+
+        A direct factorization of the matrix would defeat the purpose of the iterative
+        backend, so it is not computed here.
+        """
+        return None
+
+    def negative_pivots(self):
+        """The Krylov methods do not provide the inertia of the matrix. Returns `None`."""
+        return None
+
+
+class ConjugateGradient(KrylovSolver):
+    """Preconditioned conjugate gradient method for symmetric positive definite matrices."""
+
+    name = 'cg'
+
+    def __init__(self, matrix, preconditioner='jacobi', tolerance=1e-10, max_iterations=None):
+        super().__init__(matrix, 'cg', preconditioner, tolerance, max_iterations)
+
+
+class Minres(KrylovSolver):
+    """Preconditioned MINRES method for symmetric (also indefinite) matrices."""
+
+    name = 'minres'
+
+    def __init__(self, matrix, preconditioner='jacobi', tolerance=1e-10, max_iterations=None):
+        super().__init__(matrix, 'minres', preconditioner, tolerance, max_iterations)
+
+
+class Gmres(KrylovSolver):
+    """Preconditioned restarted GMRES method for general matrices."""
+
+    name = 'gmres'
+
+    def __init__(self, matrix, preconditioner='jacobi', tolerance=1e-10, max_iterations=None):
+        super().__init__(matrix, 'gmres', preconditioner, tolerance, max_iterations)
+
+
+SOLVERS = {
+    'lu': DenseLU,
+    'cholesky': DenseCholesky,
+    'ldl': DenseLDL,
+    'splu': SparseLU,
+    'banded': BandedCholesky,
+    'cg': ConjugateGradient,
+    'minres': Minres,
+    'gmres': Gmres,
+}
+
+
+def factorize(matrix, solver=None, inertia=False):
+    """Factorize a system matrix.
+
+    Parameters
+    ----------
+    matrix : ndarray or scipy.sparse matrix
+        Square system matrix.
+    solver : str or callable, optional
+        Backend used for the factorization. Available options:
+        - lu: dense LU factorization
+        - cholesky: dense Cholesky factorization for positive definite matrices
+        - ldl: dense LDL^T factorization for symmetric matrices
+        - splu: sparse LU factorization with COLAMD ordering
+        - banded: Cholesky (or LU) factorization of the band of a symmetric matrix
+        - cg, minres, gmres: preconditioned Krylov methods with a Jacobi preconditioner. Another
+          preconditioner is selected with a suffix e.g. 'cg-ilu', 'minres-amg' or 'gmres-none'
+        A callable is used as custom backend. It is called with the matrix and has to return
+        an object with a `solve(rhs)` method. By default `banded` is used for large
+        symmetric matrices in band storage (DIA format) with a small bandwidth, otherwise
+        `splu` for sparse and `lu` for dense matrices.
+    inertia : bool, optional
+        Flag if `negative_pivots` of the factorization is needed. For a symmetric matrix the
+        default backend is then a symmetric factorization which provides the inertia without
+        factorizing again: `ldl` for dense matrices, `splu` with symmetric pivoting for
+        sparse matrices and `banded` with symmetric pivoting instead of the banded LU
+        factorization for indefinite matrices. `splu` and `banded` use the symmetric
+        pivoting also if they are selected explicitly.
+
+    Returns
+    -------
+    factorization : object
+        Factorization with the methods `solve(rhs)`, `determinant()`, `log_determinant()`
+        and `negative_pivots()`.
+    """
+    is_banded = solver is None and _is_banded(matrix)
+
+    # the banded matrices are symmetric
+    symmetric = inertia and solver in [None, 'splu', 'banded'] and (is_banded or _is_symmetric(matrix))
+
+    if solver is None:
+        if is_banded:
+            solver = 'banded'
+        elif symmetric:
+            solver = 'splu' if issparse(matrix) else 'ldl'
+        else:
+            solver = 'splu' if issparse(matrix) else 'lu'
+
+    if symmetric and solver == 'splu':
+        return SparseLU(matrix, symmetric=True)
+
+    if symmetric and solver == 'banded':
+        try:
+            return BandedCholesky(matrix, pivoting=False)
+        except RuntimeError:
+            # the band of an indefinite matrix is factorized with symmetric pivoting
+            return SparseLU(matrix, symmetric=True)
+
+    if callable(solver):
+        return solver(matrix)
+
+    if '-' in solver:
+        method, preconditioner = solver.split('-', 1)
+
+        if method not in ['cg', 'minres', 'gmres']:
+            raise ValueError('Invalid linear solver: ' + solver)
+
+        return SOLVERS[method](matrix, preconditioner=None if preconditioner == 'none' else preconditioner)
+
+    if solver not in SOLVERS:
+        raise ValueError('Invalid linear solver: ' + solver)
+
+    return SOLVERS[solver](matrix)
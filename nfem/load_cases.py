@@ -0,0 +1,120 @@
+"""This file contains the linear analysis of several load cases with one factorization"""
+
+import numpy as np
+
+from nfem.assembler import ElementMethod
+from nfem.linear_solver import factorize
+from nfem.solve import assemble_matrix
+from nfem.truss_batch import calculate_linear_normal_forces
+
+
+class LoadCaseResults:
+    """Results of a linear analysis of several load cases.
+
+    The rows of the arrays belong to the load cases, the columns to the dofs or elements.
+
+    Attributes
+    ----------
+    load_cases : list
+        Names of the load cases.
+    dofs : list
+        Ids of the active dofs e.g. ('B', 'v') in the order of the assembler.
+    elements : list
+        Ids of the truss elements.
+    displacements : ndarray
+        Displacements of the active dofs (load cases, dofs).
+    normal_forces : ndarray
+        Normal forces of the trusses (load cases, elements).
+    """
+
+    def __init__(self, load_cases, dofs, elements, displacements, normal_forces):
+        self.load_cases = list(load_cases)
+        self.dofs = list(dofs)
+        self.elements = list(elements)
+        self.displacements = displacements
+        self.normal_forces = normal_forces
+        self._load_case_indices = {name: i for i, name in enumerate(self.load_cases)}
+        self._dof_indices = {dof: i for i, dof in enumerate(self.dofs)}
+        self._element_indices = {element: i for i, element in enumerate(self.elements)}
+
+    def get_displacement(self, load_case, dof):
+        """Get the displacement of an active dof e.g. ('B', 'v') for a load case."""
+        return self.displacements[self._load_case_indices[load_case], self._dof_indices[tuple(dof)]]
+
+    def get_normal_force(self, load_case, element):
+        """Get the normal force of a truss for a load case."""
+        return self.normal_forces[self._load_case_indices[load_case], self._element_indices[element]]
+
+
+def solve_load_cases(model, load_cases=None, sparse=False, solver=None):
+    """Solves the linear system for several load cases of the model.
+
+    The elastic stiffness matrix is assembled and factorized once. All load cases are solved
+    as one block right hand side. The normal forces are computed from the linear strains of
+    the displacements. The state of the model is not changed.
+
+    Parameters
+    ----------
+    model : Model
+        Model with load cases (see `Model.add_load_case`).
+    load_cases : list, optional
+        Names of the load cases to solve. By default all load cases of the model are solved.
+    sparse : bool
+        Flag if the stiffness matrix is assembled and solved as a sparse matrix.
+    solver : str or callable
+        Linear solver backend (see `linear_solver.factorize`).
+
+    Returns
+    -------
+    results : LoadCaseResults
+        Displacements and normal forces of all load cases.
+    """
+    if load_cases is None:
+        load_cases = model.load_cases
+
+    load_cases = list(load_cases)
+
+    if len(load_cases) == 0:
+        raise ValueError('No load cases to solve')
+
+    assembler = model.get_assembler()
+
+    n = assembler.dof_count
+
+    f = np.zeros((n, len(load_cases)))
+
+    for j, name in enumerate(load_cases):
+        for node_id, forces in model.get_load_case(name).items():
+            for dof_type, value in zip('uvw', forces):
+                index = assembler.dof_indices.get(model[node_id, dof_type])
+
+                # forces at supported dofs go directly into the support
+                if index is not None:
+                    f[index, j] += value
+
+    k = assemble_matrix(assembler, ElementMethod('calculate_elastic_stiffness_matrix'), sparse)
+
+    u = factorize(k, solver).solve(f).reshape(n, len(load_cases))
+
+    # supported dofs are mapped to the index -1, which is the zero column
+    displacements = np.zeros((len(load_cases), n + 1))
+    displacements[:, :n] = u.T
+
+    elements = list()
+    normal_forces = list()
+
+    for group in assembler.element_groups:
+        if group.batch is None:
+            continue
+
+        youngs_modulus, area, prestress = group.batch.pack_properties()
+
+        normal_forces.append(calculate_linear_normal_forces(group.batch.pack_ref_locations(),
+                                                            displacements[:, group.indices], youngs_modulus,
+                                                            area, prestress))
+        elements += [element.id for element in group.elements]
+
+    normal_forces = np.concatenate(normal_forces + [np.zeros((len(load_cases), 0))], axis=1)
+
+    return LoadCaseResults(load_cases, [dof.id for dof in assembler.dofs], elements, displacements[:, :n],
+                           normal_forces)
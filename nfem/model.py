@@ -3,24 +3,31 @@
 Authors: Thomas Oberbichler, Armin Geiser
 """
 
-from copy import deepcopy
+from copy import copy
 from typing import List, Optional, Type
+from weakref import WeakSet
 
 import numpy as np
 import numpy.linalg as la
 
-from scipy.linalg import eig
-
 from nfem.dof import Dof
+from nfem.dof_state import DofState
+from nfem.element_state import ElementState
+from nfem.iteration_history import IterationHistory
 from nfem.key_collection import KeyCollection
 from nfem.model_status import ModelStatus
 from nfem.node import Node
 from nfem.truss import Truss
 from nfem.spring import Spring
+from nfem.topology import Topology
 
-from nfem.assembler import Assembler
+from nfem.assembler import ORDERINGS, Assembler, ElementMethod
 
 from nfem import solve
+from nfem.eigen_solver import solve_buckling_eigenvalues
+from nfem.linear_solver import factorize
+from nfem.load_cases import solve_load_cases
+from nfem.path_tracing import trace_path
 
 
 class Model:
@@ -39,8 +46,9 @@ class Model:
         load factor
     previous_model : Model
         Previous state of this model
+    critical_mode_model : Model
+        Critical mode of a model computed by `solve_critical_point`, otherwise `None`
     """
-    nodes: KeyCollection[str, Node]
 
     def __init__(self, name=None):
         """Create a new model.
@@ -53,13 +61,75 @@ class Model:
 
         self.name = name
         self.status = ModelStatus.initial
-        self.nodes = KeyCollection()
-        self.elements = KeyCollection()
+        self._nodes = KeyCollection()
+        self._elements = KeyCollection()
+        self._topology = None
+        self._shared_topology = None
         self.load_factor = 0.0
-        self._previous_model = None
+        self._previous = None
+        self._children = WeakSet()
+        self._retention = None
         self.det_k = None
+        self.det_k_sign = None
+        self.log_det_k = None
+        self.negative_pivots = None
         self.first_eigenvalue = None
         self.first_eigenvector_model = None
+        self.critical_mode_model = None
+        self._dof_state = DofState()
+        self._element_state = ElementState()
+        self._topology_version = 0
+        self._assembler = None
+        self._assembler_template = None
+        self._iteration_history = None
+        self._history_retention = ('all', None)
+        self._dof_ordering = None
+        self._step_index = None
+        self._stiffness = None
+        self._initial_stiffness = None
+        self._load_cases = dict()
+
+    def _topology_changed(self):
+        self._topology_version += 1
+        self._release_shared_topology()
+
+    @property
+    def nodes(self) -> KeyCollection[str, Node]:
+        """Gets the nodes of the model."""
+        if self._topology is not None:
+            self._materialize_topology()
+        return self._nodes
+
+    @property
+    def elements(self) -> KeyCollection:
+        """Gets the elements of the model."""
+        if self._topology is not None:
+            self._materialize_topology()
+        return self._elements
+
+    def _materialize_topology(self):
+        # create the own nodes and elements of a copied state
+        self._nodes, self._elements = self._topology.materialize(self._dof_state, self._element_state)
+        self._topology = None
+
+    def _release_shared_topology(self):
+        # the nodes or elements of the model are added or replaced
+        self._shared_topology = None
+
+    def _get_topology(self):
+        # topology which can be shared with a copy of this model
+        if self._topology is not None:
+            return self._topology
+
+        if self._shared_topology is not None:
+            return self._shared_topology
+
+        topology = Topology(self._nodes, self._elements, self._dof_state, self._element_state)
+
+        if topology.is_shareable:
+            self._shared_topology = topology
+
+        return topology
 
     # === modeling
 
@@ -91,8 +161,9 @@ class Model:
         if id in self.nodes:
             raise KeyError('The model already contains a node with id {}'.format(id))
 
-        node = Node(id, x, y, 0 if z is None else z)
+        node = Node(id, x, y, 0 if z is None else z, state=self._dof_state)
 
+        self._release_shared_topology()
         self.nodes._add(node)
 
         if 'x' in support:
@@ -155,9 +226,11 @@ class Model:
         if node_b not in self.nodes:
             raise KeyError('The model does not contain a node with id {}'.format(node_b))
 
-        element = Truss(id, self.nodes[node_a], self.nodes[node_b], youngs_modulus, area, prestress, tensile_strength, compressive_strength)
+        element = Truss(id, self.nodes[node_a], self.nodes[node_b], youngs_modulus, area, prestress, tensile_strength,
+                        compressive_strength, state=self._element_state)
 
         self.elements._add(element)
+        self._topology_changed()
 
     def add_spring(self, id: str, node: str, kx: float = 0.0, ky: float = 0.0, kz: float = 0.0):
         if not isinstance(id, str):
@@ -172,9 +245,10 @@ class Model:
         if node not in self.nodes:
             raise KeyError('The model does not contain a node with id {}'.format(node))
 
-        element = Spring(id, self.nodes[node], kx, ky, kz)
+        element = Spring(id, self.nodes[node], kx, ky, kz, state=self._element_state)
 
         self.elements._add(element)
+        self._topology_changed()
 
     def add_element(self, element_type: Type, id: str, nodes: List[Node], **properties):
         if not isinstance(id, str):
@@ -197,6 +271,50 @@ class Model:
         element = element_type(id, node_list, **properties)
 
         self.elements._add(element)
+        self._topology_changed()
+
+    def add_load_case(self, name: str, forces: dict):
+        """Add a named set of nodal forces for the linear analysis of several load cases.
+
+        The load case does not change the external forces of the nodes, which are used by the
+        other solution steps. See `perform_linear_load_case_analysis`.
+
+        Parameters
+        ----------
+        name : str
+            Unique name of the load case.
+        forces : dict
+            External forces (fx, fy, fz) for each node id e.g. {'B': (0, -1, 0)}.
+        """
+        if not isinstance(name, str):
+            raise TypeError('The load case name is not a text string')
+
+        if name in self._load_cases:
+            raise KeyError('The model already contains a load case with name {}'.format(name))
+
+        load_case = dict()
+
+        for node, node_forces in forces.items():
+            if node not in self.nodes:
+                raise KeyError('The model does not contain a node with id {}'.format(node))
+
+            fx, fy, fz = node_forces
+            load_case[node] = (float(fx), float(fy), float(fz))
+
+        # the dictionary is shared with the duplicates of the model, so it is replaced
+        self._load_cases = {**self._load_cases, name: load_case}
+
+    @property
+    def load_cases(self):
+        """Names of the load cases."""
+        return list(self._load_cases)
+
+    def get_load_case(self, name):
+        """Get the nodal forces (fx, fy, fz) for each node id of a load case."""
+        if name not in self._load_cases:
+            raise KeyError('The model does not contain a load case with name {}'.format(name))
+
+        return dict(self._load_cases[name])
 
     # === degree of freedoms
 
@@ -205,11 +323,231 @@ class Model:
             node_key, dof_type = key.id
         else:
             node_key, dof_type = key
+        if self._topology is not None:
+            # avoid creating the nodes of a copied state for accessing a single dof
+            return self._topology.nodes[node_key].dof(dof_type)._with_state(self._dof_state)
         return self.nodes[node_key].dof(dof_type)
 
     @property
     def dofs(self):
-        return Assembler(self).dofs
+        return self.get_assembler().dofs
+
+    def get_assembler(self):
+        """Get the Assembler of the model.
+
+        The Assembler is cached and only rebuilt after the topology of the model changed
+        (nodes, elements or supports). A duplicate with the same topology rebinds the
+        Assembler of the model it was created from.
+
+        Returns
+        -------
+        assembler : Assembler
+            Assembler of the current topology.
+        """
+        version = (self._topology_version, self._dof_state.topology_version)
+
+        if self._assembler is None or self._assembler[0] != version:
+            template, self._assembler_template = self._assembler_template, None
+
+            if template is not None and template[0] == version:
+                assembler = template[1].rebind(self)
+            else:
+                assembler = Assembler(self, self._dof_ordering)
+
+            self._assembler = (version, assembler)
+
+        return self._assembler[1]
+
+    def set_dof_ordering(self, ordering=None):
+        """Set the ordering of the dofs in the system vectors and matrices.
+
+        The ordering is computed once for each topology by the Assembler. It is kept by the
+        duplicates of the model. The results are stored at the dofs, so they do not depend
+        on the ordering.
+
+        Parameters
+        ----------
+        ordering : str, optional
+            Available options:
+            - None: order of the elements (default)
+            - rcm: reverse Cuthill-McKee ordering for a small bandwidth
+            - mmd: minimum degree ordering for a small fill-in of sparse factorizations
+        """
+        if ordering not in ORDERINGS:
+            raise ValueError(f'Invalid dof ordering: {ordering}')
+
+        self._dof_ordering = ordering
+        self._assembler = None
+        self._assembler_template = None
+        self._stiffness = None
+        self._initial_stiffness = None
+
+    def _has_untracked_elements(self):
+        # custom elements store their properties as attributes, so their changes are not
+        # recorded by the revision of the ElementState
+        if self._topology is not None:
+            return not self._topology.is_shareable
+        if self._shared_topology is not None:
+            return False
+        return any(getattr(element, '_state', None) is not self._element_state for element in self._elements)
+
+    def _stiffness_key(self, assembler, sparse, solver):
+        # the matrix depends on the values of the dofs and on the element properties. It is
+        # not cached if the properties of some elements are not tracked
+        if self._has_untracked_elements():
+            return None
+        return (assembler.numbering, sparse, solver, self._dof_state.revision, self._element_state.revision)
+
+    def _set_stiffness(self, k, factorization, assembler, sparse=False, solver=None):
+        """Store the tangential stiffness matrix of the current state and its factorization.
+
+        The matrix is valid until the values of the dofs or the element properties of the
+        model change.
+        """
+        key = self._stiffness_key(assembler, sparse, solver)
+        self._stiffness = [key, k, factorization]
+
+    def _get_stiffness(self, assembler=None, sparse=False, solver=None):
+        if assembler is None:
+            assembler = self.get_assembler()
+
+        key = self._stiffness_key(assembler, sparse, solver)
+
+        if key is None or self._stiffness is None or self._stiffness[0] != key:
+            k = solve.assemble_matrix(assembler, ElementMethod('calculate_stiffness_matrix'), sparse)
+            self._stiffness = [key, k, None]
+
+        return self._stiffness
+
+    def _initial_stiffness_key(self, assembler, sparse, solver):
+        # K_0 does not depend on the actual values of the dofs
+        if self._has_untracked_elements():
+            return None
+        return (assembler.numbering, sparse, solver, self._dof_state.reference_revision, self._element_state.revision)
+
+    def _set_initial_stiffness(self, k, factorization, assembler, sparse=False, solver=None):
+        """Store the elastic stiffness matrix K_0 and its factorization for the initial-stiffness
+        iteration.
+
+        The duplicates of the model share K_0 until the topology, the reference coordinates or
+        the element properties change.
+        """
+        key = self._initial_stiffness_key(assembler, sparse, solver)
+        self._initial_stiffness = (key, k, factorization)
+
+    def _get_initial_stiffness(self, assembler, sparse=False, solver=None):
+        """Get the stored K_0 and its factorization as tuple or `None` if it is not valid."""
+        key = self._initial_stiffness_key(assembler, sparse, solver)
+
+        if key is None or self._initial_stiffness is None or self._initial_stiffness[0] != key:
+            return None
+
+        return self._initial_stiffness[1:]
+
+    def get_stiffness_matrix(self, assembler=None, sparse=False, solver=None):
+        """Get the tangential stiffness matrix at the current state.
+
+        The matrix is cached until the values of the dofs or the element properties change.
+        The properties of custom elements added by `add_element` are not tracked, so the
+        matrix of a model with custom elements is not cached.
+
+        Parameters
+        ----------
+        assembler : Assembler, optional
+            Assembler of the model.
+        sparse : bool, optional
+            Flag if the matrix is assembled as a sparse matrix.
+        solver : str or callable, optional
+            Linear solver backend (see `linear_solver.factorize`).
+
+        Returns
+        -------
+        k : ndarray or scipy.sparse.csr_matrix
+            Tangential stiffness matrix.
+        """
+        return self._get_stiffness(assembler, sparse, solver)[1]
+
+    def get_stiffness_factorization(self, assembler=None, sparse=False, solver=None):
+        """Get the factorization of the tangential stiffness matrix at the current state.
+
+        The factorization is cached until the state of the model changes. The same
+        factorization is used for the tangent vector and det(K). After a nonlinear solution
+        step it is the factorization of the last iteration.
+
+        Parameters
+        ----------
+        assembler : Assembler, optional
+            Assembler of the model.
+        sparse : bool, optional
+            Flag if the matrix is assembled as a sparse matrix.
+        solver : str or callable, optional
+            Linear solver backend (see `linear_solver.factorize`).
+
+        Returns
+        -------
+        factorization : object
+            Factorization with the methods `solve(rhs)` and `determinant()`.
+        """
+        stiffness = self._get_stiffness(assembler, sparse, solver)
+
+        if stiffness[2] is None:
+            stiffness[2] = factorize(stiffness[1], solver, inertia=True)
+
+        return stiffness[2]
+
+    def get_displacement_vector(self, assembler=None):
+        """Get the delta of all active dofs as a vector.
+
+        Parameters
+        ----------
+        assembler : Assembler, optional
+            Assembler is used to order the dofs in the vector. If not given, the
+            assembler of the model is used
+
+        Returns
+        -------
+        u : ndarray
+            Vector with the delta of all active dofs.
+        """
+        if assembler is None:
+            assembler = self.get_assembler()
+
+        return self._dof_state.get_delta(assembler.state_indices)
+
+    def set_displacement_vector(self, u, assembler=None):
+        """Set the delta of all active dofs from a vector.
+
+        Parameters
+        ----------
+        u : ndarray
+            Vector with the delta of all active dofs.
+        assembler : Assembler, optional
+            Assembler is used to order the dofs in the vector. If not given, the
+            assembler of the model is used
+        """
+        if assembler is None:
+            assembler = self.get_assembler()
+
+        self._dof_state.set_delta(assembler.state_indices, u[:assembler.dof_count])
+
+    def get_external_force_vector(self, assembler=None):
+        """Get the external forces of all active dofs as a vector.
+
+        Parameters
+        ----------
+        assembler : Assembler, optional
+            Assembler is used to order the dofs in the vector. If not given, the
+            assembler of the model is used
+
+        Returns
+        -------
+        f : ndarray
+            Vector with the external forces of all active dofs.
+        """
+        if assembler is None:
+            assembler = self.get_assembler()
+
+        return self._dof_state.external_force[assembler.state_indices]
 
     # === increment
 
@@ -257,7 +595,7 @@ class Model:
         """
 
         if assembler is None:
-            assembler = Assembler(self)
+            assembler = self.get_assembler()
 
         dof_count = assembler.dof_count
 
@@ -267,9 +605,9 @@ class Model:
             print('WARNING: Increment is zero because no previous model exists!')
             return increment
 
-        for index, dof in enumerate(assembler.dofs):
-            increment[index] = self.get_dof_increment(dof)
+        previous_model = self.get_previous_model()
 
+        increment[:-1] = self.get_displacement_vector(assembler) - previous_model.get_displacement_vector(assembler)
         increment[-1] = self.get_lam_increment()
 
         return increment
@@ -294,6 +632,7 @@ class Model:
             The previous model object
         """
         if not skip_iterations:
+            self._materialize_iteration_history()
             return self._previous_model
 
         # find the most previous model that is not an iteration or prediction
@@ -345,9 +684,133 @@ class Model:
 
         return history
 
+    def set_history_retention(self, policy='all', value=None):
+        """Set the policy which decides which previous models are kept in the history.
+
+        The initial model and the last three steps, which are required by the path following
+        methods and the bracketing, are always kept. Intermediate states (duplicates,
+        predictions and iterations) are only kept by the policy `all`. The history is pruned
+        immediately and after each solution step.
+
+        Parameters
+        ----------
+        policy : str
+            Retention policy. Available options:
+            - all: keep all previous models
+            - equilibrium: keep all steps but drop the intermediate states
+            - last: keep only the last `value` steps
+            - every: keep only every `value`-th step
+        value : int, optional
+            Number of steps for the policies `last` and `every`.
+        """
+        if policy not in ['all', 'equilibrium', 'last', 'every']:
+            raise ValueError('Invalid history retention policy: ' + policy)
+
+        if policy in ['last', 'every'] and (value is None or value < 1):
+            raise ValueError(f'History retention policy \'{policy}\' requires a positive value')
+
+        self._history_retention = (policy, value)
+
+        self._prune_history()
+
+    def _prune_history(self):
+        """Release the previous models which are not retained by the history retention policy.
+
+        The retained models are linked directly to each other. Only the models of the branch
+        of this model are pruned, so the walk stops at the first previous model which is
+        shared with another model (e.g. a branch). The retained models which are kept
+        independently of the following steps are marked, so the next pruning only walks the
+        models after them.
+        """
+        retention = self._history_retention
+        policy, value = retention
+
+        if policy == 'all':
+            return
+
+        # collect the steps back to a shared model or a model which is kept for good
+        steps = list()
+
+        anchor = self._previous_model
+
+        while anchor is not None and len(anchor._children) == 1 and anchor._retention != retention:
+            if anchor.status not in [ModelStatus.duplicate, ModelStatus.prediction, ModelStatus.iteration]:
+                steps.append(anchor)
+            anchor = anchor._previous_model
+
+        steps.reverse()
+
+        # number the steps once, so the numbering is not affected by pruning
+        step_index = -1 if anchor is None else anchor._get_step_index()
+
+        for step in steps + [self]:
+            if step._step_index is None:
+                step._step_index = step_index + 1
+            step_index = step._step_index
+
+        previous_model = anchor
+
+        for i, step in enumerate(steps):
+            from_end = len(steps) - 1 - i
+
+            if (i == 0 and anchor is None) or policy == 'equilibrium':
+                keep = True
+            elif policy == 'last':
+                keep = from_end < max(value, 3)
+            else:
+                keep = from_end < 3 or step._step_index % value == 0
+
+            if not keep:
+                continue
+
+            if (i == 0 and anchor is None) or (policy != 'last' and from_end >= 3):
+                # the following steps do not change the decision
+                step._retention = retention
+
+            step._previous_model = previous_model
+            step._iteration_history = None
+
+            previous_model = step
+
+        self._previous_model = previous_model
+        self._iteration_history = None
+
+    def _get_step_index(self):
+        # index of this model or of the step it belongs to
+        if self._step_index is not None:
+            return self._step_index
+
+        previous_model = self._previous_model
+        step_index = -1 if previous_model is None else previous_model._get_step_index()
+
+        if self.status in [ModelStatus.duplicate, ModelStatus.prediction, ModelStatus.iteration]:
+            return step_index
+
+        self._step_index = step_index + 1
+
+        return self._step_index
+
+    @property
+    def _previous_model(self):
+        return self._previous
+
+    @_previous_model.setter
+    def _previous_model(self, model):
+        # the models keep track of their successors to detect shared histories
+        if self._previous is not None:
+            self._previous._children.discard(self)
+        if model is not None:
+            model._children.add(self)
+        self._previous = model
+
     def get_duplicate(self, name=None, branch=False):
         r"""Get a duplicate of the model.
 
+        Only the states of the dofs and the element properties are copied. The duplicate
+        creates its own nodes and elements from the topology of the current model as soon as
+        they are requested. Node and element objects which have been obtained from the
+        current model keep belonging to the current model.
+
         Parameters
         ----------
         name : str, optional
@@ -368,56 +831,130 @@ class Model:
         model : Model
             Duplicate of the current model.
         """
-
-        temp_previous_model = self._previous_model
-        self._previous_model = None
-
-        duplicate = deepcopy(self)
-
-        self._previous_model = temp_previous_model
+        duplicate = self._copy()
 
         if branch:
             duplicate._previous_model = self._previous_model
         else:
+            self._hand_over_stiffness(duplicate)
             duplicate._previous_model = self
             duplicate.status = ModelStatus.duplicate
 
         if name is not None:
             duplicate.name = name
 
-        # make sure the duplicated model is in a clean state
-        duplicate.det_k = None
-        duplicate.first_eigenvalue = None
-        duplicate.first_eigenvector_model = None
-
         return duplicate
 
     def new_timestep(self, name=None):
-        temp_previous_model = self._previous_model
-        self._previous_model = None
-
-        duplicate = deepcopy(self)
-
-        self._previous_model = temp_previous_model
+        duplicate = self._copy()
 
+        self._hand_over_stiffness(duplicate)
         duplicate._previous_model = self
 
         if name is not None:
             duplicate.name = name
 
+        return duplicate
+
+    def _copy(self):
+        """Copy the model without its history and cached data.
+
+        The copy only owns copies of the dof and element states. Its nodes and elements are
+        created from the shared topology if they are requested.
+        """
+        duplicate = copy(self)
+
+        duplicate._dof_state = self._dof_state.copy()
+        duplicate._element_state = self._element_state.copy()
+        duplicate._nodes = None
+        duplicate._elements = None
+        duplicate._topology = self._get_topology()
+        duplicate._shared_topology = None
+        duplicate._children = WeakSet()
+        duplicate._retention = None
+        duplicate._previous_model = None
+        duplicate._assembler = None
+        duplicate._assembler_template = self._assembler or self._assembler_template
+        duplicate._iteration_history = None
+
+        # make sure the duplicated model is in a clean state
         duplicate.det_k = None
+        duplicate.det_k_sign = None
+        duplicate.log_det_k = None
+        duplicate.negative_pivots = None
         duplicate.first_eigenvalue = None
         duplicate.first_eigenvector_model = None
+        duplicate.critical_mode_model = None
+        duplicate._step_index = None
+        duplicate._stiffness = None
 
         return duplicate
 
+    def _hand_over_stiffness(self, duplicate):
+        """Move the cached stiffness matrix to a successor created by `_copy`.
+
+        The successor has the same state until it is modified, so the matrix and its
+        factorization can be used for its first prediction. The current model does not need
+        to keep them in the history.
+        """
+        duplicate._stiffness, self._stiffness = self._stiffness, None
+
+    def _record_iteration(self, assembler):
+        """Record the current state in the compact iteration history of the model.
+
+        The state is inserted between the previous model and the current model. The
+        corresponding model is created only if it is requested by `get_previous_model`.
+
+        Parameters
+        ----------
+        assembler : Assembler
+            Assembler which defines the order of the dofs.
+        """
+        history = self._iteration_history
+
+        if history is not None and (history.previous_model is not self._previous_model or
+                                    history.assembler is not assembler):
+            self._materialize_iteration_history()
+            history = None
+
+        if history is None:
+            history = IterationHistory(self._previous_model, assembler)
+            self._iteration_history = history
+
+        history.append(self)
+
+    def _materialize_iteration_history(self):
+        history = self._iteration_history
+
+        if history is None:
+            return
+
+        self._iteration_history = None
+
+        # the history is dropped if the previous model has been replaced in the meantime
+        if history.previous_model is self._previous_model:
+            self._previous_model = history.materialize(self)
+
     # === solving
 
-    def perform_linear_solution_step(self, info=False):
+    def perform_linear_solution_step(self, info=False, sparse=False, history=None, solver=None):
         """Performs a linear solution step on the model.
             It uses the current load factor.
             The results are stored at the dofs and used to update the current
             coordinates of the nodes.
+
+        Parameters
+        ----------
+        info : bool
+            Flag if information about the solution should be printed.
+        sparse : bool
+            Flag if the stiffness matrix is assembled and solved as a sparse matrix.
+        history : str or tuple, optional
+            History retention policy e.g. 'equilibrium' or ('last', 10). See
+            `set_history_retention`.
+        solver : str or callable, optional
+            Linear solver backend e.g. 'lu', 'cholesky', 'splu', 'banded' or 'cg'. See
+            `linear_solver.factorize`.
         """
 
         if info:
@@ -425,7 +962,31 @@ class Model:
             print("lambda : {}".format(self.load_factor))
             print()
 
-        solve.linear_step(self)
+        solve.linear_step(self, sparse, history, solver)
+
+    def perform_linear_load_case_analysis(self, load_cases=None, sparse=False, solver=None):
+        """Performs a linear analysis of several load cases with a single factorization.
+
+        The elastic stiffness matrix is factorized once and all load cases are solved as a
+        block right hand side. The results are returned as arrays, the state of the model is
+        not changed.
+
+        Parameters
+        ----------
+        load_cases : list, optional
+            Names of the load cases (see `add_load_case`). By default all load cases are solved.
+        sparse : bool
+            Flag if the stiffness matrix is assembled and solved as a sparse matrix.
+        solver : str or callable, optional
+            Linear solver backend e.g. 'lu', 'cholesky', 'splu', 'banded' or 'cg'. See
+            `linear_solver.factorize`.
+
+        Returns
+        -------
+        results : LoadCaseResults
+            Displacements of the active dofs and normal forces of the trusses for each load case.
+        """
+        return solve_load_cases(self, load_cases, sparse, solver)
 
     def perform_load_control_step(self, tolerance=1e-5, max_iterations=100, info=False, **options):
         solution_info = solve.load_control_step(self, tolerance, max_iterations, **options)
@@ -433,6 +994,7 @@ class Model:
             print(f'Load-Control with λ = {self.load_factor}')
             solution_info.show()
             print()
+        return solution_info
 
     def perform_displacement_control_step(self, dof, tolerance=1e-5, max_iterations=100, info=False, **options):
         solution_info = solve.displacement_control_step(self, dof, **options)
@@ -440,6 +1002,7 @@ class Model:
             print(f'Displacement-Control with {dof[1]} at node {dof[0]} = {self[dof].delta}')
             solution_info.show()
             print()
+        return solution_info
 
     def perform_arc_length_control_step(self, tolerance=1e-5, max_iterations=100, info=False, **options):
         solution_info = solve.arc_length_control_step(self, **options)
@@ -447,6 +1010,7 @@ class Model:
             print(f'Arc-Length-Control with length = {solution_info.constraint.squared_l_hat**0.5}')
             solution_info.show()
             print()
+        return solution_info
 
     def perform_non_linear_solution_step(self, strategy, tolerance=1e-5, max_iterations=100, **options):
         """Performs a non linear solution step on the model.
@@ -472,6 +1036,31 @@ class Model:
             - dof=('B','v'): for displacement-control
             - solve_det_k=True: for solving the determinant of k at convergence
             - solve_attendant_eigenvalue=True: for solving the attendant eigenvalue problem at convergence
+            - sparse=True: for assembling and solving sparse system matrices
+            - solver='cholesky': for the linear solver backend ('lu', 'cholesky', 'ldl', 'splu', 'banded' or
+              the Krylov methods 'cg', 'minres', 'gmres' e.g. 'cg-ilu', see `linear_solver.factorize`)
+            - forcing_term='eisenstat-walker': for the relative tolerance of the Krylov methods in
+              each iteration (inexact Newton). A float is used as constant tolerance. None keeps
+              the tolerance of the backend
+            - iteration_history='full': for storing a duplicate of the model at each
+              iteration instead of the compact iteration states (default: 'compact')
+            - history=('last', 10): for the history retention policy (see `set_history_retention`)
+            - iteration='modified-newton': for the iteration method. Available options:
+              'newton' (default), 'modified-newton' (the tangent of the first iteration is
+              reused), 'initial-stiffness' (the elastic stiffness is used), 'broyden' and
+              'bfgs' (quasi-Newton updates of the factorized tangent of the first iteration)
+            - refactor_interval=3: for refactorizing the tangent every 3 iterations with the
+              modified newton or a quasi-Newton method
+            - globalization='backtracking': for replacing the full Newton step. Available options:
+              'backtracking' and 'exact' (line searches) and 'dogleg' (trust region). Not
+              available for the quasi-Newton methods
+            - eigen_tracker=EigenTracker(): for solving the attendant eigenvalue problem with
+              the eigenvectors of the previous step and the factorized tangent stiffness
+
+        Returns
+        -------
+        info : NonlinearSolutionInfo
+            Information about the iterations, factorizations and timings.
         """
 
         if options.get('info', False):
@@ -491,39 +1080,78 @@ class Model:
         if options.get('info', False):
             print(f'Residual norm: {info.residual_norm}.')
             print(f'Solution found after {info.iterations} iteration steps.')
+            print(f'Stiffness factorized {info.factorizations} times.')
             print()
 
+        return info
+
+    def trace_path(self, strategy='arc-length-control', step_size=0.1, max_steps=1000, **options):
+        """Traces the equilibrium path with an adaptive step size starting from this model.
+
+        The steps are added to the history of the model. Failed steps are retried with a
+        smaller step size. See `path_tracing.trace_path` for all options e.g. `lam_target`,
+        `dof_target`, `stop_at_critical_point`, `target_iterations` or `target_contraction`.
+
+        Parameters
+        ----------
+        strategy : string
+            Path following strategy. Available options:
+            - load-control
+            - displacement-control
+            - arc-length-control
+        step_size : float
+            Initial step size (increment of lambda, of the dof or arc length).
+        max_steps : int
+            Maximum number of steps.
+        **options: kwargs (key word arguments)
+            Additional options for the path tracing and the nonlinear solution steps.
+
+        Returns
+        -------
+        model : Model
+            Last converged model.
+        """
+        return trace_path(self, strategy, step_size, max_steps, **options)
+
     def get_stiffness(self, mode='comp'):
-        assembler = Assembler(self)
+        assembler = self.get_assembler()
         k = np.zeros((assembler.dof_count, assembler.dof_count))
 
         if mode == 'comp':
-            assembler.assemble_matrix(k, lambda element: element.calculate_stiffness_matrix())
+            assembler.assemble_matrix(k, ElementMethod('calculate_stiffness_matrix'))
         elif mode == 'elas':
-            assembler.assemble_matrix(k, lambda element: element.calculate_elastic_stiffness_matrix())
+            assembler.assemble_matrix(k, ElementMethod('calculate_elastic_stiffness_matrix'))
         elif mode == 'disp':
-            assembler.assemble_matrix(k, lambda element: element.calculate_initial_displacement_stiffness_matrix())
+            assembler.assemble_matrix(k, ElementMethod('calculate_initial_displacement_stiffness_matrix'))
         elif mode == 'geom':
-            assembler.assemble_matrix(k, lambda element: element.calculate_geometric_stiffness_matrix())
+            assembler.assemble_matrix(k, ElementMethod('calculate_geometric_stiffness_matrix'))
         else:
             raise ValueError('mode')
 
         return k
 
-    def solve_det_k(self, k=None, assembler=None):
+    def solve_det_k(self, k=None, assembler=None, sparse=False, solver=None):
         """Solves the determinant of k
 
+        Besides `det_k`, the sign `det_k_sign`, the log of the absolute value `log_det_k` and
+        the number of negative eigenvalues `negative_pivots` of k are stored. They are taken
+        from the factorization of k and do not over- or underflow for large models.
+
         Parameters
         ----------
-        k : numpy.ndarray (optional)
+        k : numpy.ndarray or scipy.sparse matrix (optional)
             stiffness matrix can be directly passed.
         assembler : Object (optional)
             assembler can be passed to speed up if k is not given
+        sparse : bool (optional)
+            Flag if k is assembled as a sparse matrix if k is not given
+        solver : str or callable (optional)
+            Linear solver backend used for the factorization
         """
-        solve.solve_det_k(self)
+        solve.solve_det_k(self, k, assembler, sparse, solver)
         print(f'Det(K): {self.det_k}')
 
-    def solve_linear_eigenvalues(self, assembler=None):
+    def solve_linear_eigenvalues(self, assembler=None, sparse=False):
         """Solves the linearized eigenvalue problem
            [ k_e + eigvals * k_g(linear strain) ] * eigvecs = 0
            Stores the first positive eigenvalue and vector
@@ -532,67 +1160,51 @@ class Model:
         ----------
         assembler : Object (optional)
             assembler can be passed to speed up
+        sparse : bool (optional)
+            Flag if the matrices are assembled as sparse matrices. Only the first eigenpair
+            is computed with ARPACK instead of solving the full dense problem.
         """
         if assembler is None:
-            assembler = Assembler(self)
-
-        dof_count = assembler.dof_count
+            assembler = self.get_assembler()
 
         # assemble matrices
-        k_e = np.zeros((dof_count, dof_count))
-        k_g = np.zeros((dof_count, dof_count))
         print("=================================")
         print('Linearized prebuckling (LPB) analysis ...')
-        assembler.assemble_matrix(k_e, lambda element: element.calculate_elastic_stiffness_matrix())
-        assembler.assemble_matrix(k_g, lambda element: element.calculate_geometric_stiffness_matrix(linear=True))
-
-        # solve eigenvalue problem
-        eigvals, eigvecs = eig(k_e, -k_g)
-
-        # extract real parts of eigenvalues
-        eigvals = np.array([x.real for x in eigvals])
-
-        # sort eigenvalues and vectors
-        idx = eigvals.argsort()
-        eigvals = eigvals[idx]
-        eigvecs = eigvecs[:, idx]
+        k_e = solve.assemble_matrix(assembler, ElementMethod('calculate_elastic_stiffness_matrix'), sparse)
+        k_g = solve.assemble_matrix(assembler, ElementMethod('calculate_geometric_stiffness_matrix', linear=True),
+                                    sparse)
 
-        # remove negative eigenvalues
-        for i, eigenvalue in enumerate(eigvals):
-            if eigenvalue > 0.0:
-                break
-            else:
-                i += 1
+        # solve eigenvalue problem for the first positive eigenvalue
+        eigvals, eigvecs = solve_buckling_eigenvalues(k_e, k_g)
 
-        if i == len(eigvals):
+        if len(eigvals) == 0:
             print('System has no positive eigenvalues!')
             return
 
-        eigvals = eigvals[i:]
-        eigvecs = eigvecs[:, i:]
-
         print('First linear eigenvalue: {}'.format(eigvals[0]))
         print('First linear eigenvalue * lambda: {}'.format(eigvals[0] * self.load_factor))  # this is printed in TRUSS
-        if len(eigvecs[0]) < 10:
-            print('First linear eigenvector: {}'.format(eigvecs[0]))
+        if assembler.dof_count < 10:
+            print('First linear eigenvector: {}'.format(eigvecs[:, 0]))
 
         self.first_eigenvalue = eigvals[0]
 
         # store eigenvector as model
-        model = self.get_duplicate()
+        model = self._copy()
         model._previous_model = self
         model.status = ModelStatus.eigenvector
         model.det_k = None
+        model.det_k_sign = None
+        model.log_det_k = None
+        model.negative_pivots = None
         model.first_eigenvalue = None
         model.first_eigenvector_model = None
         model.load_factor = None
 
-        for index, dof in enumerate(assembler.dofs):
-            model[dof].delta = eigvecs[index][0]
+        model.set_displacement_vector(eigvecs[:, 0], assembler)
 
         self.first_eigenvector_model = model
 
-    def solve_eigenvalues(self, assembler=None):
+    def solve_eigenvalues(self, assembler=None, sparse=False, solver=None, tracker=None):
         """Solves the eigenvalue problem
            [ k_m + eigvals * k_g ] * eigvecs = 0
            Stores the closest (most critical) eigenvalue and vector
@@ -601,58 +1213,76 @@ class Model:
         ----------
         assembler : Object (optional)
             assembler can be passed to speed up
+        sparse : bool (optional)
+            Flag if the matrices are assembled as sparse matrices. Only the eigenpair
+            closest to 1 is computed with ARPACK in shift-invert mode.
+        solver : str or callable (optional)
+            Linear solver backend of the cached tangent factorization used by the tracker
+        tracker : EigenTracker (optional)
+            Tracker which reuses the eigenvectors of the previous step and the factorized
+            tangent stiffness of this model
         """
         if assembler is None:
-            assembler = Assembler(self)
-
-        dof_count = assembler.dof_count
+            assembler = self.get_assembler()
 
         # assemble matrices
-        k_m = np.zeros((dof_count, dof_count))
-        k_g = np.zeros((dof_count, dof_count))
         print("=================================")
         print('Attendant eigenvalue analysis ...')
-        assembler.assemble_matrix(k_m, lambda element: element.calculate_material_stiffness_matrix())
-        assembler.assemble_matrix(k_g, lambda element: element.calculate_geometric_stiffness_matrix())
+        k_m = solve.assemble_matrix(assembler, ElementMethod('calculate_material_stiffness_matrix'), sparse)
+        k_g = solve.assemble_matrix(assembler, ElementMethod('calculate_geometric_stiffness_matrix'), sparse)
 
-        # solve eigenvalue problem
-        eigvals, eigvecs = eig(k_m, -k_g)
+        # solve eigenvalue problem for the eigenvalue closest to 1
+        if tracker is None:
+            eigvals, eigvecs = solve_buckling_eigenvalues(k_m, k_g, shift=1.0)
+        else:
+            factorization = None
 
-        # extract real parts of eigenvalues
-        eigvals = np.array([x.real for x in eigvals])
+            if tracker.shift == 1.0:
+                try:
+                    factorization = self.get_stiffness_factorization(assembler, sparse, solver)
+                except RuntimeError:
+                    # singular tangent stiffness at a critical point
+                    pass
 
-        # sort eigenvalues and vectors
-        idx = eigvals.argsort()
-        eigvals = eigvals[idx]
-        eigvecs = eigvecs[:, idx]
+            eigvals, eigvecs = tracker.solve(k_m, k_g, factorization)
 
-        # find index of closest eigenvalue to 1 (we could store all but that seems like an overkill)
-        idx = (np.abs(eigvals - 1.0)).argmin()
+        idx = 0
 
         print('Closest eigenvalue: {}'.format(eigvals[idx]))
         print('Closest eigenvalue * lambda: {}'.format(eigvals[idx] * self.load_factor))  # this is printed in TRUSS
-        if len(eigvecs[idx]) < 10:
-            print('Closest eigenvector: {}'.format(eigvecs[idx]))
+        if assembler.dof_count < 10:
+            print('Closest eigenvector: {}'.format(eigvecs[:, idx]))
 
         self.first_eigenvalue = eigvals[idx]
 
         # store eigenvector as model
-        model = self.get_duplicate()
+        model = self._copy()
         model._previous_model = self
         model.status = ModelStatus.eigenvector
         model.det_k = None
+        model.det_k_sign = None
+        model.log_det_k = None
+        model.negative_pivots = None
         model.first_eigenvalue = None
         model.first_eigenvector_model = None
         model.load_factor = None
 
-        for index, dof in enumerate(assembler.dofs):
-            model[dof].delta = eigvecs[index][idx]
+        model.set_displacement_vector(eigvecs[:, idx], assembler)
 
         self.first_eigenvector_model = model
 
-    def get_tangent_vector(self, assembler=None):
+    def get_tangent_vector(self, assembler=None, sparse=False, solver=None):
         """ Get the tangent vector
 
+        Parameters
+        ----------
+        assembler : Object (optional)
+            assembler can be passed to speed up
+        sparse : bool (optional)
+            Flag if the stiffness matrix is assembled and solved as a sparse matrix
+        solver : str or callable (optional)
+            Linear solver backend used for the factorization
+
         Returns
         -------
         tangent : ndarray
@@ -660,7 +1290,7 @@ class Model:
             with v = d_u / d_lambda ... incremental velocity
         """
         if assembler is None:
-            assembler = Assembler(self)
+            assembler = self.get_assembler()
 
         dof_count = assembler.dof_count
 
@@ -668,21 +1298,13 @@ class Model:
 
         v = tangent[:-1]
 
-        k = np.zeros((dof_count, dof_count))
-        external_f = np.zeros(dof_count)
-
-        # assemble stiffness
-        assembler.assemble_matrix(k, lambda element: element.calculate_stiffness_matrix())
+        # factorize stiffness
+        factorization = self.get_stiffness_factorization(assembler, sparse, solver)
 
         # assemble force
+        external_f = self.get_external_force_vector(assembler)
 
-        for i, dof in enumerate(assembler.dofs):
-            external_f[i] += self[dof].external_force
-
-        try:
-            v[:dof_count] = la.solve(k, external_f)
-        except np.linalg.LinAlgError:
-            raise RuntimeError('Stiffness matrix is singular')
+        v[:dof_count] = factorization.solve(external_f)
 
         # lambda = 1
         tangent[-1] = 1
@@ -757,7 +1379,7 @@ class Model:
         if self.get_previous_model().get_previous_model() is None:
             raise RuntimeError('predict_with_last_increment can only be used after the first step!')
 
-        assembler = Assembler(self)
+        assembler = self.get_assembler()
 
         last_increment = self.get_previous_model().get_increment_vector(assembler)
 
@@ -771,8 +1393,7 @@ class Model:
             print("WARNING: The length of the prescribed increment is 0.0!")
 
         # update dofs at model
-        for index, dof in enumerate(assembler.dofs):
-            self[dof].delta += last_increment[index]
+        self.set_displacement_vector(self.get_displacement_vector(assembler) + last_increment[:-1], assembler)
 
         # update lam at model
         self.load_factor += last_increment[-1]
@@ -798,12 +1419,17 @@ class Model:
                 prescribed value according to the strategy
             dof : Object
                 specifies the controlled dof for 'dof' and 'delta-dof' strategy
+            sparse : bool
+                assemble and solve the stiffness matrix as a sparse matrix
+            solver : str or callable
+                linear solver backend used for the factorization
         """
         self.status = ModelStatus.prediction
-        assembler = Assembler(self)
+        assembler = self.get_assembler()
 
         # get tangent vector
-        tangent = self.get_tangent_vector(assembler=assembler)
+        tangent = self.get_tangent_vector(assembler=assembler, sparse=options.get('sparse', False),
+                                          solver=options.get('solver', None))
 
         # calculate scaling factor according to chosen strategy
         if strategy == 'lambda':
@@ -872,8 +1498,7 @@ class Model:
         tangent *= factor
 
         # update dofs at model
-        for index, dof in enumerate(assembler.dofs):
-            self[dof].delta += tangent[index]
+        self.set_displacement_vector(self.get_displacement_vector(assembler) + tangent[:-1], assembler)
 
         # update lambda at model
         self.load_factor += tangent[-1]
@@ -907,7 +1532,7 @@ class Model:
 
         eigenvector_model = previous_model.first_eigenvector_model
 
-        assembler = Assembler(self)
+        assembler = self.get_assembler()
 
         u_prediction = self.get_delta_dof_vector(model_b=previous_model, assembler=assembler)
 
@@ -926,8 +1551,7 @@ class Model:
         delta_lam = - self.get_lam_increment()
 
         # update dofs at model
-        for index, dof in enumerate(assembler.dofs):
-            self[dof].delta += delta_prediction[index]
+        self.set_displacement_vector(self.get_displacement_vector(assembler) + delta_prediction, assembler)
 
         # update lambda at model
         self.load_factor += delta_lam
@@ -959,7 +1583,7 @@ class Model:
         if previous_model is None:
             raise RuntimeError('Previous Model is None!')
 
-        assembler = Assembler(self)
+        assembler = self.get_assembler()
 
         delta_dof_vector = self.get_delta_dof_vector(previous_model, assembler=assembler)
 
@@ -968,8 +1592,7 @@ class Model:
         delta_dof_vector *= (factor - 1.0)
         delta_lambda *= (factor - 1.0)
 
-        for i, dof in enumerate(assembler.dofs):
-            self[dof].delta += delta_dof_vector[i]
+        self.set_displacement_vector(self.get_displacement_vector(assembler) + delta_dof_vector, assembler)
 
         self.load_factor += delta_lambda
 
@@ -982,8 +1605,8 @@ class Model:
             Model that is used as reference for the delta dof calculation. If
             not given, the initial model is used as reference.
         assembler: Assembler
-            Assembler is used to order the dofs in the vector. If not given, a
-            new assembler is created
+            Assembler is used to order the dofs in the vector. If not given, the
+            assembler of the model is used
 
 
         Returns
@@ -1002,14 +1625,9 @@ class Model:
             model_b = self.get_initial_model()
 
         if assembler is None:
-            assembler = Assembler(self)
-
-        delta = np.zeros(assembler.dof_count)
-
-        for index, dof in enumerate(assembler.dofs):
-            delta[index] = self[dof].delta - model_b[dof].delta
+            assembler = self.get_assembler()
 
-        return delta
+        return self.get_displacement_vector(assembler) - model_b.get_displacement_vector(assembler)
 
     def load_displacement_curve(self, dof, skip_iterations=True):
         history = self.get_model_history(skip_iterations)
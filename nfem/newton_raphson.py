@@ -6,8 +6,11 @@ Author: Armin Geiser
 import numpy as np
 import numpy.linalg as la
 
+from nfem.globalization import get_globalization
 
-def newton_raphson_solve(calculate_system, x_initial, max_iterations=100, tolerance=1e-7):
+
+def newton_raphson_solve(calculate_system, x_initial, max_iterations=100, tolerance=1e-7, globalization=None,
+                         calculate_residual=None):
     """Solves the nonlinear system defined by the `calculate_system` callback.
 
     The array with the initial solution is updated during the solve and contains
@@ -30,15 +33,29 @@ def newton_raphson_solve(calculate_system, x_initial, max_iterations=100, tolera
         Maximum number of iterations
     tolerance : float
         Convergence tolerance value for the residual norm
+    globalization : str or object
+        Globalization strategy to replace the full Newton step. Available options:
+        - 'backtracking': backtracking line search
+        - 'exact': exact line search
+        - 'dogleg': dogleg trust region
+    calculate_residual : function
+        This function evaluates only the function (rhs) with a given state (x). It is used
+        for the trial states of the globalization. If not given, `calculate_system` is used.
 
     Raises
     ----------
     RuntimeError
         If the algorithm does not converge within `max_iterations`
     """
-    x = x_initial
+    x = np.asarray(x_initial, dtype=float)
     residual_norm = None
 
+    globalization = get_globalization(globalization)
+
+    if calculate_residual is None:
+        def calculate_residual(x):
+            return calculate_system(x)[1]
+
     for i in range(1, max_iterations + 1):
 
         # calculate left and right hand side
@@ -61,7 +78,10 @@ def newton_raphson_solve(calculate_system, x_initial, max_iterations=100, tolera
             raise RuntimeError('Stiffness matrix is singular')
 
         # update x
-        x -= delta_x
+        if globalization is None:
+            x -= delta_x
+        else:
+            x += globalization.step(calculate_residual, x, delta_x, lhs, rhs)
 
     raise RuntimeError('Newthon-Raphson did not converge after {} steps. Residual norm: {}'
                        .format(max_iterations, residual_norm))
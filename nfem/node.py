@@ -6,6 +6,7 @@ Author: Thomas Oberbichler
 from typing import List
 import numpy as np
 from nfem.dof import Dof
+from nfem.dof_state import DofState
 
 
 class Node:
@@ -39,7 +40,7 @@ class Node:
     _dof_y: Dof
     _dof_z: Dof
 
-    def __init__(self, id: str, x: float, y: float, z: float):
+    def __init__(self, id: str, x: float, y: float, z: float, state: DofState = None):
         """Create a new node.
 
         Parameters
@@ -52,11 +53,30 @@ class Node:
             Initial Y coordinate of the node.
         z : float
             Initial Z coordinate of the node.
+        state : DofState, optional
+            State which stores the values of the dofs. By default the node has its own state.
         """
+        if state is None:
+            state = DofState()
         self.id = id
-        self._dof_x = Dof(id=(id, 'u'), value=x)
-        self._dof_y = Dof(id=(id, 'v'), value=y)
-        self._dof_z = Dof(id=(id, 'w'), value=z)
+        self._dof_x = Dof(id=(id, 'u'), value=x, state=state)
+        self._dof_y = Dof(id=(id, 'v'), value=y, state=state)
+        self._dof_z = Dof(id=(id, 'w'), value=z, state=state)
+
+    def _with_state(self, state):
+        # view of the same node in another state
+        node = Node.__new__(Node)
+        node.id = self.id
+        node._dof_x = self._dof_x._with_state(state)
+        node._dof_y = self._dof_y._with_state(state)
+        node._dof_z = self._dof_z._with_state(state)
+        return node
+
+    @property
+    def _dof_slice(self):
+        # the dofs of a node are stored next to each other
+        index = self._dof_x._index
+        return self._dof_x._state, slice(index, index + 3)
 
     def dof(self, dof_type: str) -> Dof:
         if dof_type == 'u':
@@ -168,7 +188,8 @@ class Node:
 
     @property
     def external_force(self):
-        return np.array([self.fx, self.fy, self.fz])
+        state, dofs = self._dof_slice
+        return state.external_force[dofs].copy()
 
     @external_force.setter
     def external_force(self, value):
@@ -177,7 +198,8 @@ class Node:
     @property
     def ref_location(self) -> List[float]:
         """Gets or sets the z coordinate of the node in the undeformed reference configuration."""
-        return np.array([self.ref_x, self.ref_y, self.ref_z])
+        state, dofs = self._dof_slice
+        return state.ref_value[dofs].copy()
 
     @ref_location.setter
     def ref_location(self, value):
@@ -185,7 +207,8 @@ class Node:
 
     @property
     def location(self):
-        return np.array([self.x, self.y, self.z])
+        state, dofs = self._dof_slice
+        return state.value[dofs].copy()
 
     @location.setter
     def location(self, value):
@@ -193,7 +216,8 @@ class Node:
 
     @property
     def displacement(self):
-        return np.array([self.u, self.v, self.w])
+        state, dofs = self._dof_slice
+        return state.value[dofs] - state.ref_value[dofs]
 
     @displacement.setter
     def displacement(self, value):
@@ -6,27 +6,78 @@ IS_NOTEBOOK = 'ipykernel' in sys.modules
 
 
 class NonlinearSolutionInfo:
-    def __init__(self, constraint, residual_norm, header, data):
+    """Information about a nonlinear solution step.
+
+    Attributes
+    ----------
+    constraint : object
+        Path following constraint of the step.
+    residual_norm : float
+        Norm of the residual at convergence.
+    header : list
+        Header of the iteration table.
+    data : list
+        Row of the iteration table for each iteration.
+    statistics : dict
+        Number of stiffness assemblies and factorizations and the time in seconds spent on
+        assembling (`assembly_time`), factorizing (`factorization_time`) and for the whole
+        step (`total_time`). For the Krylov backends also the number of iterations of the
+        linear solves (`krylov_iterations`).
+    residual_norms : list
+        Residual norm at the start of each iteration including the converged state.
+    """
+
+    def __init__(self, constraint, residual_norm, header, data, statistics=None, residual_norms=None):
         self.constraint = constraint
         self.header = header
         self.data = data
         self.residual_norm = residual_norm
+        self.statistics = dict() if statistics is None else statistics
+        self.residual_norms = list() if residual_norms is None else residual_norms
 
     @property
     def iterations(self):
         return len(self.data)
 
+    @property
+    def factorizations(self):
+        return self.statistics.get('factorizations')
+
+    @property
+    def assemblies(self):
+        return self.statistics.get('assemblies')
+
+    @property
+    def contraction_ratio(self):
+        """Largest ratio |r_k+1| / |r_k| of two successive residual norms or `None` if the
+        step converged without iterating."""
+        ratios = [b / a for a, b in zip(self.residual_norms, self.residual_norms[1:]) if a > 0]
+        return max(ratios) if ratios else None
+
+    @property
+    def timings(self):
+        return {key: value for key, value in self.statistics.items() if key.endswith('_time')}
+
+    def _summary(self):
+        summary = f'Nonlinear solution converged after {len(self.data)} iterations'
+        if self.factorizations is not None:
+            summary += f' ({self.factorizations} factorizations'
+            if 'total_time' in self.statistics:
+                summary += f', {self.statistics["total_time"]:.3f} s'
+            summary += ')'
+        return summary
+
     def show(self):
         if IS_NOTEBOOK:
             from IPython.display import display
             display(self)
         else:
-            return f'Nonlinear solution converged after {len(data)} iterations'
+            print(self._summary())
 
     def _repr_html_(self):
         template = Template(TEMPLATE)
 
-        return template.render(id=uuid.uuid4(), header=self.header, data=self.data)
+        return template.render(id=uuid.uuid4(), header=self.header, data=self.data, summary=self._summary())
 
 
 TEMPLATE = '''
@@ -59,7 +110,7 @@ TEMPLATE = '''
     }
 </style>
 
-<button type="button" class="collapsible collapsible-${id}">Nonlinear solution converged after ${len(data)} iterations</button>
+<button type="button" class="collapsible collapsible-${id}">${summary}</button>
 <div class="content">
     <table>
     <tr>
@@ -0,0 +1,138 @@
+"""This file contains the parallel parameter sweeps over independent analyses"""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+from nfem.critical_point import solve_critical_point
+from nfem.path_tracing import _is_critical_point_passed
+
+
+class LoadDisplacementCurve:
+    """Analysis which traces the equilibrium path and returns the load-displacement curve.
+
+    Attributes
+    ----------
+    dof : tuple
+        Dof of the curve e.g. ('B', 'v').
+    strategy : str
+        Path following strategy (see `Model.trace_path`).
+    step_size : float
+        Initial step size.
+    max_steps : int
+        Maximum number of steps.
+    options : dict
+        Additional options for `Model.trace_path` e.g. lam_target, stop_at_critical_point.
+    """
+
+    def __init__(self, dof, strategy='arc-length-control', step_size=0.1, max_steps=100, **options):
+        self.dof = dof
+        self.strategy = strategy
+        self.step_size = step_size
+        self.max_steps = max_steps
+        self.options = options
+
+    def __call__(self, model):
+        """Get the curve as array (2, steps) with the displacements and the load factors."""
+        model = model.trace_path(self.strategy, self.step_size, self.max_steps, **self.options)
+        return model.load_displacement_curve(self.dof)
+
+
+class CriticalLoad:
+    """Analysis which traces the equilibrium path up to the first critical point and returns
+    its load factor.
+
+    The path is traced until the sign of det(K) or the number of negative pivots changes.
+    The critical point is computed with `solve_critical_point` from the last step.
+
+    Attributes
+    ----------
+    strategy : str
+        Path following strategy (see `Model.trace_path`).
+    step_size : float
+        Initial step size.
+    max_steps : int
+        Maximum number of steps.
+    options : dict
+        Additional options for `Model.trace_path` e.g. lam_target, sparse.
+    """
+
+    def __init__(self, strategy='arc-length-control', step_size=0.1, max_steps=100, **options):
+        self.strategy = strategy
+        self.step_size = step_size
+        self.max_steps = max_steps
+        self.options = options
+
+    def __call__(self, model):
+        """Get the load factor at the critical point or `None` if no critical point is passed."""
+        model = model.trace_path(self.strategy, self.step_size, self.max_steps, stop_at_critical_point=True,
+                                 **self.options)
+
+        previous_model = model.get_previous_model()
+
+        if previous_model is None or not _is_critical_point_passed(model, previous_model):
+            return None
+
+        critical_model = solve_critical_point(model, sparse=self.options.get('sparse', False),
+                                              solver=self.options.get('solver'))
+
+        return critical_model.load_factor
+
+
+def _expand(parameter_grid):
+    """Get the list of parameter sets of a grid."""
+    if isinstance(parameter_grid, dict):
+        names = list(parameter_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*parameter_grid.values())]
+    return [dict(parameters) for parameters in parameter_grid]
+
+
+def _run(model_factory, analysis, parameters):
+    # only the result of the analysis is sent back to the parent process
+    return analysis(model_factory(**parameters))
+
+
+def sweep(model_factory, parameter_grid, analysis, workers=None):
+    """Runs independent analyses for all parameter sets in a process pool.
+
+    Each worker creates its model with `model_factory(**parameters)` and returns only the
+    result of `analysis(model)` (e.g. a load-displacement curve or a critical load), so the
+    models and their histories stay in the worker processes.
+
+    The factory and the analysis are sent to the workers with pickle. They have to be
+    defined at the top level of a module (no lambdas or local functions). Instances of
+    `LoadDisplacementCurve` and `CriticalLoad` can be used as analysis.
+
+    Parameters
+    ----------
+    model_factory : function
+        Creates a new model for the keyword arguments of a parameter set.
+    parameter_grid : dict or list
+        A dict with a list of values for each parameter e.g. {'area': [1, 2], 'e': [1, 10]}.
+        All combinations are analyzed. A list of dicts is used as list of parameter sets.
+    analysis : function Model -> object
+        Analysis of a model. The result has to be picklable.
+    workers : int, optional
+        Number of worker processes. By default the number of processors is used. With
+        `workers=1` the analyses run in the current process.
+
+    Returns
+    -------
+    results : list
+        Tuple (parameters, result) for each parameter set in the order of the grid.
+
+    Raises
+    ------
+    Exception
+        The first exception raised by an analysis, e.g. a RuntimeError if a step does not
+        converge.
+    """
+    parameter_sets = _expand(parameter_grid)
+
+    if workers == 1:
+        results = [_run(model_factory, analysis, parameters) for parameters in parameter_sets]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run, model_factory, analysis, parameters) for parameters in parameter_sets]
+            results = [future.result() for future in futures]
+
+    return list(zip(parameter_sets, results))
@@ -3,8 +3,6 @@
 Author: Armin Geiser
 """
 
-from nfem.assembler import Assembler
-
 
 class LoadControl:
     """The LoadControl adds a constraint to the non linear problem that ensures
@@ -112,7 +110,7 @@ class DisplacementControl:
             System vector to store the results. Existing values are overwritten.
         """
         dc.fill(0.0)
-        assembler = Assembler(model)
+        assembler = model.get_assembler()
         index = assembler.index_of_dof(self.dof)
         dc[index] = 1.0
 
@@ -167,25 +165,25 @@ class ArcLengthControl:
         """
         dc.fill(0.0)
 
-        assembler = Assembler(model)
+        assembler = model.get_assembler()
         previous_model = model.get_previous_model()
 
-        for index, dof in enumerate(assembler.dofs):
-            current_value = model[dof].delta
-            previous_value = previous_model[dof].delta
-
-            dc[index] = 2 * (current_value - previous_value)
-
-        dc[-1] = 2 * (model.load_factor - model.get_previous_model().load_factor)
+        dc[:-1] = 2 * (model.get_displacement_vector(assembler) - previous_model.get_displacement_vector(assembler))
+        dc[-1] = 2 * (model.load_factor - previous_model.load_factor)
 
     def _calculate_squared_predictor_length(self, model):
         previous_model = model.get_previous_model()
 
-        squared_l = 0.0
+        # nodes are only appended, so the active dofs are stored at the same indices of both
+        # states if the states have the same size
+        if len(model._dof_state) != len(previous_model._dof_state):
+            raise RuntimeError('The previous model has a different topology')
+
+        state_indices = model.get_assembler().state_indices
+
+        delta_u = model._dof_state.value[state_indices] - previous_model._dof_state.value[state_indices]
 
-        for node, previous_node in zip(model.nodes, previous_model.nodes):
-            dx, dy, dz = node.location - previous_node.location
-            squared_l += dx**2 + dy**2 + dz**2
+        squared_l = delta_u @ delta_u
 
         delta_lam = model.load_factor - previous_model.load_factor
 
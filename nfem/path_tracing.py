@@ -0,0 +1,196 @@
+"""This file contains the adaptive driver for tracing equilibrium paths"""
+
+import numpy as np
+from numpy.linalg import LinAlgError
+
+
+def _predict(model, strategy, step_size, **options):
+    sparse = options.get('sparse', False)
+    solver = options.get('solver', None)
+
+    if strategy == 'load-control':
+        model.predict_tangential(strategy='delta-lambda', value=step_size, sparse=sparse, solver=solver)
+    elif strategy == 'displacement-control':
+        model.predict_tangential(strategy='delta-dof', dof=options['dof'], value=step_size, sparse=sparse,
+                                 solver=solver)
+    else:
+        model.predict_tangential(strategy='arc-length', value=step_size, sparse=sparse, solver=solver)
+
+
+def _is_critical_point_passed(model_0, model_1):
+    """Check if the stability of the tangent stiffness changed between two models."""
+    if model_0.negative_pivots is not None and model_1.negative_pivots is not None:
+        return model_0.negative_pivots != model_1.negative_pivots
+    if model_0.det_k_sign is not None and model_1.det_k_sign is not None:
+        return model_0.det_k_sign != model_1.det_k_sign
+    return False
+
+
+def _is_passed(value_0, value_1, target):
+    """Check if the target lies between two values (including the current one)."""
+    return (value_0 - target) * (value_1 - target) <= 0.0 and value_0 != value_1
+
+
+def trace_path(model, strategy='arc-length-control', step_size=0.1, max_steps=1000, target_iterations=5,
+               min_step_size=None, max_step_size=None, cutback_factor=0.5, max_growth=2.0, lam_target=None,
+               dof_target=None, stop_at_critical_point=False, tolerance=1e-5, max_iterations=20, info=False,
+               target_contraction=0.25, **options):
+    """Traces the equilibrium path with an adaptive step size.
+
+    Each step is predicted with the tangent and solved with the chosen path following
+    strategy. After a converged step the next step size is scaled with the smaller factor of
+    sqrt(target_iterations / iterations) and sqrt(target_contraction / contraction), where
+    the contraction is the largest ratio of two successive residual norms of the step. So the
+    step size grows where the path is smooth and shrinks where Newton needs many iterations or
+    converges slowly. The contraction only reduces the step size if it is larger than
+    `target_contraction`. If a step does not converge (e.g. maximum number of iterations or a
+    singular system), it is discarded and retried from the last converged model with a step
+    size reduced by `cutback_factor`.
+
+    The tracing stops after `max_steps`, if a target of the load factor or of a dof has been
+    reached or passed (also by the start model), or (optionally) after a critical point has
+    been passed. The critical point can be computed afterwards with `bracketing` or
+    `solve_critical_point`.
+
+    Parameters
+    ----------
+    model : Model
+        Model at the start of the path, e.g. the initial model or the last converged step.
+    strategy : str
+        Path following strategy ('load-control', 'displacement-control' or
+        'arc-length-control').
+    step_size : float
+        Initial step size. It is the increment of the load factor for load control, the
+        increment of the dof for displacement control and the arc length for arc-length
+        control. The sign sets the direction for load and displacement control.
+    max_steps : int
+        Maximum number of converged steps.
+    target_iterations : int
+        Desired number of Newton iterations per step.
+    min_step_size : float, optional
+        Smallest allowed absolute step size. Default is step_size * 1e-6.
+    max_step_size : float, optional
+        Largest allowed absolute step size. Default is step_size * 100.
+    cutback_factor : float
+        Factor for the step size after a failed step.
+    max_growth : float
+        Maximum factor for the step size between two steps.
+    lam_target : float, optional
+        The tracing stops if the load factor reaches this value. Load control hits the target
+        exactly.
+    dof_target : float, optional
+        The tracing stops if the dof `dof` reaches this value. Displacement control hits the
+        target exactly.
+    stop_at_critical_point : bool
+        Flag if the tracing stops after the sign of det(K) or the number of negative pivots
+        changed.
+    tolerance : float
+        Tolerance for the newton raphson.
+    max_iterations : int
+        Maximum number of iterations per step. A step exceeding it is cut back.
+    info : bool
+        Flag if information about the steps should be printed.
+    target_contraction : float
+        Desired largest ratio of two successive residual norms per step.
+    options :
+        additional options for the nonlinear solution e.g.
+        - dof=('B','v'): for displacement-control and `dof_target`
+        - sparse=True, solver='splu', iteration='bfgs', history=('last', 10), ...
+
+    Returns
+    -------
+    model : Model
+        Last converged model.
+
+    Raises
+    ------
+    RuntimeError
+        If a step does not converge with the minimum step size.
+    """
+    if strategy not in ['load-control', 'displacement-control', 'arc-length-control']:
+        raise ValueError('Invalid path following strategy:' + strategy)
+
+    dof = options.get('dof')
+
+    if dof is None and (strategy == 'displacement-control' or dof_target is not None):
+        raise ValueError('The option dof is required for displacement-control and dof_target')
+
+    if stop_at_critical_point:
+        options['solve_det_k'] = True
+
+    if min_step_size is None:
+        min_step_size = abs(step_size) * 1e-6
+
+    if max_step_size is None:
+        max_step_size = abs(step_size) * 100
+
+    # the start model can already be at the target
+    if lam_target is not None and model.load_factor == lam_target:
+        return model
+
+    if dof_target is not None and model[dof].delta == dof_target:
+        return model
+
+    for step in range(1, max_steps + 1):
+        current_step_size = step_size
+
+        # the step ends exactly at the target of the controlled quantity
+        if strategy == 'load-control' and lam_target is not None:
+            current_step_size = np.sign(step_size) * min(abs(step_size), abs(lam_target - model.load_factor))
+        elif strategy == 'displacement-control' and dof_target is not None:
+            current_step_size = np.sign(step_size) * min(abs(step_size), abs(dof_target - model[dof].delta))
+
+        while True:
+            # each attempt starts from the last converged model
+            new_model = model.get_duplicate()
+
+            try:
+                _predict(new_model, strategy, current_step_size, **options)
+                solution_info = new_model.perform_non_linear_solution_step(strategy, tolerance, max_iterations,
+                                                                           **options)
+                break
+            except (RuntimeError, LinAlgError) as error:
+                # the failed attempt is removed from the history of the last converged model
+                new_model._previous_model = None
+
+                current_step_size *= cutback_factor
+
+                if info:
+                    print(f'Step {step} failed ({error}). Cut back to step size {current_step_size}')
+
+                if abs(current_step_size) < min_step_size:
+                    raise RuntimeError(f'Path tracing: Step {step} did not converge with the minimum step '
+                                       f'size {min_step_size}')
+
+        iterations = solution_info.iterations
+
+        if info:
+            print(f'Step {step}: λ = {new_model.load_factor}, step size = {current_step_size}, '
+                  f'iterations = {iterations}, contraction = {solution_info.contraction_ratio}')
+
+        previous_model, model = model, new_model
+
+        # check the stopping criteria
+        if lam_target is not None and _is_passed(model.load_factor, previous_model.load_factor, lam_target):
+            break
+
+        if dof_target is not None and _is_passed(model[dof].delta, previous_model[dof].delta, dof_target):
+            break
+
+        if stop_at_critical_point and _is_critical_point_passed(model, previous_model):
+            if info:
+                print('Critical point passed.')
+            break
+
+        # adapt the step size to the number of iterations and the observed contraction of the
+        # residual
+        factor = min(max_growth, np.sqrt(target_iterations / max(iterations, 1)))
+
+        contraction = solution_info.contraction_ratio
+
+        if contraction is not None and contraction > target_contraction:
+            factor = min(factor, np.sqrt(target_contraction / contraction))
+
+        step_size = np.sign(step_size) * np.clip(abs(current_step_size) * factor, min_step_size, max_step_size)
+
+    return model
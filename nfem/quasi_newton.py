@@ -0,0 +1,118 @@
+"""This module contains quasi-Newton approximations of the inverse system matrix.
+
+The approximations are built from a factorized system (e.g. a `BorderedSystem`) and
+low-rank updates with the steps and residuals of the previous iterations. Solving with the
+approximation only requires the stored factorization and a few vector operations.
+
+Both classes are used in place of the left hand side in `newton_raphson_solve`. They
+assume that the full step `x -= solve(rhs)` is applied in each iteration.
+"""
+
+import numpy as np
+
+
+class BroydenInverse:
+    """Inverse system matrix with Broyden rank-one updates.
+
+    The inverse is updated with Broyden's "good" update in the product form
+    H_{n+1} = (I + s_{n+1} s_n^T / |s_n|^2) H_n, which only requires the previous steps
+    (see C.T. Kelley, Iterative Methods for Linear and Nonlinear Equations, 1995).
+
+    Attributes
+    ----------
+    base : object
+        Initial system with a `solve(rhs)` method.
+    """
+
+    def __init__(self, base):
+        """Create a new BroydenInverse.
+
+        Parameters
+        ----------
+        base : object
+            Initial system with a `solve(rhs)` method.
+        """
+        self.base = base
+        self._steps = list()
+
+    def solve(self, rhs):
+        """Get the correction `delta_x` for the residual `rhs` and record the step `-delta_x`."""
+        steps = self._steps
+
+        z = -self.base.solve(rhs)
+
+        for j in range(len(steps) - 1):
+            z += steps[j + 1] * ((steps[j] @ z) / (steps[j] @ steps[j]))
+
+        if steps:
+            denominator = 1.0 - (steps[-1] @ z) / (steps[-1] @ steps[-1])
+
+            if abs(denominator) < np.finfo(float).eps**0.5:
+                # the update is degenerated. restart with the initial system
+                z = -self.base.solve(rhs)
+                steps.clear()
+            else:
+                z /= denominator
+
+        steps.append(z)
+
+        return -z
+
+
+class BFGSInverse:
+    """Inverse system matrix with BFGS rank-two updates.
+
+    The inverse is applied with the two-loop recursion of the limited memory BFGS method.
+    Pairs with a non positive curvature `s^T y` are skipped, so the approximation falls
+    back to the initial system if the system matrix is not positive definite.
+
+    Attributes
+    ----------
+    base : object
+        Initial system with a `solve(rhs)` method.
+    """
+
+    def __init__(self, base):
+        """Create a new BFGSInverse.
+
+        Parameters
+        ----------
+        base : object
+            Initial system with a `solve(rhs)` method.
+        """
+        self.base = base
+        self._pairs = list()
+        self._previous = None
+
+    def solve(self, rhs):
+        """Get the correction `delta_x` for the residual `rhs` and update with the last step."""
+        pairs = self._pairs
+
+        if self._previous is not None:
+            previous_rhs, previous_delta = self._previous
+
+            s = -previous_delta
+            y = rhs - previous_rhs
+            s_y = s @ y
+
+            if s_y > np.finfo(float).eps * np.linalg.norm(s) * np.linalg.norm(y):
+                pairs.append((s, y, 1.0 / s_y))
+
+        q = np.array(rhs, dtype=float)
+
+        alphas = list()
+
+        for s, y, rho in reversed(pairs):
+            alpha = rho * (s @ q)
+            q -= alpha * y
+            alphas.append(alpha)
+
+        z = self.base.solve(q)
+
+        for (s, y, rho), alpha in zip(pairs, reversed(alphas)):
+            beta = rho * (y @ z)
+            z += s * (alpha - beta)
+
+        self._previous = (np.array(rhs, dtype=float), z.copy())
+
+        return z
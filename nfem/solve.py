@@ -1,9 +1,14 @@
 import numpy as np
-from nfem.assembler import Assembler
 from nfem.nonlinear_solution_data import NonlinearSolutionInfo
+from nfem.assembler import ElementMethod
 from nfem.model_status import ModelStatus
 from nfem.path_following_method import ArcLengthControl, DisplacementControl, LoadControl
-from numpy.linalg import det, norm, solve as linear_solve
+from nfem.globalization import get_globalization
+from nfem.linear_solver import KrylovSolver, _is_small_bandwidth, factorize, from_lower_band
+from nfem.quasi_newton import BFGSInverse, BroydenInverse
+from numpy.linalg import norm
+from time import perf_counter
+from scipy.sparse import csr_matrix, issparse, bmat
 import io
 
 
@@ -30,44 +35,261 @@ class SolutionInfo:
         return contents
 
 
-def linear_step(model):
-    assembler = Assembler(model)
+def assemble_matrix(assembler, calculate_element_matrix, sparse=False):
+    """Assemble a new dense or sparse system matrix.
+
+    A sparse matrix is assembled in band storage (DIA format) if the bandwidth of the dof
+    numbering is small compared to the number of dofs (see `Assembler.bandwidth`). It is
+    factorized with the banded backend by default. Otherwise the CSR format is used.
+    """
+    if sparse and _is_small_bandwidth(assembler.dof_count, assembler.bandwidth):
+        return from_lower_band(assembler.assemble_banded_matrix(calculate_element_matrix))
+
+    if sparse:
+        return assembler.assemble_sparse_matrix(calculate_element_matrix)
 
     dof_count = assembler.dof_count
+    system_matrix = np.zeros((dof_count, dof_count))
+    assembler.assemble_matrix(system_matrix, calculate_element_matrix)
 
-    u = np.zeros(dof_count)
+    return system_matrix
 
-    for dof in assembler.dofs:
-        index = assembler.index_of_dof(dof)
-        u[index] = model[dof].delta
 
-    k = np.zeros((dof_count, dof_count))
-    f = np.zeros(dof_count)
+class BorderedSystem:
+    """Extended system of the path following methods
 
-    for i, dof in enumerate(assembler.dofs):
-        f[i] += model[dof].external_force
+        [ k    b ] [x]   [r]
+        [ c^T  d ] [y] = [g]
 
-    assembler.assemble_matrix(k, lambda element: element.calculate_elastic_stiffness_matrix())
+    The system is solved by block elimination. `k` is factorized once and solved for the
+    right hand sides `r` and `b`. The last unknown is recovered from the constraint row::
 
-    f *= model.load_factor
+        k y1 = r,  k y2 = b,  y = (g - c^T y1) / (d - c^T y2),  x = y1 - y y2
+
+    This keeps the symmetry and sparsity of `k`. If `k` is singular (e.g. at a limit point)
+    or the elimination is inaccurate, the full system is solved instead. For the Krylov
+    backends the full system is solved with GMRES.
+
+    Attributes
+    ----------
+    k : ndarray or scipy.sparse matrix
+        System matrix (n, n).
+    b : ndarray
+        Last column (n,).
+    c : ndarray
+        Last row (n,).
+    d : float
+        Diagonal entry of the last row.
+    solver : str or callable
+        Linear solver backend used to factorize `k` (see `linear_solver.factorize`).
+    factorization : object
+        Factorization of `k` or `None` if `k` has not been factorized yet.
+    """
+
+    def __init__(self, k, b, c, d, solver=None):
+        self.k = k
+        self.b = b
+        self.c = c
+        self.d = d
+        self.solver = solver
+        self.factorization = None
+
+    @property
+    def shape(self):
+        n = len(self.b) + 1
+        return (n, n)
+
+    def to_matrix(self):
+        """Get the full system as a dense or sparse (CSR) matrix."""
+        if issparse(self.k):
+            return bmat([[self.k, csr_matrix(self.b[:, None])],
+                         [csr_matrix(self.c[None, :]), csr_matrix([[self.d]])]], format='csr')
+
+        n = len(self.b)
+
+        matrix = np.empty((n + 1, n + 1))
+        matrix[:n, :n] = self.k
+        matrix[:n, -1] = self.b
+        matrix[-1, :n] = self.c
+        matrix[-1, -1] = self.d
+
+        return matrix
+
+    def matvec(self, v):
+        """Multiply the system with the vector `v` (n + 1,)."""
+        return np.append(self.k @ v[:-1] + self.b * v[-1], self.c @ v[:-1] + self.d * v[-1])
+
+    def rmatvec(self, v):
+        """Multiply the transposed system with the vector `v` (n + 1,)."""
+        return np.append(self.k.T @ v[:-1] + self.c * v[-1], self.b @ v[:-1] + self.d * v[-1])
+
+    def _solve_block_elimination(self, rhs):
+        n = len(self.b)
+        r, g = rhs[:n], rhs[n]
+
+        if self.factorization is None:
+            self.factorization = factorize(self.k, self.solver)
+
+        y1, y2 = self.factorization.solve(np.column_stack([r, self.b])).T
+
+        denominator = self.d - self.c @ y2
+
+        if denominator == 0:
+            raise RuntimeError('Bordered system is singular')
+
+        y = (g - self.c @ y1) / denominator
+        x = y1 - y * y2
+
+        # block elimination is unstable if k is nearly singular
+        residual = np.append(self.k @ x + self.b * y - r, self.c @ x + self.d * y - g)
+
+        if isinstance(self.factorization, KrylovSolver):
+            # the solutions of the iterative solver are accurate up to its tolerance
+            limit = max(np.sqrt(np.finfo(float).eps), 10 * self.factorization.tolerance) * \
+                max(norm(rhs) + abs(y) * norm(self.b), 1.0)
+        else:
+            limit = np.sqrt(np.finfo(float).eps) * max(norm(rhs), 1.0)
+
+        if not norm(residual) <= limit:
+            raise RuntimeError('Block elimination is inaccurate')
+
+        return np.append(x, y)
+
+    def solve(self, rhs):
+        """Solve the system for the given right hand side.
+
+        Parameters
+        ----------
+        rhs : ndarray
+            Right hand side [r, g] (n + 1,).
 
+        Returns
+        -------
+        solution : ndarray
+            Solution [x, y] (n + 1,).
+        """
+        try:
+            return self._solve_block_elimination(rhs)
+        except (np.linalg.LinAlgError, RuntimeError, ValueError):
+            if isinstance(self.factorization, KrylovSolver):
+                # the full system is not symmetric
+                full_system = self.factorization.with_matrix(self.to_matrix(), 'gmres')
+                solution = full_system.solve(rhs)
+                self.factorization.iterations += full_system.iterations
+                return solution
+            return solve_linear_system(self.to_matrix(), rhs)
+
+
+def solve_linear_system(lhs, rhs, solver=None):
+    """Solve a dense, sparse or bordered linear system.
+
+    Parameters
+    ----------
+    lhs : ndarray, scipy.sparse matrix, BorderedSystem or quasi-Newton inverse
+        Left hand side.
+    rhs : ndarray
+        Right hand side.
+    solver : str or callable, optional
+        Linear solver backend (see `linear_solver.factorize`).
+    """
+    if isinstance(lhs, (BorderedSystem, BFGSInverse, BroydenInverse)):
+        return lhs.solve(rhs)
+
+    return factorize(lhs, solver).solve(rhs)
+
+
+def determinant(k, solver=None):
+    """Compute the determinant of a dense or sparse matrix.
+
+    Parameters
+    ----------
+    k : ndarray or scipy.sparse matrix
+        Square matrix.
+    solver : str or callable, optional
+        Linear solver backend (see `linear_solver.factorize`).
+    """
     try:
-        u = linear_solve(k, f)
-    except np.linalg.LinAlgError:
-        raise RuntimeError('Stiffness matrix is singular')
+        return factorize(k, solver).determinant()
+    except RuntimeError:
+        if solver is None:
+            return 0.0
+
+    # e.g. Cholesky fails for matrices which are not positive definite
+    return determinant(k)
+
+
+def apply_history_retention(model, history=None):
+    """Prune the history of the model after a solution step.
+
+    Parameters
+    ----------
+    model : Model
+        Model with the history.
+    history : str or tuple, optional
+        Retention policy e.g. 'equilibrium' or ('last', 10). If not given, the current policy
+        of the model is used.
+    """
+    if history is None:
+        model._prune_history()
+    elif isinstance(history, str):
+        model.set_history_retention(history)
+    else:
+        model.set_history_retention(*history)
+
+
+def linear_step(model, sparse=False, history=None, solver=None):
+    assembler = model.get_assembler()
 
-    for index, dof in enumerate(assembler.dofs):
-        model[dof].delta = u[index]
+    f = model.get_external_force_vector(assembler)
+
+    k = assemble_matrix(assembler, ElementMethod('calculate_elastic_stiffness_matrix'), sparse)
+
+    f *= model.load_factor
+
+    u = solve_linear_system(k, f, solver)
+
+    model.set_displacement_vector(u, assembler)
 
     model.status = ModelStatus.equilibrium
 
+    apply_history_retention(model, history)
+
     return SolutionInfo(converged=True, iterations=1, residual_norm=0)
 
 
-def newton_raphson_solve(calculate_system, x_initial, max_iterations=100, tolerance=1e-7, callback=None):
+def newton_raphson_solve(calculate_system, x_initial, max_iterations=100, tolerance=1e-7, callback=None,
+                         globalization=None, calculate_residual=None):
+    """Solve the nonlinear system defined by the `calculate_system` callback.
+
+    Parameters
+    ----------
+    calculate_system : function
+        Returns lhs and rhs for a given x. The lhs can be any system supported by
+        `solve_linear_system`.
+    x_initial : ndarray
+        Initial guess. It is updated in place and contains the solution at convergence.
+    max_iterations : int
+        Maximum number of iterations.
+    tolerance : float
+        Convergence tolerance for the residual norm.
+    callback : function, optional
+        Called with the iteration, the residual norm and the norm of the step.
+    globalization : str or object, optional
+        Globalization strategy ('backtracking', 'exact' or 'dogleg'). By default the full
+        Newton step is taken. See `globalization.get_globalization`.
+    calculate_residual : function, optional
+        Returns only the rhs for a given x. It is used for the trial points of the
+        globalization. By default `calculate_system` is used.
+    """
     x = x_initial
     residual_norm = None
 
+    globalization = get_globalization(globalization)
+
+    if calculate_residual is None:
+        def calculate_residual(x):
+            return calculate_system(x)[1]
+
     for iteration in range(1, max_iterations + 1):
         # calculate left and right hand side
         lhs, rhs = calculate_system(x)
@@ -80,16 +302,18 @@ def newton_raphson_solve(calculate_system, x_initial, max_iterations=100, tolera
             return residual_norm, iteration
 
         # compute delta_x
-        try:
-            delta_x = linear_solve(lhs, rhs)
-        except np.linalg.LinAlgError:
-            raise RuntimeError('Stiffness matrix is singular')
+        delta_x = solve_linear_system(lhs, rhs)
 
-        # update x
-        x -= delta_x
+        # update x with the full Newton step or the step of the globalization strategy
+        if globalization is None:
+            step = -delta_x
+        else:
+            step = globalization.step(calculate_residual, x, delta_x, lhs, rhs)
+
+        x += step
 
         if callback:
-            callback(iteration, residual_norm, norm(delta_x))
+            callback(iteration, residual_norm, norm(step))
 
     raise RuntimeError(f'Newthon-Raphson did not converge after {max_iterations} steps. Residual norm: {residual_norm}')
 
@@ -111,55 +335,219 @@ def arc_length_control_step(model, tolerance=1e-5, max_iterations=100, **options
 
 def nonlinear_step(constraint, model, tolerance=1e-5, max_iterations=100, **options):
     # initialize working matrices and functions for newton raphson
-    assembler = Assembler(model)
+    assembler = model.get_assembler()
     dof_count = assembler.dof_count
 
+    sparse = options.get('sparse', False)
+    solver = options.get('solver', None)
+
+    iteration_method = options.get('iteration', 'newton')
+    refactor_interval = options.get('refactor_interval', None)
+
+    if iteration_method not in ['newton', 'modified-newton', 'initial-stiffness', 'bfgs', 'broyden']:
+        raise ValueError('Invalid iteration method: ' + iteration_method)
+
+    quasi_newton = {'bfgs': BFGSInverse, 'broyden': BroydenInverse}.get(iteration_method)
+
+    globalization = options.get('globalization', None)
+
+    if quasi_newton is not None and globalization not in [None, 'none']:
+        # the updates of the quasi-Newton inverses assume the full step
+        raise ValueError('The globalization is not available for quasi-Newton iteration methods')
+
+    forcing_term = options.get('forcing_term', 'eisenstat-walker')
+
+    statistics = {'assemblies': 0, 'factorizations': 0, 'assembly_time': 0.0, 'factorization_time': 0.0}
+
+    # relative tolerance of the iterative linear solves for the current iteration and the
+    # tolerance of the backend
+    forcing = [None, None]
+
+    # Krylov solvers of the step and their number of iterations before the step
+    krylov_solvers = dict()
+
+    def update_forcing_term():
+        if forcing_term is None:
+            return
+
+        residual_norm = residual_norms[-1]
+
+        if forcing_term != 'eisenstat-walker':
+            eta = forcing_term
+        elif len(residual_norms) == 1:
+            eta = 0.1
+        else:
+            # choice 2 of S.C. Eisenstat and H.F. Walker, Choosing the forcing terms in an
+            # inexact Newton method, 1996
+            eta_previous = forcing[0]
+            eta = 0.9 * (residual_norm / residual_norms[-2])**2
+            if 0.9 * eta_previous**2 > 0.1:
+                eta = max(eta, 0.9 * eta_previous**2)
+
+        # the linear system is not solved more accurately than required by the tolerance
+        if residual_norm > 0:
+            eta = max(eta, 0.5 * tolerance / residual_norm)
+
+        forcing[0] = min(eta, 0.1)
+
+    def apply_forcing_term(factorization):
+        if isinstance(factorization, KrylovSolver):
+            krylov_solvers.setdefault(id(factorization), (factorization, factorization.iterations))
+        if isinstance(factorization, KrylovSolver) and forcing[0] is not None:
+            if forcing[1] is None:
+                forcing[1] = factorization.tolerance
+            factorization.tolerance = forcing[0]
+
+    def factorize_k(k):
+        start = perf_counter()
+        # the iterations use the pivoting factorization. The inertia of the converged matrix
+        # is computed once by `solve_det_k`
+        factorization = factorize(k, solver)
+        apply_forcing_term(factorization)
+        statistics['factorizations'] += 1
+        statistics['factorization_time'] += perf_counter() - start
+        return factorization
+
+    def assemble_k():
+        start = perf_counter()
+        if iteration_method == 'initial-stiffness':
+            k = assemble_matrix(assembler, ElementMethod('calculate_elastic_stiffness_matrix'), sparse)
+        else:
+            k = assemble_matrix(assembler, ElementMethod('calculate_stiffness_matrix'), sparse)
+        statistics['assemblies'] += 1
+        statistics['assembly_time'] += perf_counter() - start
+        return k
+
+    def initial_stiffness():
+        # K_0 does not change during the analysis, so it is factorized once and kept on the
+        # model for the following steps
+        stiffness = model._get_initial_stiffness(assembler, sparse, solver)
+
+        if stiffness is None:
+            k = assemble_k()
+            stiffness = (k, factorize_k(k))
+            model._set_initial_stiffness(*stiffness, assembler, sparse, solver)
+        else:
+            apply_forcing_term(stiffness[1])
+
+        return stiffness
+
+    residual_norms = []
+
+    def is_refactor_required(previous_system, iteration, residual_norm):
+        if previous_system is None or iteration_method == 'newton':
+            return True
+        if quasi_newton is not None and residual_norm > residual_norms[-1]:
+            # the updates diverge e.g. for an indefinite tangent. restart with a new tangent
+            return True
+        if iteration_method != 'initial-stiffness' and refactor_interval is not None:
+            return iteration % refactor_interval == 0
+        return False
+
     data = []
 
-    def calculate_system(x):
-        # create a duplicate of the current state before updating and insert it in the history
-        duplicate = model.get_duplicate()
-        duplicate._previous_model = model._previous_model
-        model._previous_model = duplicate
-        duplicate.status = model.status
+    iteration_history = options.get('iteration_history', 'compact')
 
-        # update status flag
-        model.status = ModelStatus.iteration
+    if iteration_history not in ['compact', 'full']:
+        raise ValueError('Invalid iteration history: ' + iteration_history)
+
+    # bordered system of the last iteration, flag if its k belongs to the current state and
+    # the quasi-Newton inverse based on the bordered system
+    system = [None, False, None]
 
+    def calculate_residual(x):
         # update actual coordinates
-        for index, dof in enumerate(assembler.dofs):
-            model[dof].delta = x[index]
+        model.set_displacement_vector(x, assembler)
 
         # update lambda
         model.load_factor = x[-1]
 
         # initialize with zeros
-        k = np.zeros((dof_count, dof_count))
-        external_f = np.zeros(dof_count)
         internal_f = np.zeros(dof_count)
 
-        # assemble stiffness
-        assembler.assemble_matrix(k, lambda element: element.calculate_stiffness_matrix())
-
         # assemble force
+        external_f = model.get_external_force_vector(assembler)
 
-        for i, dof in enumerate(assembler.dofs):
-            external_f[i] += model[dof].external_force
-
-        assembler.assemble_vector(internal_f, lambda element: element.calculate_internal_forces())
+        assembler.assemble_vector(internal_f, ElementMethod('calculate_internal_forces'))
 
-        # assemble left and right hand side for newton raphson
-        lhs = np.zeros((dof_count + 1, dof_count + 1))
+        # assemble right hand side for newton raphson
         rhs = np.zeros(dof_count + 1)
 
-        # mechanical system
-        lhs[:dof_count, :dof_count] = k
-        lhs[:dof_count, -1] = -external_f
         rhs[:dof_count] = internal_f - model.load_factor * external_f
+        rhs[-1] = constraint.calculate_constraint(model)
+
+        return rhs
+
+    def calculate_trial_residual(x):
+        # the state of the current iterate is restored, so only iterates enter the history
+        u, load_factor = model.get_displacement_vector(assembler), model.load_factor
+        rhs = calculate_residual(x)
+        model.set_displacement_vector(u, assembler)
+        model.load_factor = load_factor
+        return rhs
+
+    def calculate_system(x):
+        # insert the current state before updating in the history. Only the values of the dofs
+        # are stored for intermediate states. The corresponding models are created on demand.
+        if iteration_history == 'compact' and model.status in [ModelStatus.duplicate, ModelStatus.prediction,
+                                                               ModelStatus.iteration]:
+            model._record_iteration(assembler)
+        else:
+            model._materialize_iteration_history()
+            duplicate = model._copy()
+            duplicate._previous_model = model._previous_model
+            model._previous_model = duplicate
+            duplicate.status = model.status
+
+        # update status flag
+        model.status = ModelStatus.iteration
+
+        rhs = calculate_residual(x)
+
+        external_f = model.get_external_force_vector(assembler)
 
         # assemble contribution from constraint
-        constraint.calculate_derivatives(model, lhs[-1, :])
-        rhs[-1] = constraint.calculate_constraint(model)
+        dc = np.zeros(dof_count + 1)
+        constraint.calculate_derivatives(model, dc)
+
+        # assemble stiffness or reuse the factorized stiffness of a previous iteration
+        previous_system, _, inverse = system
+        iteration = len(data)
+
+        is_new_k = is_refactor_required(previous_system, iteration, norm(rhs))
+
+        residual_norms.append(norm(rhs))
+
+        # inexact Newton: the tolerance of an iterative solver follows the residual
+        update_forcing_term()
+
+        if is_new_k and iteration_method == 'initial-stiffness':
+            k, factorization = initial_stiffness()
+        elif is_new_k:
+            k = assemble_k()
+            factorization = None
+        else:
+            k = previous_system.k
+            factorization = previous_system.factorization
+            apply_forcing_term(factorization)
+
+        # the quasi-Newton inverse keeps the system of its first iteration and is updated
+        # with the steps of the following iterations
+        if quasi_newton is not None and not is_new_k:
+            system[1] = False
+            return inverse, rhs
+
+        # mechanical system bordered by the constraint
+        lhs = BorderedSystem(k, -external_f, dc[:-1], dc[-1], factorize_k)
+        lhs.factorization = factorization
+
+        if quasi_newton is not None:
+            inverse = quasi_newton(lhs)
+
+        system[:] = [lhs, is_new_k and iteration_method != 'initial-stiffness', inverse]
+
+        if inverse is not None:
+            return inverse, rhs
 
         return lhs, rhs
 
@@ -171,32 +559,88 @@ def nonlinear_step(constraint, model, tolerance=1e-5, max_iterations=100, **opti
 
     # prediction as vector for newton raphson
     x = np.zeros(dof_count + 1)
-    for index, dof in enumerate(assembler.dofs):
-        x[index] = model[dof].delta
-
+    x[:-1] = model.get_displacement_vector(assembler)
     x[-1] = model.load_factor
 
     # solve newton raphson
-    residual_norm, iterations = newton_raphson_solve(calculate_system, x, max_iterations, tolerance, callback)
+    start = perf_counter()
+
+    residual_norm, iterations = newton_raphson_solve(calculate_system, x, max_iterations, tolerance, callback,
+                                                     globalization, calculate_trial_residual)
+
+    statistics['total_time'] = perf_counter() - start
+
+    if krylov_solvers:
+        statistics['krylov_iterations'] = sum(krylov_solver.iterations - initial_iterations
+                                              for krylov_solver, initial_iterations in krylov_solvers.values())
 
     callback(iterations, residual_norm, None)
 
     model.status = ModelStatus.equilibrium
 
+    # if the stiffness matrix of the last iteration belongs to the converged state, it is
+    # reused for det(K) and the next tangential prediction.
+    lhs, is_current, _ = system
+
+    if lhs is not None and isinstance(lhs.factorization, KrylovSolver) and forcing[1] is not None:
+        # the tangent vector and the following steps use the tolerance of the backend
+        lhs.factorization.tolerance = forcing[1]
+
+    if is_current:
+        model._set_stiffness(lhs.k, lhs.factorization, assembler, sparse, solver)
+
+    apply_history_retention(model, options.get('history'))
+
     if options.get('solve_det_k', True):
-        solve_det_k(model, assembler=assembler)
+        solve_det_k(model, assembler=assembler, sparse=sparse, solver=solver)
 
     if options.get('solve_attendant_eigenvalue', False):
-        model.solve_eigenvalues(assembler=assembler)
+        model.solve_eigenvalues(assembler=assembler, sparse=sparse, solver=solver,
+                                tracker=options.get('eigen_tracker'))
 
-    return NonlinearSolutionInfo(constraint, residual_norm, ['λ', '|r|', '|du|'], data)
+    return NonlinearSolutionInfo(constraint, residual_norm, ['λ', '|r|', '|du|'], data, statistics, residual_norms)
 
 
-def solve_det_k(model, k=None, assembler=None):
-    if k is None:
-        if assembler is None:
-            assembler = Assembler(model)
-        dof_count = assembler.dof_count
-        k = np.zeros((dof_count, dof_count))
-        assembler.assemble_matrix(k, lambda element: element.calculate_stiffness_matrix())
-    model.det_k = det(k)
+def solve_det_k(model, k=None, assembler=None, sparse=False, solver=None):
+    """Set `det_k`, `det_k_sign`, `log_det_k` and `negative_pivots` of the model.
+
+    The values are taken from the factorization of the converged iteration if it is cached
+    on the model. Otherwise k is assembled and factorized. The iterations use a factorization
+    with pivoting, which provides the determinant. If its pivots do not give the inertia, the
+    converged matrix is factorized once more with a symmetric factorization. The iterative
+    backends do not provide the determinant, so the values are set to `None`.
+    """
+    try:
+        if k is None:
+            factorization = model.get_stiffness_factorization(assembler, sparse, solver)
+        else:
+            factorization = factorize(k, solver, inertia=True)
+
+        log_determinant = factorization.log_determinant()
+
+        if log_determinant is None:
+            # not available e.g. for the Krylov backends
+            model.det_k = None
+            model.det_k_sign = None
+            model.log_det_k = None
+            model.negative_pivots = None
+            return
+
+        sign, log_abs = log_determinant
+        negative_pivots = factorization.negative_pivots()
+    except (RuntimeError, AttributeError):
+        # e.g. singular matrix or the backend does not provide a log determinant
+        if k is None:
+            k = model.get_stiffness_matrix(assembler, sparse, solver)
+        det_k = determinant(k, solver)
+        sign = np.sign(det_k)
+        with np.errstate(divide='ignore'):
+            log_abs = np.log(np.abs(det_k))
+        negative_pivots = None
+
+    with np.errstate(over='ignore'):
+        model.det_k = sign * np.exp(log_abs)
+
+    model.det_k_sign = sign
+    model.log_det_k = log_abs
+    model.negative_pivots = negative_pivots
@@ -5,6 +5,8 @@ Authors: Thomas Oberbichler
 
 import numpy as np
 
+from nfem.element_state import ElementProperty, ElementState
+
 
 class Spring:
     """
@@ -33,12 +35,25 @@ class Spring:
 
     """
 
-    def __init__(self, id, node, kx=0, ky=0, kz=0):
+    kx = ElementProperty()
+    ky = ElementProperty()
+    kz = ElementProperty()
+
+    def __init__(self, id, node, kx=0, ky=0, kz=0, state=None):
+        if state is None:
+            state = ElementState()
         self.id = id
         self.node = node
-        self.kx = kx
-        self.ky = ky
-        self.kz = kz
+        self._state = state
+        self._index = state.add(kx=kx, ky=ky, kz=kz)
+
+    def _with_state(self, nodes, state):
+        # view of the same spring with the given node and properties
+        spring = self.__class__.__new__(self.__class__)
+        spring.__dict__.update(self.__dict__)
+        spring.node = nodes[self.node.id]
+        spring._state = state
+        return spring
 
     @property
     def dofs(self):
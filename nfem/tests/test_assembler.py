@@ -0,0 +1,259 @@
+"""
+Tests for the Assembler
+"""
+
+import nfem
+import numpy as np
+import pytest
+from numpy.testing import assert_almost_equal
+
+from nfem.linear_solver import BandedCholesky, factorize
+from nfem.solve import assemble_matrix
+
+
+@pytest.fixture
+def model():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z')
+    model.add_node(id='C', x=2, y=2, z=0, support='z', fy=-1)
+    model.add_node(id='D', x=3, y=1, z=0, support='z')
+    model.add_node(id='E', x=4, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+    model.add_truss(id='3', node_a='C', node_b='D', youngs_modulus=1, area=1)
+    model.add_truss(id='4', node_a='D', node_b='E', youngs_modulus=1, area=1)
+    model.add_truss(id='5', node_a='B', node_b='D', youngs_modulus=1, area=1)
+
+    model.add_spring(id='6', node='C', kx=0.5, ky=0.1)
+
+    return model
+
+
+def test_assemble_sparse_matrix(model):
+    model.nodes['C'].v = -0.2
+
+    assembler = nfem.Assembler(model)
+
+    expected = np.zeros((assembler.dof_count, assembler.dof_count))
+    assembler.assemble_matrix(expected, lambda element: element.calculate_stiffness_matrix())
+
+    actual = assembler.assemble_sparse_matrix(lambda element: element.calculate_stiffness_matrix())
+
+    assert_almost_equal(actual.toarray(), expected)
+
+
+def test_assemble_sparse_matrix_skips_missing_element_matrices(model):
+    assembler = nfem.Assembler(model)
+
+    actual = assembler.assemble_sparse_matrix(lambda element: element.calculate_material_stiffness_matrix())
+
+    expected = np.zeros((assembler.dof_count, assembler.dof_count))
+    assembler.assemble_matrix(expected, lambda element: element.calculate_material_stiffness_matrix())
+
+    assert_almost_equal(actual.toarray(), expected)
+
+
+def test_sparse_nonlinear_step(model):
+    dense_model = model.get_duplicate()
+    dense_model.load_factor = 0.1
+    dense_model.perform_non_linear_solution_step(strategy='load-control')
+
+    sparse_model = model.get_duplicate()
+    sparse_model.load_factor = 0.1
+    sparse_model.perform_non_linear_solution_step(strategy='load-control', sparse=True)
+
+    assert_almost_equal(sparse_model.nodes['C'].v, dense_model.nodes['C'].v)
+    assert_almost_equal(sparse_model.det_k, dense_model.det_k)
+
+
+def test_sparse_linear_step(model):
+    dense_model = model.get_duplicate()
+    dense_model.load_factor = 0.1
+    dense_model.perform_linear_solution_step()
+
+    sparse_model = model.get_duplicate()
+    sparse_model.load_factor = 0.1
+    sparse_model.perform_linear_solution_step(sparse=True)
+
+    assert_almost_equal(sparse_model.nodes['C'].v, dense_model.nodes['C'].v)
+
+
+def test_element_groups(model):
+    assembler = nfem.Assembler(model)
+
+    assert len(assembler.element_groups) == 2
+
+    truss_group, spring_group = assembler.element_groups
+
+    assert len(truss_group) == 5
+    assert truss_group.batch is not None
+    assert truss_group.indices.shape == (5, 6)
+
+    assert len(spring_group) == 1
+    assert spring_group.batch is None
+    assert spring_group.indices.shape == (1, 3)
+
+
+def test_inactive_dofs_are_masked(model):
+    assembler = nfem.Assembler(model)
+
+    truss_group = assembler.element_groups[0]
+
+    # node A is fully supported
+    assert list(truss_group.indices[0, :3]) == [-1, -1, -1]
+    assert -1 not in truss_group.vector_rows
+    assert -1 not in truss_group.matrix_rows
+    assert -1 not in truss_group.matrix_cols
+
+
+def test_dof_numbering(model):
+    assembler = nfem.Assembler(model)
+
+    # dofs are numbered in the order of the elements, inactive dofs are skipped
+    expected = [('B', 'u'), ('B', 'v'), ('C', 'u'), ('C', 'v'), ('D', 'u'), ('D', 'v')]
+
+    assert assembler.dofs == expected
+    assert [assembler.index_of_dof(dof) for dof in expected] == list(range(6))
+
+
+def _girder(n):
+    """Truss girder with the nodes numbered along the bottom chord first"""
+    model = nfem.Model()
+
+    for i in range(n + 1):
+        model.add_node(id=f'B{i}', x=i, y=0, z=0, support='z')
+    for i in range(n + 1):
+        model.add_node(id=f'T{i}', x=i, y=1, z=0, support='z')
+
+    model.nodes['B0'].support = 'xyz'
+    model.nodes[f'B{n}'].support = 'yz'
+
+    for i in range(n):
+        model.add_truss(id=f'B{i}', node_a=f'B{i}', node_b=f'B{i + 1}', youngs_modulus=1, area=1)
+    for i in range(n):
+        model.add_truss(id=f'T{i}', node_a=f'T{i}', node_b=f'T{i + 1}', youngs_modulus=1, area=1)
+    for i in range(n + 1):
+        model.add_truss(id=f'V{i}', node_a=f'B{i}', node_b=f'T{i}', youngs_modulus=1, area=1)
+    for i in range(n):
+        model.add_truss(id=f'D{i}', node_a=f'B{i}', node_b=f'T{i + 1}', youngs_modulus=1, area=1)
+
+    for i in range(1, n):
+        model.nodes[f'T{i}'].fy = -1
+
+    return model
+
+
+@pytest.fixture
+def girder():
+    return _girder(10)
+
+
+@pytest.mark.parametrize('ordering', ['rcm', 'mmd'])
+def test_ordering_is_a_permutation(girder, ordering):
+    expected = nfem.Assembler(girder)
+    actual = nfem.Assembler(girder, ordering)
+
+    assert set(actual.dofs) == set(expected.dofs)
+    assert all(actual.index_of_dof(dof) == i for i, dof in enumerate(actual.dofs))
+
+    # the system matrix is permuted symmetrically
+    permutation = [expected.index_of_dof(dof) for dof in actual.dofs]
+
+    expected_k = expected.assemble_sparse_matrix(lambda element: element.calculate_stiffness_matrix()).toarray()
+    actual_k = actual.assemble_sparse_matrix(lambda element: element.calculate_stiffness_matrix()).toarray()
+
+    assert_almost_equal(actual_k, expected_k[np.ix_(permutation, permutation)])
+
+
+def test_rcm_reduces_bandwidth(girder):
+    assert nfem.Assembler(girder, 'rcm').bandwidth < nfem.Assembler(girder).bandwidth
+
+
+@pytest.mark.parametrize('ordering', [None, 'rcm'])
+def test_assemble_banded_matrix(girder, ordering):
+    assembler = nfem.Assembler(girder, ordering)
+
+    def calculate_element_matrix(element):
+        return element.calculate_stiffness_matrix()
+
+    k = assembler.assemble_sparse_matrix(calculate_element_matrix).toarray()
+    band = assembler.assemble_banded_matrix(calculate_element_matrix)
+
+    assert band.shape == (assembler.bandwidth + 1, assembler.dof_count)
+
+    for offset in range(assembler.bandwidth + 1):
+        assert_almost_equal(band[offset, :assembler.dof_count - offset], np.diagonal(k, -offset))
+
+    assert_almost_equal(BandedCholesky.from_lower_band(band).log_determinant(), np.linalg.slogdet(k))
+
+
+@pytest.mark.parametrize('ordering', [None, 'rcm'])
+def test_sparse_matrix_in_band_storage(ordering):
+    assembler = nfem.Assembler(_girder(60), ordering)
+
+    expected = assemble_matrix(assembler, nfem.ElementMethod('calculate_stiffness_matrix'))
+    actual = assemble_matrix(assembler, nfem.ElementMethod('calculate_stiffness_matrix'), sparse=True)
+
+    assert_almost_equal(actual.toarray(), expected)
+
+    # the numbering of the bottom chord first has a large bandwidth
+    if ordering is None:
+        assert actual.format == 'csr'
+    else:
+        assert actual.format == 'dia'
+        assert factorize(actual).name == 'banded'
+
+
+def test_invalid_ordering_raises(girder):
+    with pytest.raises(ValueError):
+        nfem.Assembler(girder, 'invalid')
+
+    with pytest.raises(ValueError):
+        girder.set_dof_ordering('invalid')
+
+
+@pytest.mark.parametrize('ordering', ['rcm', 'mmd'])
+@pytest.mark.parametrize('sparse', [False, True])
+def test_nonlinear_step_with_ordering(girder, ordering, sparse):
+    expected = girder.get_duplicate(branch=True)
+    expected.load_factor = 0.01
+    expected.perform_non_linear_solution_step(strategy='load-control', sparse=sparse)
+
+    model = girder.get_duplicate(branch=True)
+    model.set_dof_ordering(ordering)
+    model.load_factor = 0.01
+    model.perform_non_linear_solution_step(strategy='load-control', sparse=sparse, solve_attendant_eigenvalue=True)
+
+    assert model.get_assembler().ordering == ordering
+
+    for node in expected.nodes:
+        assert_almost_equal(model.nodes[node.id].location, node.location)
+
+    assert_almost_equal(model.det_k, expected.det_k)
+
+    # the ordering is kept for the next steps
+    model = model.get_duplicate()
+    model.predict_tangential(strategy='arc-length', value=0.01)
+
+    assert model.get_assembler().ordering == ordering
+
+
+def test_element_method_is_evaluated_by_the_batch(model):
+    model.nodes['C'].v = -0.2
+
+    assembler = nfem.Assembler(model)
+
+    evaluated_types = set()
+
+    def calculate_element_matrix(element):
+        evaluated_types.add(type(element))
+        return element.calculate_stiffness_matrix()
+
+    expected = assembler.assemble_sparse_matrix(calculate_element_matrix)
+    actual = assembler.assemble_sparse_matrix(nfem.ElementMethod('calculate_stiffness_matrix'))
+
+    assert evaluated_types == {nfem.Truss, nfem.Spring}
+    assert_almost_equal(actual.toarray(), expected.toarray())
@@ -58,3 +58,17 @@ def test_bracketing_bifurcation_point(model_2):
     actual = critical_model.load_factor
     expected = 0.16733018783531955
     assert_almost_equal(actual, expected)
+
+
+def test_bracketing_with_eigen_tracker(model_1):
+    model = model_1.get_duplicate()
+
+    model.predict_tangential(strategy="lambda", value=0.05)
+    model.perform_non_linear_solution_step(strategy="load-control")
+
+    tracker = nfem.EigenTracker()
+
+    critical_model = nfem.bracketing(model, eigen_tracker=tracker)
+
+    assert_almost_equal(critical_model.load_factor, 0.13607744543608463)
+    assert_almost_equal(tracker.eigvals[0], critical_model.first_eigenvalue)
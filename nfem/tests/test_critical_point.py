@@ -0,0 +1,106 @@
+'''
+Tests for the direct critical point solver
+'''
+
+import pytest
+import nfem
+from numpy.testing import assert_almost_equal
+
+
+@pytest.fixture
+def model_1():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    return model
+
+
+@pytest.fixture
+def model_2():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=3, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    return model
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_critical_point_limit_point(model_1, sparse):
+    model = model_1.get_duplicate()
+
+    model.predict_tangential(strategy="lambda", value=0.1)
+    model.perform_non_linear_solution_step(strategy="load-control")
+
+    critical_model = nfem.solve_critical_point(model, sparse=sparse)
+
+    assert_almost_equal(critical_model.load_factor, 0.13607744543608463, decimal=5)
+    assert_almost_equal(critical_model.det_k, 0.0)
+
+    # the limit point mode is symmetric
+    eigenvector = critical_model.critical_mode_model.get_displacement_vector()
+    assert_almost_equal(eigenvector, [0.0, 1.0])
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_critical_point_bifurcation_point(model_2, sparse):
+    model = model_2.get_duplicate()
+
+    model.predict_tangential(strategy="lambda", value=0.1)
+    model.perform_non_linear_solution_step(strategy="load-control", solve_attendant_eigenvalue=True)
+
+    critical_model = nfem.solve_critical_point(model, sparse=sparse)
+
+    assert_almost_equal(critical_model.load_factor, 0.16733018783531955, decimal=5)
+    assert_almost_equal(critical_model.det_k, 0.0)
+
+    # the bifurcation mode is antisymmetric
+    eigenvector = critical_model.critical_mode_model.get_displacement_vector()
+    assert_almost_equal(eigenvector, [1.0, 0.0])
+
+
+def test_critical_mode_with_attendant_eigenvalue(model_1):
+    model = model_1.get_duplicate()
+
+    model.predict_tangential(strategy="lambda", value=0.1)
+    model.perform_non_linear_solution_step(strategy="load-control")
+
+    critical_model = nfem.solve_critical_point(model, solve_attendant_eigenvalue=True)
+
+    # the eigenvalue analysis does not replace the critical mode
+    assert critical_model.first_eigenvector_model is not critical_model.critical_mode_model
+    assert_almost_equal(critical_model.critical_mode_model.get_displacement_vector(), [0.0, 1.0])
+
+
+def test_critical_point_after_bracketing(model_1):
+    model = model_1.get_duplicate()
+
+    model.predict_tangential(strategy="lambda", value=0.05)
+    model.perform_non_linear_solution_step(strategy="load-control")
+
+    bracketed_model = nfem.bracketing(model, tol=1e-2)
+
+    critical_model = nfem.solve_critical_point(bracketed_model)
+
+    assert critical_model.get_previous_model() is bracketed_model
+    assert_almost_equal(critical_model.load_factor, 0.13607744543608463, decimal=5)
+
+
+def test_critical_point_does_not_converge(model_1):
+    model = model_1.get_duplicate()
+
+    model.predict_tangential(strategy="lambda", value=0.1)
+    model.perform_non_linear_solution_step(strategy="load-control")
+
+    with pytest.raises(RuntimeError):
+        nfem.solve_critical_point(model, max_iterations=1)
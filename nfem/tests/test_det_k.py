@@ -3,6 +3,7 @@ Tests for det(K)
 '''
 
 import pytest
+import numpy as np
 import nfem
 from numpy.testing import assert_almost_equal
 
@@ -35,3 +36,70 @@ def test_det_k_after_solution(model):
     actual_value = model.det_k
     expected_value = 0.19510608810631772
     assert_almost_equal(actual_value, expected_value)
+
+
+def test_log_det_k_and_negative_pivots(model):
+    model.solve_det_k()
+
+    assert_almost_equal(model.det_k_sign, 1)
+    assert_almost_equal(model.log_det_k, np.log(0.5))
+    assert model.negative_pivots == 0
+
+
+def test_negative_pivots_after_limit_point(model):
+    model = model.get_duplicate()
+    model.predict_tangential(strategy='lambda', value=0.05)
+    model.perform_non_linear_solution_step(strategy='load-control')
+
+    for step in range(10):
+        model = model.get_duplicate()
+        model.predict_tangential(strategy='arc-length')
+        model.perform_non_linear_solution_step(strategy='arc-length-control')
+
+    # the states beyond the limit point have one negative eigenvalue
+    assert model.det_k_sign == -1
+    assert model.negative_pivots == 1
+    assert_almost_equal(model.det_k, -np.exp(model.log_det_k))
+
+
+def test_newton_iterations_use_pivoting(model, monkeypatch):
+    symmetric_flags = []
+
+    class SparseLU(nfem.linear_solver.SparseLU):
+        def __init__(self, matrix, permc_spec='COLAMD', symmetric=False):
+            symmetric_flags.append(symmetric)
+            super().__init__(matrix, permc_spec, symmetric)
+
+    monkeypatch.setattr(nfem.linear_solver, 'SparseLU', SparseLU)
+    monkeypatch.setitem(nfem.linear_solver.SOLVERS, 'splu', SparseLU)
+
+    model = model.get_duplicate()
+    model.predict_tangential(strategy='lambda', value=0.05, sparse=True)
+
+    symmetric_flags.clear()
+    model.perform_non_linear_solution_step(strategy='load-control', sparse=True)
+
+    # the iterations pivot, only the inertia of the converged matrix is symmetric
+    assert symmetric_flags[-1]
+    assert len(symmetric_flags) > 1 and not any(symmetric_flags[:-1])
+
+    for step in range(10):
+        model = model.get_duplicate()
+        model.predict_tangential(strategy='arc-length', sparse=True)
+        model.perform_non_linear_solution_step(strategy='arc-length-control', sparse=True)
+
+    # the inertia is computed from the converged matrix
+    assert model.det_k_sign == -1
+    assert model.negative_pivots == 1
+
+
+def test_det_k_after_editing_a_held_element(model):
+    element = model.elements['1']
+
+    model.solve_det_k()
+
+    element.youngs_modulus = 2
+
+    model.solve_det_k()
+
+    assert_almost_equal(model.det_k, 1.0)
@@ -0,0 +1,124 @@
+"""
+Tests for the DofState
+"""
+
+import nfem
+import numpy as np
+import pytest
+from numpy.testing import assert_equal, assert_almost_equal
+
+from nfem.dof_state import DofState
+
+
+@pytest.fixture
+def model():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=2, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    return model
+
+
+def test_add_grows_state():
+    state = DofState()
+
+    for i in range(20):
+        assert state.add(float(i), is_active=i % 2 == 0) == i
+
+    assert len(state) == 20
+    assert_equal(state.ref_value, np.arange(20))
+    assert_equal(state.value, np.arange(20))
+    assert_equal(state.is_active, np.arange(20) % 2 == 0)
+
+
+def test_topology_version():
+    state = DofState()
+
+    index = state.add(1.0)
+    version = state.topology_version
+
+    state.set_is_active(index, False)
+
+    assert state.topology_version > version
+
+
+def test_delta():
+    state = DofState()
+
+    for value in [1.0, 2.0, 3.0]:
+        state.add(value)
+
+    state.set_delta([0, 2], [0.5, -0.5])
+
+    assert_equal(state.value, [1.5, 2.0, 2.5])
+    assert_equal(state.delta, [0.5, 0.0, -0.5])
+    assert_equal(state.get_delta([2, 0]), [-0.5, 0.5])
+
+
+def test_nodes_are_views(model):
+    state = model._dof_state
+
+    assert len(state) == 9
+
+    model.nodes['B'].u = 0.25
+
+    assert_equal(state.value[3:6], [1.25, 2, 0])
+    assert_equal(state.external_force[3:6], [0, -1, 0])
+
+    state._value[4] = 3
+
+    assert model.nodes['B'].y == 3
+    assert_equal(model.nodes['B'].displacement, [0.25, 1, 0])
+
+
+def test_displacement_vector(model):
+    assembler = model.get_assembler()
+
+    model.set_displacement_vector(np.array([0.1, 0.2]), assembler)
+
+    assert_almost_equal(model.nodes['B'].displacement, [0.1, 0.2, 0])
+    assert_almost_equal(model.get_displacement_vector(assembler), [0.1, 0.2])
+    assert_equal(model.get_external_force_vector(assembler), [0, -1])
+
+
+def test_duplicate_has_own_state(model):
+    duplicate = model.get_duplicate()
+
+    duplicate.nodes['B'].u = 1
+
+    assert model.nodes['B'].u == 0
+    assert duplicate._dof_state is not model._dof_state
+
+
+def test_copy_on_write():
+    state = DofState()
+
+    for value in [1.0, 2.0]:
+        state.add(value)
+
+    copy = state.copy()
+
+    assert copy._ref_value is state._ref_value
+
+    copy.set_delta([0], [0.5])
+    copy.set_external_force(1, 3.0)
+    copy.set_is_active(0, False)
+
+    assert_equal(state.value, [1.0, 2.0])
+    assert_equal(state.external_force, [0.0, 0.0])
+    assert_equal(state.is_active, [True, True])
+
+    assert_equal(copy.value, [1.5, 2.0])
+    assert_equal(copy.external_force, [0.0, 3.0])
+    assert_equal(copy.is_active, [False, True])
+
+    state.set_ref_value(1, 5.0)
+    state.add(6.0)
+
+    assert_equal(copy.ref_value, [1.0, 2.0])
+    assert len(copy) == 2
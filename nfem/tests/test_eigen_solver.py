@@ -0,0 +1,175 @@
+"""
+Tests for the eigenvalue solvers
+"""
+
+import numpy as np
+import pytest
+from numpy.testing import assert_almost_equal
+from scipy.sparse import csr_matrix
+
+import nfem
+from nfem.eigen_solver import _solve_general, _solve_symmetric, solve_buckling_eigenvalues
+
+
+@pytest.fixture
+def model():
+    """Simply supported truss girder with a load at the top chord"""
+    model = nfem.Model()
+
+    n = 12
+
+    for i in range(n + 1):
+        model.add_node(id=f'B{i}', x=i, y=0, z=0, support='z')
+        model.add_node(id=f'T{i}', x=i, y=1, z=0, support='z')
+
+    model.nodes['B0'].support = 'xyz'
+    model.nodes[f'B{n}'].support = 'yz'
+
+    for i in range(n + 1):
+        model.add_truss(id=f'V{i}', node_a=f'B{i}', node_b=f'T{i}', youngs_modulus=1, area=1)
+
+    for i in range(n):
+        model.add_truss(id=f'B{i}', node_a=f'B{i}', node_b=f'B{i + 1}', youngs_modulus=1, area=1)
+        model.add_truss(id=f'T{i}', node_a=f'T{i}', node_b=f'T{i + 1}', youngs_modulus=1, area=1)
+        model.add_truss(id=f'D{i}', node_a=f'B{i}', node_b=f'T{i + 1}', youngs_modulus=1, area=1)
+
+    for i in range(1, n):
+        model.nodes[f'T{i}'].fy = -1
+
+    return model
+
+
+@pytest.fixture
+def matrices():
+    rng = np.random.default_rng(0)
+    a = rng.standard_normal((20, 20))
+    k = a @ a.T + 20 * np.eye(20)
+    b = rng.standard_normal((20, 20))
+    k_g = -(b + b.T)
+    return k, k_g
+
+
+@pytest.mark.parametrize('shift', [None, 1.0])
+def test_sparse_matches_dense(matrices, shift):
+    k, k_g = matrices
+
+    expected_eigvals, expected_eigvecs = solve_buckling_eigenvalues(k, k_g, shift, count=3)
+    actual_eigvals, actual_eigvecs = solve_buckling_eigenvalues(csr_matrix(k), csr_matrix(k_g), shift, count=3)
+
+    assert_almost_equal(actual_eigvals, expected_eigvals)
+    assert_almost_equal(actual_eigvecs, expected_eigvecs)
+
+
+@pytest.mark.parametrize('shift', [None, 1.0])
+def test_symmetric_matches_general(matrices, shift):
+    k, k_g = matrices
+
+    expected_eigvals, expected_eigvecs = _solve_general(k, k_g, shift, 3)
+    actual_eigvals, actual_eigvecs = _solve_symmetric(k, k_g, shift, 3)
+
+    assert_almost_equal(actual_eigvals, expected_eigvals)
+    assert_almost_equal(actual_eigvecs, expected_eigvecs)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_eigenvalue_between_zero_and_shift(sparse):
+    # 0.2 is closer to the shift than 3.0. The buckling mode of ARPACK ranks the eigenvalues
+    # by |eigval / (eigval - shift)| and returns 3.0 instead
+    k = np.diag([0.2, 1.5, 3.0, 5.0, 8.0, 10.0, 12.0, 15.0])
+    k_g = -np.eye(8)
+
+    convert = csr_matrix if sparse else np.asarray
+
+    eigvals, eigvecs = solve_buckling_eigenvalues(convert(k), convert(k_g), shift=1.0, count=2)
+
+    assert_almost_equal(eigvals, [1.5, 0.2])
+    assert_almost_equal(np.abs(eigvecs), np.eye(8)[:, [1, 0]])
+
+
+def test_indefinite_k_falls_back_to_general_solver():
+    k = np.diag([2.0, -1.0, 4.0])
+    k_g = -np.eye(3)
+
+    eigvals, eigvecs = solve_buckling_eigenvalues(k, k_g, shift=1.0, count=3)
+
+    assert_almost_equal(eigvals, [2.0, -1.0, 4.0])
+    assert_almost_equal(eigvecs, np.eye(3))
+
+
+def test_smallest_positive_eigenvalues(matrices):
+    k, k_g = matrices
+
+    eigvals, eigvecs = solve_buckling_eigenvalues(k, k_g, count=2)
+
+    assert np.all(eigvals > 0) and eigvals[0] < eigvals[1]
+    assert_almost_equal((k + eigvals[0] * k_g) @ eigvecs[:, 0], 0)
+    assert_almost_equal(np.linalg.norm(eigvecs, axis=0), 1)
+
+
+def test_sparse_linear_eigenvalues(model):
+    model.load_factor = 0.01
+    model.perform_linear_solution_step()
+
+    expected = model.get_duplicate(branch=True)
+    expected.solve_linear_eigenvalues()
+
+    model.solve_linear_eigenvalues(sparse=True)
+
+    assert_almost_equal(model.first_eigenvalue, expected.first_eigenvalue)
+    assert_almost_equal(model.first_eigenvector_model.get_displacement_vector(),
+                        expected.first_eigenvector_model.get_displacement_vector())
+
+
+def test_sparse_attendant_eigenvalues(model):
+    model.load_factor = 0.01
+    model.perform_load_control_step()
+
+    expected = model.get_duplicate(branch=True)
+    expected.solve_eigenvalues()
+
+    model.solve_eigenvalues(sparse=True)
+
+    assert_almost_equal(model.first_eigenvalue, expected.first_eigenvalue)
+    assert_almost_equal(model.first_eigenvector_model.get_displacement_vector(),
+                        expected.first_eigenvector_model.get_displacement_vector())
+
+
+def _attendant_eigenvalues(model, load_factors, tracker=None, sparse=False):
+    eigenvalues = []
+
+    for load_factor in load_factors:
+        model = model.get_duplicate()
+        model.load_factor = load_factor
+        model.perform_load_control_step(sparse=sparse, solve_attendant_eigenvalue=True, eigen_tracker=tracker)
+        eigenvalues.append(model.first_eigenvalue)
+
+    return eigenvalues, model
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_eigen_tracker(model, sparse):
+    load_factors = [0.02, 0.025, 0.03]
+
+    expected, expected_model = _attendant_eigenvalues(model, load_factors)
+
+    tracker = nfem.EigenTracker()
+    actual, actual_model = _attendant_eigenvalues(model, load_factors, tracker, sparse)
+
+    assert_almost_equal(actual, expected)
+    assert_almost_equal(actual_model.first_eigenvector_model.get_displacement_vector(),
+                        expected_model.first_eigenvector_model.get_displacement_vector())
+
+    assert_almost_equal(tracker.eigvals, expected[-1:])
+
+
+def test_eigen_tracker_with_springs(model):
+    # the tangent stiffness contains the springs but the material stiffness does not
+    model.add_spring(id='S', node='T6', ky=0.01)
+
+    # the Newton iteration from 0.02 to 0.03 needs almost 100 iterations for this model
+    load_factors = [0.01, 0.02]
+
+    expected, _ = _attendant_eigenvalues(model, load_factors)
+    actual, _ = _attendant_eigenvalues(model, load_factors, nfem.EigenTracker())
+
+    assert_almost_equal(actual, expected)
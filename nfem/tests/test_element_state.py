@@ -0,0 +1,102 @@
+"""
+Tests for the ElementState
+"""
+
+import nfem
+import numpy as np
+import pytest
+from numpy.testing import assert_equal
+
+from nfem.element_state import ElementState
+
+
+@pytest.fixture
+def model():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=2, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=2, area=3, tensile_strength=4)
+    model.add_spring(id='3', node='B', ky=5)
+
+    return model
+
+
+def test_add_grows_state():
+    state = ElementState()
+
+    for i in range(20):
+        assert state.add(a=float(i), b=None if i % 2 else 1.0) == i
+
+    assert len(state) == 20
+    assert_equal(state.get_values('a', np.arange(20)), np.arange(20))
+    assert state.get(3, 'b') is None
+    assert state.get(4, 'b') == 1.0
+
+
+def test_elements_are_views(model):
+    state = model._element_state
+
+    assert len(state) == 3
+
+    model.elements['2'].area = 6
+
+    assert_equal(state.get_values('area', [0, 1]), [1, 6])
+    assert_equal(state.get_values('ky', [2]), [5])
+    assert model.elements['1'].tensile_strength is None
+    assert model.elements['2'].tensile_strength == 4
+
+
+def test_revision():
+    state = ElementState()
+
+    index = state.add(a=1.0)
+    revision = state.revision
+
+    copy = state.copy()
+
+    assert copy.revision == revision
+
+    state.set(index, 'a', 2.0)
+
+    assert state.revision != revision
+    assert copy.revision == revision
+
+    copy.set(index, 'a', 2.0)
+
+    assert copy.revision != state.revision
+
+
+def test_copy_on_write():
+    state = ElementState()
+
+    for value in [1.0, 2.0]:
+        state.add(a=value)
+
+    copy = state.copy()
+
+    copy.set(0, 'a', 3.0)
+
+    assert_equal(state.get_values('a', [0, 1]), [1.0, 2.0])
+    assert_equal(copy.get_values('a', [0, 1]), [3.0, 2.0])
+
+    state.add(a=4.0)
+
+    assert len(copy) == 2
+    assert len(state) == 3
+
+
+def test_element_properties(model):
+    truss = model.elements['2']
+
+    truss.area = 2
+    truss.tensile_strength = None
+
+    assert truss.area == 2.0 and isinstance(truss.area, float)
+    assert truss.tensile_strength is None
+
+    with pytest.raises(TypeError):
+        truss.youngs_modulus = None
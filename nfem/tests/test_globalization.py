@@ -0,0 +1,90 @@
+'''
+Tests for the globalization strategies of the Newton-Raphson algorithm
+'''
+
+import pytest
+import numpy as np
+import nfem
+from nfem.globalization import DoglegTrustRegion
+from numpy.testing import assert_almost_equal
+
+
+@pytest.fixture
+def cable():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=0, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1, prestress=0.001)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1, prestress=0.001)
+
+    return model
+
+
+@pytest.fixture
+def shallow_truss():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    return model
+
+
+def _load_step(model, load_factor, **options):
+    model = model.get_duplicate()
+    model.load_factor = load_factor
+    info = model.perform_non_linear_solution_step(strategy='load-control', tolerance=1e-8, **options)
+    return model, info
+
+
+@pytest.mark.parametrize('globalization', ['backtracking', 'exact', 'dogleg'])
+def test_slack_cable(cable, globalization):
+    expected, expected_info = _load_step(cable, 0.5)
+
+    model, info = _load_step(cable, 0.5, globalization=globalization)
+
+    assert_almost_equal(model.nodes['B'].v, expected.nodes['B'].v)
+    assert info.iterations < expected_info.iterations / 2
+
+
+def test_snap_through_with_exact_line_search(shallow_truss):
+    expected, expected_info = _load_step(shallow_truss, 0.3)
+
+    model, info = _load_step(shallow_truss, 0.3, globalization='exact')
+
+    assert_almost_equal(model.nodes['B'].v, expected.nodes['B'].v)
+    assert info.iterations < expected_info.iterations / 2
+
+
+def test_iteration_history_contains_iterates_only(cable):
+    model, info = _load_step(cable, 0.5, globalization='backtracking')
+
+    history = model.get_model_history(skip_iterations=False)
+
+    # initial model, duplicate, iterations and the converged model
+    assert len(history) == info.iterations + 2
+
+    # the rejected trial points of the line search (e.g. the full Newton step to v = -250)
+    # are not part of the history
+    assert all(-1 < m.nodes['B'].v <= 0 for m in history)
+
+
+def test_dogleg_raises_without_acceptable_step():
+    dogleg = DoglegTrustRegion(max_steps=3)
+
+    # the residual increases for every trial step
+    def calculate_residual(x):
+        return np.array([2.0 + np.abs(x).sum()])
+
+    with pytest.raises(RuntimeError):
+        dogleg.step(calculate_residual, np.zeros(1), np.ones(1), np.eye(1), np.ones(1))
+
+    # the radius has been reduced for each rejected step
+    assert_almost_equal(dogleg.radius, 0.25**3)
@@ -0,0 +1,314 @@
+"""
+Tests for the linear solver backends
+"""
+
+import numpy as np
+import pytest
+from numpy.testing import assert_almost_equal
+from scipy.sparse import csr_matrix, dia_matrix
+
+import nfem
+from nfem.linear_solver import (BandedCholesky, KrylovSolver, SparseLU, factorize, from_lower_band, measure_bandwidth,
+                                to_lower_band)
+
+
+@pytest.fixture
+def matrix():
+    return np.array([[4.0, -1.0, 0.0],
+                     [-1.0, 4.0, -1.0],
+                     [0.0, -1.0, 3.0]])
+
+
+@pytest.mark.parametrize('solver', ['lu', 'cholesky', 'ldl', 'splu', 'banded'])
+def test_solve(matrix, solver):
+    factorization = factorize(matrix, solver)
+
+    rhs = np.array([[1.0, 0.0], [2.0, 1.0], [3.0, 0.0]])
+
+    assert_almost_equal(factorization.solve(rhs), np.linalg.solve(matrix, rhs))
+    assert_almost_equal(factorization.solve(rhs[:, 0]), np.linalg.solve(matrix, rhs[:, 0]))
+
+
+@pytest.mark.parametrize('solver', ['lu', 'cholesky', 'ldl', 'splu', 'banded'])
+def test_determinant(matrix, solver):
+    assert_almost_equal(factorize(matrix, solver).determinant(), np.linalg.det(matrix))
+    assert_almost_equal(factorize(csr_matrix(matrix), solver).determinant(), np.linalg.det(matrix))
+
+
+@pytest.mark.parametrize('solver', ['lu', 'splu'])
+def test_determinant_of_indefinite_matrix(solver):
+    matrix = np.array([[0.0, 2.0, 0.0],
+                       [1.0, 0.0, 0.0],
+                       [0.0, 0.0, -3.0]])
+
+    assert_almost_equal(factorize(matrix, solver).determinant(), np.linalg.det(matrix))
+
+
+@pytest.fixture
+def symmetric_indefinite_matrix():
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((30, 30)) * (rng.random((30, 30)) < 0.2) + np.diag(rng.standard_normal(30))
+    return matrix + matrix.T
+
+
+@pytest.mark.parametrize('solver', ['lu', 'ldl', 'splu', 'banded'])
+def test_log_determinant(symmetric_indefinite_matrix, solver):
+    sign, log_abs = factorize(csr_matrix(symmetric_indefinite_matrix), solver).log_determinant()
+
+    expected_sign, expected_log_abs = np.linalg.slogdet(symmetric_indefinite_matrix)
+
+    assert sign == expected_sign
+    assert_almost_equal(log_abs, expected_log_abs)
+
+
+@pytest.mark.parametrize('solver', ['lu', 'ldl', 'splu', 'banded', lambda k: SparseLU(k, symmetric=True)])
+def test_negative_pivots(symmetric_indefinite_matrix, solver):
+    expected = np.count_nonzero(np.linalg.eigvalsh(symmetric_indefinite_matrix) < 0)
+
+    assert factorize(symmetric_indefinite_matrix, solver).negative_pivots() == expected
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_inertia_is_read_from_a_single_symmetric_factorization(symmetric_indefinite_matrix, sparse, monkeypatch):
+    convert = csr_matrix if sparse else np.asarray
+
+    factorization = factorize(convert(symmetric_indefinite_matrix), inertia=True)
+
+    assert factorization.name == ('splu' if sparse else 'ldl')
+
+    # no second factorization is created for the inertia
+    monkeypatch.setattr(SparseLU, '__init__', None)
+
+    expected = np.count_nonzero(np.linalg.eigvalsh(symmetric_indefinite_matrix) < 0)
+
+    assert factorization.negative_pivots() == expected
+
+    rhs = np.arange(30.0)
+
+    assert_almost_equal(factorization.solve(rhs), np.linalg.solve(symmetric_indefinite_matrix, rhs))
+
+
+def test_inertia_of_indefinite_band_matrix():
+    matrix = _band_matrix(300, 4)
+    matrix[np.diag_indices(300)] -= 9.5
+
+    factorization = factorize(matrix, inertia=True)
+
+    assert factorization.negative_pivots() == np.count_nonzero(np.linalg.eigvalsh(matrix) < 0)
+    assert_almost_equal(factorization.solve(np.arange(300.0)), np.linalg.solve(matrix, np.arange(300.0)))
+
+
+def test_inertia_of_unsymmetric_matrix_uses_lu():
+    matrix = np.array([[4.0, -1.0],
+                       [0.0, 3.0]])
+
+    assert factorize(matrix, inertia=True).name == 'lu'
+
+
+def test_negative_pivots_of_positive_definite_matrix(matrix):
+    assert factorize(matrix, 'cholesky').negative_pivots() == 0
+
+
+def test_log_determinant_does_not_overflow():
+    matrix = np.diag(np.full(400, 1e3))
+    matrix[0, 0] = -1e3
+
+    sign, log_abs = factorize(csr_matrix(matrix)).log_determinant()
+
+    assert sign == -1
+    assert_almost_equal(log_abs, 400 * np.log(1e3))
+
+
+def test_default_solver(matrix):
+    assert factorize(matrix).name == 'lu'
+    assert factorize(csr_matrix(matrix)).name == 'splu'
+
+
+def _band_matrix(n, bandwidth, symmetric=True):
+    rng = np.random.default_rng(0)
+    matrix = np.diag(np.full(n, 2.0 * bandwidth + 1.0))
+    for offset in range(1, bandwidth + 1):
+        values = rng.random(n - offset)
+        matrix += np.diag(values, -offset)
+        matrix += np.diag(values if symmetric else rng.random(n - offset), offset)
+    return matrix
+
+
+def test_measure_bandwidth():
+    matrix = _band_matrix(50, 3)
+
+    assert measure_bandwidth(matrix) == 3
+    assert measure_bandwidth(csr_matrix(matrix)) == 3
+    assert measure_bandwidth(np.zeros((3, 3))) == 0
+
+
+def test_banded_solver_is_selected_for_band_storage():
+    assert factorize(dia_matrix(_band_matrix(400, 5))).name == 'banded'
+    assert factorize(dia_matrix(_band_matrix(400, 5, symmetric=False))).name != 'banded'
+    assert factorize(from_lower_band(to_lower_band(_band_matrix(400, 50), 50))).name != 'banded'
+    assert factorize(dia_matrix(_band_matrix(100, 5))).name != 'banded'
+
+    # dense and CSR matrices are not searched for a band
+    assert factorize(_band_matrix(400, 5)).name == 'lu'
+    assert factorize(csr_matrix(_band_matrix(400, 5))).name == 'splu'
+
+    matrix = _band_matrix(400, 5)
+    rhs = np.arange(400.0)
+
+    assert_almost_equal(factorize(dia_matrix(matrix)).solve(rhs), np.linalg.solve(matrix, rhs))
+
+
+def test_band_storage():
+    matrix = _band_matrix(20, 3)
+    band = to_lower_band(matrix, 3)
+
+    actual = from_lower_band(band)
+
+    assert actual.format == 'dia'
+    assert measure_bandwidth(actual) == 3
+    assert_almost_equal(actual.toarray(), matrix)
+    assert_almost_equal(to_lower_band(actual, 3), band)
+
+
+def test_banded_solver_of_indefinite_matrix():
+    matrix = _band_matrix(300, 4)
+    matrix[np.diag_indices(300)] -= 9.5
+
+    factorization = factorize(matrix, 'banded')
+
+    sign, log_abs = factorization.log_determinant()
+    expected_sign, expected_log_abs = np.linalg.slogdet(matrix)
+
+    assert sign == expected_sign
+    assert_almost_equal(log_abs, expected_log_abs)
+    assert factorization.negative_pivots() == np.count_nonzero(np.linalg.eigvalsh(matrix) < 0)
+
+    rhs = np.arange(300.0)
+
+    assert_almost_equal(factorization.solve(rhs), np.linalg.solve(matrix, rhs))
+
+
+def test_banded_solver_from_lower_band():
+    matrix = _band_matrix(20, 2)
+    band = np.array([np.pad(np.diagonal(matrix, -offset), (0, offset)) for offset in range(3)])
+
+    factorization = BandedCholesky.from_lower_band(band)
+
+    assert factorization.bandwidth == 2
+    assert_almost_equal(factorization.log_determinant(), np.linalg.slogdet(matrix))
+
+
+@pytest.mark.parametrize('solver', ['lu', 'splu', 'banded'])
+def test_singular_matrix_raises(solver):
+    with pytest.raises(RuntimeError):
+        factorize(np.array([[1.0, 1.0], [1.0, 1.0]]), solver)
+
+
+def test_cholesky_of_indefinite_matrix_raises():
+    with pytest.raises(RuntimeError):
+        factorize(np.array([[1.0, 0.0], [0.0, -1.0]]), 'cholesky')
+
+
+def test_invalid_solver_raises(matrix):
+    with pytest.raises(ValueError):
+        factorize(matrix, 'invalid')
+
+
+@pytest.mark.parametrize('solver', ['cg', 'minres', 'gmres', 'cg-ilu', 'minres-none', 'gmres-ilu'])
+def test_krylov_solve(matrix, solver):
+    factorization = factorize(matrix, solver)
+
+    rhs = np.array([[1.0, 0.0], [2.0, 1.0], [3.0, 0.0]])
+
+    assert_almost_equal(factorization.solve(rhs), np.linalg.solve(matrix, rhs))
+    assert_almost_equal(factorization.solve(rhs[:, 0]), np.linalg.solve(matrix, rhs[:, 0]))
+    assert_almost_equal(factorization.solve(np.zeros(3)), np.zeros(3))
+
+
+@pytest.mark.parametrize('preconditioner', ['jacobi', 'ilu', None])
+@pytest.mark.parametrize('method', ['cg', 'minres', 'gmres'])
+def test_krylov_tolerance(method, preconditioner):
+    n = 500
+    matrix = csr_matrix(np.diag(np.full(n, 2.01)) - np.diag(np.ones(n - 1), 1) - np.diag(np.ones(n - 1), -1))
+    rhs = np.ones(n)
+
+    for tolerance in [1e-2, 1e-6, 1e-10]:
+        factorization = KrylovSolver(matrix, method, preconditioner, tolerance=tolerance)
+
+        x = factorization.solve(rhs)
+
+        assert np.linalg.norm(matrix @ x - rhs) <= tolerance * np.linalg.norm(rhs)
+
+
+def test_krylov_amg_preconditioner():
+    pytest.importorskip('pyamg')
+
+    n = 500
+    matrix = csr_matrix(np.diag(np.full(n, 2.01)) - np.diag(np.ones(n - 1), 1) - np.diag(np.ones(n - 1), -1))
+    rhs = np.ones(n)
+
+    factorization = factorize(matrix, 'cg-amg')
+
+    assert_almost_equal(matrix @ factorization.solve(rhs), rhs)
+
+
+def test_krylov_determinant_is_not_available(symmetric_indefinite_matrix):
+    factorization = factorize(symmetric_indefinite_matrix, 'minres')
+
+    assert factorization.determinant() is None
+    assert factorization.log_determinant() is None
+    assert factorization.negative_pivots() is None
+
+
+@pytest.mark.parametrize('solver', ['bicg-jacobi', 'cg-invalid'])
+def test_invalid_krylov_solver_raises(matrix, solver):
+    with pytest.raises(ValueError):
+        factorize(matrix, solver)
+
+
+@pytest.fixture
+def model():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    return model
+
+
+@pytest.mark.parametrize('solver', ['lu', 'cholesky', 'splu', 'banded', 'cg', 'minres', 'gmres-ilu'])
+def test_nonlinear_step_with_solver(model, solver):
+    expected = model.get_duplicate(branch=True)
+
+    model.load_factor = 0.1
+    model.perform_load_control_step(solver=solver)
+
+    expected.load_factor = 0.1
+    expected.perform_load_control_step()
+
+    assert_almost_equal(model.nodes['B'].v, expected.nodes['B'].v)
+
+    if isinstance(model.get_stiffness_factorization(solver=solver), KrylovSolver):
+        # the iterative backends do not factorize the matrix
+        assert model.det_k is None and model.negative_pivots is None
+    else:
+        assert_almost_equal(model.det_k, expected.det_k)
+
+
+def test_factorization_is_reused_for_the_next_prediction(model):
+    model.load_factor = 0.1
+    model.perform_load_control_step()
+
+    factorization = model.get_stiffness_factorization()
+
+    model = model.get_duplicate()
+
+    assert model.get_stiffness_factorization() is factorization
+
+    model.predict_tangential(strategy='delta-lambda', value=0.1)
+
+    assert model.get_stiffness_factorization() is not factorization
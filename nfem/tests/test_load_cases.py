@@ -0,0 +1,103 @@
+"""
+Tests for the linear analysis of several load cases
+"""
+
+import nfem
+import pytest
+from numpy.testing import assert_almost_equal
+
+
+@pytest.fixture
+def model():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z')
+    model.add_node(id='C', x=2, y=0, z=0, support='yz')
+    model.add_node(id='D', x=3, y=1, z=0, support='z')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=2, area=1)
+    model.add_truss(id='3', node_a='A', node_b='C', youngs_modulus=1, area=2)
+    model.add_truss(id='4', node_a='C', node_b='D', youngs_modulus=1, area=1, prestress=0.5)
+    model.add_truss(id='5', node_a='B', node_b='D', youngs_modulus=1, area=1)
+
+    model.add_load_case('dead', {'B': (0, -1, 0), 'D': (0, -1, 0)})
+    model.add_load_case('wind', {'B': (0.5, 0, 0), 'A': (1, 1, 0)})
+    model.add_load_case('point', {'D': (0.2, -0.3, 0)})
+
+    return model
+
+
+def _expected(model, name):
+    """Solve a single load case with a linear solution step."""
+    case = model.get_duplicate(branch=True)
+
+    for node in case.nodes:
+        node.fx, node.fy, node.fz = model.get_load_case(name).get(node.id, (0, 0, 0))
+
+    case.load_factor = 1
+    case.perform_linear_solution_step()
+
+    displacements = [case[dof].delta for dof in model.dofs]
+    normal_forces = [(truss.calculate_linear_strain() * truss.youngs_modulus + truss.prestress) * truss.area
+                     for truss in case.elements]
+
+    return displacements, normal_forces
+
+
+@pytest.mark.parametrize('sparse, solver', [(False, None), (True, None), (False, 'cholesky'), (True, 'cg')])
+def test_load_cases(model, sparse, solver):
+    results = model.perform_linear_load_case_analysis(sparse=sparse, solver=solver)
+
+    assert results.load_cases == ['dead', 'wind', 'point']
+    assert results.elements == ['1', '2', '3', '4', '5']
+    assert results.displacements.shape == (3, len(model.dofs))
+    assert results.normal_forces.shape == (3, 5)
+
+    for i, name in enumerate(results.load_cases):
+        displacements, normal_forces = _expected(model, name)
+
+        assert_almost_equal(results.displacements[i], displacements)
+        assert_almost_equal(results.normal_forces[i], normal_forces)
+
+    assert_almost_equal(results.get_displacement('point', ('D', 'v')), results.displacements[2, results.dofs.index(('D', 'v'))])
+    assert_almost_equal(results.get_normal_force('wind', '4'), results.normal_forces[1, 3])
+
+
+def test_model_is_not_changed(model):
+    model.perform_linear_load_case_analysis(['point'])
+
+    assert all(node.u == 0 and node.v == 0 for node in model.nodes)
+    assert model.status == nfem.model_status.ModelStatus.initial
+
+
+def test_selected_load_cases(model):
+    results = model.perform_linear_load_case_analysis(['point', 'dead'])
+
+    expected = model.perform_linear_load_case_analysis()
+
+    assert results.load_cases == ['point', 'dead']
+    assert_almost_equal(results.displacements, expected.displacements[[2, 0]])
+
+
+def test_load_cases_are_kept_by_duplicates(model):
+    duplicate = model.get_duplicate()
+    duplicate.add_load_case('snow', {'B': (0, -2, 0)})
+
+    assert duplicate.load_cases == ['dead', 'wind', 'point', 'snow']
+    assert model.load_cases == ['dead', 'wind', 'point']
+
+
+def test_invalid_load_cases_raise(model):
+    with pytest.raises(KeyError):
+        model.add_load_case('dead', {'B': (0, -1, 0)})
+
+    with pytest.raises(KeyError):
+        model.add_load_case('invalid', {'X': (0, -1, 0)})
+
+    with pytest.raises(KeyError):
+        model.perform_linear_load_case_analysis(['invalid'])
+
+    with pytest.raises(ValueError):
+        nfem.Model().perform_linear_load_case_analysis()
@@ -6,6 +6,7 @@ import numpy
 from numpy.testing import assert_almost_equal, assert_equal
 
 import nfem
+from nfem.model_status import ModelStatus
 
 
 @pytest.fixture
@@ -26,6 +27,229 @@ def test_model_dofs(model):
     assert_equal(len(model.dofs), 2)
 
 
+def test_assembler_is_cached(model):
+    assert model.get_assembler() is model.get_assembler()
+
+
+def test_assembler_is_invalidated_by_topology_changes(model):
+    assembler = model.get_assembler()
+
+    model.add_node(id='D', x=3, y=1, z=0, support='z')
+    assert model.get_assembler() is not assembler
+
+    assembler = model.get_assembler()
+    model.add_truss(id='3', node_a='C', node_b='D', youngs_modulus=1, area=1)
+    assert model.get_assembler() is not assembler
+    assert_equal(len(model.dofs), 4)
+
+    assembler = model.get_assembler()
+    model.nodes['D'].support = 'xyz'
+    assert model.get_assembler() is not assembler
+    assert_equal(len(model.dofs), 2)
+
+
+def test_duplicate_has_own_assembler(model):
+    model.get_assembler()
+
+    duplicate = model.get_duplicate()
+
+    assembler = duplicate.get_assembler()
+
+    assert assembler is not model.get_assembler()
+    assert assembler.numbering == model.get_assembler().numbering
+    assert assembler.dofs[0] is duplicate.nodes['B']._dof_x
+    assert model.get_assembler().dofs[0] is model.nodes['B']._dof_x
+
+
+def test_duplicate_solves_without_topology(model):
+    model.get_assembler()
+
+    duplicate = model.get_duplicate()
+    duplicate.predict_tangential(strategy='lambda', value=0.1)
+    duplicate.perform_non_linear_solution_step(strategy='load-control')
+
+    assert duplicate._topology is not None
+
+    assembler = duplicate.get_assembler()
+
+    assert assembler.dofs[0] is duplicate.nodes['B']._dof_x
+    assert assembler.element_groups[0].elements[0] is duplicate.elements['1']
+
+
+def test_duplicate_shares_topology(model):
+    nodes = model.nodes
+
+    duplicate = model.get_duplicate()
+
+    assert duplicate._topology is not None
+    assert duplicate['B', 'v'].delta == 0
+    assert duplicate._topology is not None
+
+    duplicate.nodes['B'].v = -0.5
+    duplicate.nodes['B'].fy = 2
+    duplicate.nodes['B'].support = 'xyz'
+
+    assert model.nodes is nodes
+
+    assert_equal(model.nodes['B'].v, 0)
+    assert_equal(model.nodes['B'].fy, -1)
+    assert_equal(model.nodes['B'].support, 'z')
+    assert model.nodes['B'] is not duplicate.nodes['B']
+    assert model.elements['1'].node_a is model.nodes['A']
+    assert duplicate.elements['1'].node_a is duplicate.nodes['A']
+
+
+def test_held_references_keep_their_model(model):
+    node = model.nodes['B']
+    element = model.elements['1']
+
+    element.area = 2
+
+    duplicate = model.get_duplicate()
+
+    element.youngs_modulus = 5
+    node.fy = -2
+
+    assert model.elements['1'] is element
+    assert_equal(model.elements['1'].youngs_modulus, 5)
+    assert_equal(model.nodes['B'].fy, -2)
+
+    assert_equal(duplicate.elements['1'].youngs_modulus, 1)
+    assert_equal(duplicate.elements['1'].area, 2)
+    assert_equal(duplicate.nodes['B'].fy, -1)
+
+    duplicate_element = duplicate.elements['1']
+
+    timestep = duplicate.new_timestep()
+
+    duplicate_element.area = 3
+
+    assert_equal(duplicate.elements['1'].area, 3)
+    assert_equal(timestep.elements['1'].area, 2)
+    assert_equal(model.elements['1'].area, 2)
+
+
+def test_duplicate_copies_topology_on_edit(model):
+    duplicate = model.get_duplicate()
+
+    duplicate.elements['1'].youngs_modulus = 2
+    duplicate.add_node(id='D', x=3, y=1, z=0)
+    duplicate.add_truss(id='3', node_a='C', node_b='D', youngs_modulus=1, area=1)
+
+    assert_equal(model.elements['1'].youngs_modulus, 1)
+    assert_equal(len(model.nodes), 3)
+    assert_equal(len(model.elements), 2)
+    assert_equal(len(duplicate.elements), 3)
+
+
+def test_new_timestep_copies_topology_on_edit(model):
+    timestep = model.new_timestep()
+    timestep.elements['2'].area = 3
+
+    assert_equal(model.elements['2'].area, 1)
+
+
+@pytest.mark.parametrize('iteration_history', ['compact', 'full'])
+def test_iteration_history(model, iteration_history):
+    model = model.get_duplicate()
+    model.predict_tangential(strategy='lambda', value=0.1)
+    model.perform_non_linear_solution_step(strategy='load-control', iteration_history=iteration_history)
+
+    history = model.get_model_history(skip_iterations=False)
+
+    statuses = [m.status for m in history]
+
+    assert statuses[0] == ModelStatus.initial
+    assert statuses[1] == ModelStatus.prediction
+    assert all(status == ModelStatus.iteration for status in statuses[2:-1])
+    assert statuses[-1] == ModelStatus.equilibrium
+    assert len(history) > 3
+
+    assert_almost_equal(history[1].load_factor, 0.1)
+
+    assert model.get_model_history() == [history[0], history[-1]]
+
+
+def test_compact_iteration_history_matches_full_history(model):
+    model_a = model.get_duplicate()
+    model_a.predict_tangential(strategy='lambda', value=0.1)
+    model_a.perform_non_linear_solution_step(strategy='load-control')
+
+    model_b = model.get_duplicate()
+    model_b.predict_tangential(strategy='lambda', value=0.1)
+    model_b.perform_non_linear_solution_step(strategy='load-control', iteration_history='full')
+
+    actual = model_a.load_displacement_curve(('B', 'v'), skip_iterations=False)
+    expected = model_b.load_displacement_curve(('B', 'v'), skip_iterations=False)
+
+    assert_almost_equal(actual, expected)
+
+
+def _solve_steps(model, n, **options):
+    for i in range(n):
+        model = model.get_duplicate()
+        model.predict_tangential(strategy='delta-dof', dof=('B', 'v'), value=-0.05)
+        model.perform_non_linear_solution_step(strategy='displacement-control', dof=('B', 'v'), **options)
+    return model
+
+
+def test_history_retention_all(model):
+    model = _solve_steps(model, 6)
+
+    assert len(model.get_model_history()) == 7
+    assert len(model.get_model_history(skip_iterations=False)) > 7
+
+
+def test_history_retention_equilibrium(model):
+    model = _solve_steps(model, 6, history='equilibrium')
+
+    expected = [0, -0.05, -0.1, -0.15, -0.2, -0.25, -0.3]
+
+    assert len(model.get_model_history(skip_iterations=False)) == 7
+    assert_almost_equal(model.load_displacement_curve(('B', 'v'))[0], expected)
+
+
+def test_history_retention_last(model):
+    model.set_history_retention('last', 4)
+
+    model = _solve_steps(model, 8)
+
+    history = model.get_model_history(skip_iterations=False)
+
+    assert history[0].status == ModelStatus.initial
+    assert_almost_equal([m.nodes['B'].v for m in history], [0, -0.2, -0.25, -0.3, -0.35, -0.4])
+
+
+def test_history_retention_every(model):
+    model = _solve_steps(model, 8, history=('every', 3))
+
+    history = model.get_model_history()
+
+    assert_almost_equal([m.nodes['B'].v for m in history], [0, -0.15, -0.25, -0.3, -0.35, -0.4])
+
+
+def test_history_retention_keeps_shared_history(model):
+    model = _solve_steps(model, 3)
+
+    shared_history = model.get_model_history(skip_iterations=False)
+
+    branch = model.get_duplicate()
+    model = _solve_steps(model, 3, history='equilibrium')
+
+    # only the steps after the shared model are pruned
+    assert model.get_model_history(skip_iterations=False)[:len(shared_history)] == shared_history
+    assert len(model.get_model_history(skip_iterations=False)) == len(shared_history) + 3
+    assert branch.get_model_history(skip_iterations=False) == shared_history + [branch]
+
+
+def test_invalid_history_retention_raises(model):
+    with pytest.raises(ValueError):
+        model.set_history_retention('invalid')
+
+    with pytest.raises(ValueError):
+        model.set_history_retention('last')
+
+
 def test_model_nodes(model):
     assert_equal(len(model.nodes), 3)
 
@@ -119,29 +343,30 @@ def test_predict_with_last_increment(model):
         model.predict_with_last_increment(5)
 
 
-def test_add_element():
-    class Element:
-        def __init__(self, id, nodes, k):
-            self.id = id
-            self.nodes = nodes
-            self.k = k
-
-        @property
-        def dofs(self):
-            dofs = []
-            for node in self.nodes:
-                dofs.append(node._dof_x)
-                dofs.append(node._dof_y)
-                dofs.append(node._dof_z)
-            return dofs
-
-        def calculate_stiffness_matrix(self):
-            return numpy.eye(6) * self.k
-
-        def calculate_internal_forces(self):
-            u = numpy.array([dof.delta for dof in self.dofs])
-            return self.calculate_stiffness_matrix() @ u
+class Element:
+    def __init__(self, id, nodes, k):
+        self.id = id
+        self.nodes = nodes
+        self.k = k
 
+    @property
+    def dofs(self):
+        dofs = []
+        for node in self.nodes:
+            dofs.append(node._dof_x)
+            dofs.append(node._dof_y)
+            dofs.append(node._dof_z)
+        return dofs
+
+    def calculate_stiffness_matrix(self):
+        return numpy.eye(6) * self.k
+
+    def calculate_internal_forces(self):
+        u = numpy.array([dof.delta for dof in self.dofs])
+        return self.calculate_stiffness_matrix() @ u
+
+
+def test_add_element():
     model = nfem.Model()
 
     model.add_node(id='A', x=0, y=0, z=0, support='xyz')
@@ -156,3 +381,30 @@ def test_add_element():
 
     assert_almost_equal(model.nodes['B'].u, 0)
     assert_almost_equal(model.nodes['B'].v, -0.1)
+
+
+def test_custom_elements_are_not_cached():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z')
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_element(Element, id='1', nodes=['A', 'B'], k=5)
+    model.add_element(Element, id='2', nodes=['B', 'C'], k=5)
+
+    model.solve_det_k()
+    assert_almost_equal(model.det_k, 100)
+
+    model.elements['1'].k = 1
+    model.elements['2'].k = 1
+
+    model.solve_det_k()
+    assert_almost_equal(model.det_k, 4)
+
+    duplicate = model.get_duplicate()
+    duplicate.elements['1'].k = 2
+    duplicate.elements['2'].k = 2
+
+    duplicate.solve_det_k()
+    assert_almost_equal(duplicate.det_k, 16)
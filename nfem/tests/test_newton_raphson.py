@@ -18,3 +18,24 @@ def calculate_system():
 def test_not_converged_raises(calculate_system):
     with pytest.raises(RuntimeError):
         newton_raphson_solve(calculate_system, x_initial=[1], max_iterations=1)
+
+
+@pytest.mark.parametrize('globalization', ['backtracking', 'exact', 'dogleg'])
+def test_globalization_converges(globalization):
+    # the full Newton step diverges for arctan(x) = 0 starting at |x| > 1.39
+    def calculate_system(x):
+        with np.errstate(over='ignore'):
+            return np.array([[1 / (1 + x[0]**2)]]), np.array([np.arctan(x[0])])
+
+    with pytest.raises(RuntimeError):
+        newton_raphson_solve(calculate_system, x_initial=np.array([3.0]), max_iterations=20)
+
+    x, _ = newton_raphson_solve(calculate_system, x_initial=np.array([3.0]), max_iterations=20,
+                                globalization=globalization)
+
+    assert abs(x[0]) < 1e-7
+
+
+def test_invalid_globalization_raises(calculate_system):
+    with pytest.raises(ValueError):
+        newton_raphson_solve(calculate_system, x_initial=[1], globalization='invalid')
@@ -0,0 +1,84 @@
+"""
+Tests for the parallel parameter sweeps
+"""
+
+import nfem
+import pytest
+from numpy.testing import assert_almost_equal
+
+
+def create_model(height=1.0, area=1.0):
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=height, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=area)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=area)
+
+    return model
+
+
+def linear_displacement(model):
+    model.load_factor = 0.01
+    model.perform_linear_solution_step()
+    return model.nodes['B'].v
+
+
+def failing_analysis(model):
+    raise RuntimeError('Analysis failed')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sweep_grid(workers):
+    results = nfem.sweep(create_model, {'height': [1.0, 2.0], 'area': [1.0, 2.0, 4.0]}, linear_displacement,
+                         workers=workers)
+
+    assert [parameters for parameters, _ in results] == [
+        {'height': 1.0, 'area': 1.0}, {'height': 1.0, 'area': 2.0}, {'height': 1.0, 'area': 4.0},
+        {'height': 2.0, 'area': 1.0}, {'height': 2.0, 'area': 2.0}, {'height': 2.0, 'area': 4.0},
+    ]
+
+    for parameters, displacement in results:
+        assert_almost_equal(displacement, linear_displacement(create_model(**parameters)))
+
+
+def test_sweep_parameter_list():
+    results = nfem.sweep(create_model, [{'height': 2.0}, {'area': 2.0}], linear_displacement, workers=2)
+
+    assert [parameters for parameters, _ in results] == [{'height': 2.0}, {'area': 2.0}]
+    assert_almost_equal(results[1][1], linear_displacement(create_model()) / 2)
+
+
+def test_sweep_load_displacement_curve():
+    analysis = nfem.LoadDisplacementCurve(('B', 'v'), 'load-control', 0.02, max_steps=5)
+
+    results = nfem.sweep(create_model, {'area': [1.0, 2.0]}, analysis, workers=2)
+
+    for parameters, curve in results:
+        assert curve.shape == (2, 6)
+
+        expected = create_model(**parameters).trace_path('load-control', 0.02, max_steps=5)
+        assert_almost_equal(curve, expected.load_displacement_curve(('B', 'v')))
+
+
+def test_sweep_critical_load():
+    analysis = nfem.CriticalLoad(step_size=0.05)
+
+    results = nfem.sweep(create_model, {'height': [1.0, 3.0]}, analysis, workers=2)
+
+    # limit point and bifurcation point
+    assert_almost_equal(results[0][1], 0.13607744543608463, decimal=4)
+    assert_almost_equal(results[1][1], 0.16733018783531955, decimal=4)
+
+
+def test_critical_load_is_none_without_critical_point():
+    analysis = nfem.CriticalLoad('load-control', step_size=0.02, max_steps=3)
+
+    assert analysis(create_model()) is None
+
+
+def test_sweep_raises():
+    with pytest.raises(RuntimeError):
+        nfem.sweep(create_model, {'area': [1.0, 2.0]}, failing_analysis, workers=2)
@@ -0,0 +1,129 @@
+'''
+Tests for the adaptive path tracing
+'''
+
+import pytest
+import nfem
+from numpy.linalg import LinAlgError
+from numpy.testing import assert_almost_equal
+
+
+@pytest.fixture
+def model():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    return model
+
+
+def test_trace_path_load_control_to_lam_target(model):
+    last_model = model.trace_path('load-control', step_size=0.03, lam_target=0.1)
+
+    assert_almost_equal(last_model.load_factor, 0.1)
+    assert len(last_model.get_model_history()) == 4
+
+
+def test_trace_path_displacement_control_to_dof_target(model):
+    last_model = model.trace_path('displacement-control', step_size=-0.1, dof=('B', 'v'), dof_target=-2.5)
+
+    assert_almost_equal(last_model[('B', 'v')].delta, -2.5)
+
+
+def test_trace_path_through_limit_point(model):
+    last_model = model.trace_path('arc-length-control', step_size=0.05, dof=('B', 'v'), dof_target=-3)
+
+    assert last_model[('B', 'v')].delta <= -3
+    assert last_model.load_factor > 1.0
+
+    # the path passes the limit point and the snap through
+    load_factors = [m.load_factor for m in last_model.get_model_history()]
+    assert min(load_factors[load_factors.index(max(load_factors[:8])):]) < 0
+
+
+def test_trace_path_stops_at_critical_point(model):
+    last_model = model.trace_path('arc-length-control', step_size=0.05, stop_at_critical_point=True)
+
+    assert last_model.det_k_sign == -1
+    assert last_model.get_previous_model().det_k_sign == 1
+
+    critical_model = nfem.solve_critical_point(last_model)
+
+    assert_almost_equal(critical_model.load_factor, 0.13607744543608463, decimal=5)
+
+
+def test_trace_path_adapts_step_size(model):
+    last_model = model.trace_path('arc-length-control', step_size=0.01, max_steps=5, target_iterations=20)
+
+    increments = [m.get_increment_norm() for m in last_model.get_model_history()[1:]]
+
+    assert all(b > a for a, b in zip(increments, increments[1:]))
+
+
+def test_trace_path_adapts_step_size_to_contraction(model):
+    # the steps converge within the target iterations but the residual contracts slower
+    # than required
+    last_model = model.trace_path('arc-length-control', step_size=0.05, max_steps=4, target_iterations=20,
+                                  target_contraction=1e-5)
+
+    increments = [m.get_increment_norm() for m in last_model.get_model_history()[1:]]
+
+    assert max(increments[1:]) < 0.2 * increments[0]
+
+
+def test_trace_path_ignores_fast_contraction(model):
+    # the residuals of the steps contract faster than required, so only the number of
+    # iterations controls the growth of the step size
+    last_model = model.trace_path('arc-length-control', step_size=0.01, max_steps=4, target_iterations=100,
+                                  target_contraction=1e-3)
+
+    increments = [m.get_increment_norm() for m in last_model.get_model_history()[1:]]
+
+    assert_almost_equal(increments, [0.01, 0.02, 0.04, 0.08], decimal=4)
+
+
+def test_trace_path_cuts_back_failed_steps(model):
+    last_model = model.trace_path('load-control', step_size=0.1, max_steps=1, max_iterations=3)
+
+    assert 0 < last_model.load_factor < 0.1
+
+    # the retry starts from the initial model and the failed attempts are not kept
+    assert last_model.get_previous_model() is model
+    assert list(model._children) == [last_model]
+
+
+def test_trace_path_cuts_back_singular_steps(model, monkeypatch):
+    perform_non_linear_solution_step = nfem.Model.perform_non_linear_solution_step
+    calls = []
+
+    def fail_first_step(self, *args, **kwargs):
+        calls.append(self)
+        if len(calls) == 1:
+            raise LinAlgError('Singular matrix')
+        return perform_non_linear_solution_step(self, *args, **kwargs)
+
+    monkeypatch.setattr(nfem.Model, 'perform_non_linear_solution_step', fail_first_step)
+
+    last_model = model.trace_path('load-control', step_size=0.1, max_steps=1)
+
+    assert_almost_equal(last_model.load_factor, 0.05)
+
+
+def test_trace_path_at_target(model):
+    assert model.trace_path('load-control', step_size=0.1, lam_target=0.0) is model
+    assert model.trace_path('displacement-control', step_size=-0.1, dof=('B', 'v'), dof_target=0.0) is model
+
+
+def test_trace_path_raises_below_min_step_size(model):
+    with pytest.raises(RuntimeError):
+        model.trace_path('load-control', step_size=0.1, max_steps=1, max_iterations=1, min_step_size=0.01)
+
+
+def test_trace_path_invalid_strategy(model):
+    with pytest.raises(ValueError):
+        model.trace_path('invalid')
@@ -0,0 +1,294 @@
+"""
+Tests for the solve functions
+"""
+
+import numpy as np
+import pytest
+from numpy.testing import assert_almost_equal
+from scipy.sparse import csr_matrix
+
+import nfem
+from nfem.solve import BorderedSystem, solve_linear_system
+
+
+@pytest.fixture
+def system():
+    k = np.array([[4.0, -1.0, 0.0],
+                  [-1.0, 4.0, -1.0],
+                  [0.0, -1.0, 3.0]])
+    b = np.array([0.0, -1.0, -0.5])
+    c = np.array([0.2, 0.0, 1.0])
+    d = 0.5
+    return BorderedSystem(k, b, c, d)
+
+
+def test_to_matrix(system):
+    matrix = system.to_matrix()
+
+    assert_almost_equal(matrix[:3, :3], system.k)
+    assert_almost_equal(matrix[:3, 3], system.b)
+    assert_almost_equal(matrix[3, :3], system.c)
+    assert_almost_equal(matrix[3, 3], system.d)
+
+    assert_almost_equal(BorderedSystem(csr_matrix(system.k), system.b, system.c, system.d).to_matrix().toarray(),
+                        matrix)
+
+
+def test_block_elimination(system):
+    rhs = np.array([1.0, 2.0, 3.0, 4.0])
+
+    expected = np.linalg.solve(system.to_matrix(), rhs)
+
+    assert_almost_equal(system._solve_block_elimination(rhs), expected)
+    assert_almost_equal(solve_linear_system(system, rhs), expected)
+
+
+def test_sparse_block_elimination(system):
+    rhs = np.array([1.0, 2.0, 3.0, 4.0])
+
+    expected = np.linalg.solve(system.to_matrix(), rhs)
+
+    sparse_system = BorderedSystem(csr_matrix(system.k), system.b, system.c, system.d)
+
+    assert_almost_equal(sparse_system._solve_block_elimination(rhs), expected)
+
+
+def test_singular_k_falls_back_to_full_system():
+    # k is singular at a limit point but the bordered system is regular
+    k = np.array([[1.0, 0.0],
+                  [0.0, 0.0]])
+    system = BorderedSystem(k, np.array([0.0, -1.0]), np.array([0.0, 1.0]), 0.0)
+
+    rhs = np.array([1.0, 2.0, 3.0])
+
+    with pytest.raises(RuntimeError):
+        system._solve_block_elimination(rhs)
+
+    assert_almost_equal(system.solve(rhs), np.linalg.solve(system.to_matrix(), rhs))
+
+
+@pytest.fixture
+def model():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=3, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    return model
+
+
+@pytest.mark.parametrize('options', [
+    dict(),
+    dict(iteration='modified-newton'),
+    dict(iteration='modified-newton', refactor_interval=2),
+    dict(iteration='initial-stiffness'),
+    dict(iteration='modified-newton', sparse=True),
+    dict(iteration='broyden'),
+    dict(iteration='bfgs'),
+    dict(iteration='bfgs', sparse=True),
+])
+def test_iteration_methods(model, options):
+    expected = model.get_duplicate(branch=True)
+    expected.load_factor = 0.05
+    expected_info = expected.perform_load_control_step(tolerance=1e-10)
+
+    model.load_factor = 0.05
+    info = model.perform_load_control_step(tolerance=1e-10, **options)
+
+    assert_almost_equal(model.nodes['B'].u, expected.nodes['B'].u)
+    assert_almost_equal(model.nodes['B'].v, expected.nodes['B'].v)
+    assert_almost_equal(model.det_k, expected.det_k)
+
+    # the stiffness of the converged iteration is assembled but not factorized
+    assert info.factorizations <= info.assemblies <= info.factorizations + 1
+
+    if options.get('iteration', 'newton') == 'newton':
+        assert info.assemblies == info.iterations
+        assert info.factorizations == info.iterations - 1
+    elif 'refactor_interval' in options:
+        assert 1 < info.factorizations < info.iterations - 1
+    else:
+        assert info.factorizations == 1
+        assert info.iterations > expected_info.iterations
+
+    assert set(info.timings) == {'assembly_time', 'factorization_time', 'total_time'}
+
+
+def test_initial_stiffness_is_reused_by_the_following_steps(model):
+    model.load_factor = 0.02
+    model.perform_load_control_step(tolerance=1e-10, iteration='initial-stiffness')
+
+    model = model.get_duplicate()
+    model.load_factor = 0.04
+    info = model.perform_load_control_step(tolerance=1e-10, iteration='initial-stiffness')
+
+    assert info.assemblies == 0
+    assert info.factorizations == 0
+
+    model = model.get_duplicate()
+    model.elements['1'].area = 2
+    model.load_factor = 0.06
+
+    expected = model.get_duplicate(branch=True)
+    expected.perform_load_control_step(tolerance=1e-10)
+
+    info = model.perform_load_control_step(tolerance=1e-10, iteration='initial-stiffness')
+
+    assert info.factorizations == 1
+
+    assert_almost_equal(model.nodes['B'].v, expected.nodes['B'].v)
+
+
+def test_invalid_iteration_method_raises(model):
+    with pytest.raises(ValueError):
+        model.perform_load_control_step(iteration='invalid')
+
+
+def test_arc_length_control_requires_the_same_topology(model):
+    model = model.get_duplicate()
+    model.predict_tangential(strategy='lambda', value=0.05)
+
+    model.add_node(id='D', x=3, y=0, z=0, support='xyz')
+
+    with pytest.raises(RuntimeError):
+        model.perform_arc_length_control_step()
+
+
+def _trace_arc_length_path(model, steps, **options):
+    model = model.get_duplicate()
+    model.predict_tangential(strategy='lambda', value=0.05)
+    model.perform_load_control_step(tolerance=1e-8, **options)
+
+    for step in range(steps):
+        model = model.get_duplicate()
+        model.predict_tangential(strategy='arc-length')
+        model.perform_arc_length_control_step(tolerance=1e-8, **options)
+
+    return model.load_displacement_curve(('B', 'v'))
+
+
+@pytest.mark.parametrize('iteration', ['broyden', 'bfgs'])
+def test_quasi_newton_arc_length_path(iteration):
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    expected = _trace_arc_length_path(model, 25)
+    actual = _trace_arc_length_path(model, 25, iteration=iteration)
+
+    # the path passes the limit point and snaps through
+    assert np.min(expected[0]) < -2
+
+    assert_almost_equal(actual, expected, decimal=3)
+
+
+def test_bordered_system_matvec(system):
+    v = np.array([1.0, -2.0, 0.5, 3.0])
+
+    assert_almost_equal(system.matvec(v), system.to_matrix() @ v)
+    assert_almost_equal(system.rmatvec(v), system.to_matrix().T @ v)
+
+
+@pytest.mark.parametrize('globalization', ['backtracking', 'exact', 'dogleg'])
+def test_globalized_arc_length_path(globalization):
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    expected = _trace_arc_length_path(model, 25)
+    actual = _trace_arc_length_path(model, 25, globalization=globalization)
+
+    assert_almost_equal(actual, expected, decimal=3)
+
+
+def test_globalization_with_quasi_newton_raises(model):
+    model.load_factor = 0.05
+
+    with pytest.raises(ValueError):
+        model.perform_load_control_step(iteration='bfgs', globalization='backtracking')
+
+
+@pytest.mark.parametrize('solver', ['cg', 'minres', 'gmres', 'cg-ilu'])
+def test_krylov_arc_length_path(solver):
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z', fy=-1)
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=1, area=1)
+
+    expected = _trace_arc_length_path(model, 25)
+    actual = _trace_arc_length_path(model, 25, sparse=True, solver=solver)
+
+    # the tangent is indefinite beyond the limit point
+    assert np.min(expected[0]) < -2
+
+    assert_almost_equal(actual, expected, decimal=3)
+
+
+@pytest.mark.parametrize('forcing_term', ['eisenstat-walker', 1e-3, None])
+def test_inexact_newton_forcing_term(model, forcing_term):
+    expected = model.get_duplicate(branch=True)
+    expected.load_factor = 0.1
+    expected.perform_load_control_step(tolerance=1e-10)
+
+    model.load_factor = 0.1
+    model.perform_load_control_step(tolerance=1e-10, sparse=True, solver='gmres-none', forcing_term=forcing_term)
+
+    assert_almost_equal(model.nodes['B'].v, expected.nodes['B'].v)
+
+    # the stored factorization solves with the tolerance of the backend
+    assert model.get_stiffness_factorization(sparse=True, solver='gmres-none').tolerance == 1e-10
+
+
+def test_eisenstat_walker_reduces_krylov_iterations():
+    n = 6
+
+    model = nfem.Model()
+
+    for i in range(n + 1):
+        model.add_node(id=f'B{i}', x=i, y=0, z=0, support='z')
+        model.add_node(id=f'T{i}', x=i, y=1, z=0, support='z')
+
+    model.nodes['B0'].support = 'xyz'
+    model.nodes[f'B{n}'].support = 'yz'
+
+    for i in range(n + 1):
+        model.add_truss(id=f'V{i}', node_a=f'B{i}', node_b=f'T{i}', youngs_modulus=100, area=1)
+
+    for i in range(n):
+        model.add_truss(id=f'B{i}', node_a=f'B{i}', node_b=f'B{i + 1}', youngs_modulus=100, area=1)
+        model.add_truss(id=f'T{i}', node_a=f'T{i}', node_b=f'T{i + 1}', youngs_modulus=100, area=1)
+        model.add_truss(id=f'D{i}', node_a=f'B{i}', node_b=f'T{i + 1}', youngs_modulus=100, area=1)
+
+    for i in range(1, n):
+        model.nodes[f'T{i}'].fy = -1
+
+    krylov_iterations = []
+
+    for forcing_term in ['eisenstat-walker', None]:
+        step = model.get_duplicate(branch=True)
+        step.load_factor = 0.1
+        info = step.perform_load_control_step(tolerance=1e-8, sparse=True, solver='gmres',
+                                              forcing_term=forcing_term)
+        krylov_iterations.append(info.statistics['krylov_iterations'])
+
+    # the early linear solves are inexact, so the restarted GMRES needs less iterations in
+    # total although the Newton iteration needs more steps
+    assert krylov_iterations[0] < krylov_iterations[1]
@@ -0,0 +1,111 @@
+"""
+Tests for the vectorized truss kernels
+"""
+
+import nfem
+import numpy as np
+import pytest
+from numpy.testing import assert_almost_equal
+
+from nfem.truss_batch import TrussBatch, calculate_linear_normal_forces
+
+
+@pytest.fixture
+def trusses():
+    node_a = nfem.Node('A', 1, 2, 3)
+    node_b = nfem.Node('B', 4, 6, 3)
+    node_c = nfem.Node('C', 0, 0, 0)
+    node_d = nfem.Node('D', 2, 1, 4)
+
+    node_b.u = 3
+    node_b.v = 4
+    node_d.u = 0.1
+    node_d.w = -0.2
+
+    return [
+        nfem.Truss('1', node_a, node_b, 2, 1),
+        nfem.Truss('2', node_c, node_d, 1, 1, prestress=0.5),
+        nfem.Truss('3', node_a, node_d, 3, 2, prestress=-0.1),
+    ]
+
+
+@pytest.fixture
+def batch(trusses):
+    return TrussBatch(trusses)
+
+
+def test_pack_locations(batch):
+    locations = batch.pack_locations()
+
+    assert locations.shape == (3, 3, 2)
+    assert_almost_equal(locations[0], [[1, 7], [2, 10], [3, 3]])
+
+
+@pytest.mark.parametrize('method', [
+    'calculate_elastic_stiffness_matrix',
+    'calculate_material_stiffness_matrix',
+    'calculate_initial_displacement_stiffness_matrix',
+    'calculate_geometric_stiffness_matrix',
+    'calculate_stiffness_matrix',
+    'calculate_internal_forces',
+])
+def test_batch_equals_single_elements(trusses, batch, method):
+    actual = getattr(batch, method)()
+    expected = np.array([getattr(truss, method)() for truss in trusses])
+
+    assert_almost_equal(actual, expected)
+
+
+def test_linear_geometric_stiffness(trusses, batch):
+    actual = batch.calculate_geometric_stiffness_matrix(linear=True)
+    expected = np.array([truss.calculate_geometric_stiffness_matrix(linear=True) for truss in trusses])
+
+    assert_almost_equal(actual, expected)
+
+
+def test_linear_normal_forces(trusses, batch):
+    E, A, prestress = batch.pack_properties()
+
+    delta = batch.pack_locations() - batch.pack_ref_locations()
+    displacements = np.concatenate([delta[:, :, 0], delta[:, :, 1]], axis=1)
+
+    actual = calculate_linear_normal_forces(batch.pack_ref_locations(), displacements, E, A, prestress)
+    expected = [(truss.calculate_linear_strain() * truss.youngs_modulus + truss.prestress) * truss.area
+                for truss in trusses]
+
+    assert_almost_equal(actual, expected)
+
+    # stack of displacements
+    actual = calculate_linear_normal_forces(batch.pack_ref_locations(), np.array([displacements, 0 * displacements]),
+                                            E, A, prestress)
+
+    assert_almost_equal(actual, [expected, prestress * A])
+
+
+def test_empty_batch():
+    batch = TrussBatch([])
+
+    assert batch.calculate_stiffness_matrix().shape == (0, 6, 6)
+    assert batch.calculate_internal_forces().shape == (0, 6)
+
+
+def test_properties_are_packed_once():
+    model = nfem.Model()
+
+    model.add_node(id='A', x=0, y=0, z=0, support='xyz')
+    model.add_node(id='B', x=1, y=1, z=0, support='z')
+    model.add_node(id='C', x=2, y=0, z=0, support='xyz')
+
+    model.add_truss(id='1', node_a='A', node_b='B', youngs_modulus=1, area=1)
+    model.add_truss(id='2', node_a='B', node_b='C', youngs_modulus=2, area=3)
+
+    batch = model.get_assembler().element_groups[0].batch
+
+    youngs_modulus, area, _ = batch.pack_properties()
+
+    assert batch.pack_properties()[0] is youngs_modulus
+
+    model.elements['2'].area = 4
+
+    assert_almost_equal(batch.pack_properties()[1], [1, 4])
+    assert_almost_equal(area, [1, 3])
@@ -0,0 +1,100 @@
+"""This module only contains the Topology class."""
+
+from copy import copy, deepcopy
+
+from nfem.key_collection import KeyCollection
+
+
+class Topology:
+    """A Topology holds the nodes and elements of a model which are shared with the copies
+    of the model.
+
+    The copies only store their own `DofState` and `ElementState`. Their nodes and elements
+    are created from the topology if they are requested. The topology is a snapshot of the
+    node and element collections of the model. The nodes and the elements with an
+    `ElementState` are shared with the model because all their data is stored in the
+    states. Other elements are copied shallowly.
+
+    Attributes
+    ----------
+    nodes : KeyCollection
+        Nodes of the topology.
+    elements : KeyCollection
+        Elements of the topology.
+    dof_state : DofState
+        State the dofs of the nodes are stored in.
+    element_state : ElementState
+        State the properties of the elements are stored in.
+    is_shareable : bool
+        Flag if the topology can be used for several copies. This is not the case if it
+        contains elements without an `ElementState`, because they might be modified after
+        the snapshot.
+    """
+
+    def __init__(self, nodes, elements, dof_state, element_state):
+        """Create a new Topology.
+
+        Parameters
+        ----------
+        nodes : KeyCollection
+            Nodes of the model.
+        elements : KeyCollection
+            Elements of the model.
+        dof_state : DofState
+            State the dofs of the nodes are stored in.
+        element_state : ElementState
+            State the properties of the elements are stored in.
+        """
+        self.nodes = KeyCollection()
+        self.elements = KeyCollection()
+        self.dof_state = dof_state
+        self.element_state = element_state
+        self.is_shareable = True
+
+        for node in nodes:
+            self.nodes._add(node)
+
+        for element in elements:
+            if getattr(element, '_state', None) is not element_state:
+                element = copy(element)
+                self.is_shareable = False
+            self.elements._add(element)
+
+    def materialize(self, dof_state, element_state):
+        """Create the nodes and elements for a copy of the states.
+
+        Parameters
+        ----------
+        dof_state : DofState
+            State the dofs of the new nodes are stored in.
+        element_state : ElementState
+            State the properties of the new elements are stored in.
+
+        Returns
+        -------
+        nodes : KeyCollection
+            New nodes.
+        elements : KeyCollection
+            New elements.
+        """
+        nodes = KeyCollection()
+        new_nodes = dict()
+
+        # the memo maps the old nodes to the new ones for the elements which are deep copied
+        memo = {id(self.dof_state): dof_state, id(self.element_state): element_state}
+
+        for node in self.nodes:
+            new_node = node._with_state(dof_state)
+            nodes._add(new_node)
+            new_nodes[node.id] = new_node
+            memo[id(node)] = new_node
+
+        elements = KeyCollection()
+
+        for element in self.elements:
+            if getattr(element, '_state', None) is self.element_state:
+                elements._add(element._with_state(new_nodes, element_state))
+            else:
+                elements._add(deepcopy(element, memo))
+
+        return nodes, elements
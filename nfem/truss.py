@@ -3,6 +3,7 @@
 Authors: Thomas Oberbichler, Klaus Sautter
 """
 
+from nfem.element_state import ElementProperty, ElementState
 from nfem.node import Node
 
 import numpy as np
@@ -12,27 +13,63 @@ from typing import Optional
 
 
 class Truss:
-    """FIXME"""
+    """
+    Three dimensional truss element with a linear elastic material (St. Venant-Kirchhoff).
+
+    The properties are stored as floats in an `ElementState`, so the copies of a model share
+    them until they are modified.
+
+    Attributes
+    ----------
+    id : str
+        Unique id of the truss element.
+    node_a : Node
+        First node.
+    node_b : Node
+        Second node.
+    youngs_modulus : float
+        Young's modulus of the material.
+    area : float
+        Area of the cross section.
+    prestress : float
+        Prestress of the truss (normal force in the reference configuration).
+    tensile_strength : float or None
+        Optional strength for tension.
+    compressive_strength : float or None
+        Optional strength for compression.
+    dofs
+    """
 
     node_a: Node
     node_b: Node
-    youngs_modulus: float
-    area: float
-    prestress: float
-    tensile_strength: Optional[float]
-    compressive_strength: Optional[float]
-
-    def __init__(self, id: str, node_a: Node, node_b: Node, youngs_modulus: float, area: float, prestress: float = 0.0, tensile_strength: Optional[float] = None, compressive_strength: Optional[float] = None):
+    youngs_modulus = ElementProperty()
+    area = ElementProperty()
+    prestress = ElementProperty()
+    tensile_strength = ElementProperty(optional=True)
+    compressive_strength = ElementProperty(optional=True)
+
+    def __init__(self, id: str, node_a: Node, node_b: Node, youngs_modulus: float, area: float, prestress: float = 0.0,
+                 tensile_strength: Optional[float] = None, compressive_strength: Optional[float] = None,
+                 state: ElementState = None):
         """FIXME"""
 
+        if state is None:
+            state = ElementState()
         self.id = id
         self.node_a = node_a
         self.node_b = node_b
-        self.youngs_modulus = youngs_modulus
-        self.area = area
-        self.prestress = prestress
-        self.tensile_strength = tensile_strength
-        self.compressive_strength = compressive_strength
+        self._state = state
+        self._index = state.add(youngs_modulus=youngs_modulus, area=area, prestress=prestress,
+                                tensile_strength=tensile_strength, compressive_strength=compressive_strength)
+
+    def _with_state(self, nodes, state):
+        # view of the same truss with the given nodes and properties
+        truss = self.__class__.__new__(self.__class__)
+        truss.__dict__.update(self.__dict__)
+        truss.node_a = nodes[self.node_a.id]
+        truss.node_b = nodes[self.node_b.id]
+        truss._state = state
+        return truss
 
     @property
     def dofs(self):
@@ -0,0 +1,407 @@
+"""This module contains vectorized kernels to evaluate many truss elements at once.
+
+The kernels work on packed coordinate arrays of shape (N, 3, 2) holding the x, y and z
+coordinates of node a (`[..., 0]`) and node b (`[..., 1]`) for N truss elements.
+"""
+
+import numpy as np
+
+
+_GEOMETRIC_PATTERN = np.kron([[1.0, -1.0], [-1.0, 1.0]], np.eye(3))
+
+
+def _base_vectors(locations):
+    return locations[:, :, 1] - locations[:, :, 0]
+
+
+def _outer(factor, d):
+    d = np.concatenate([-d, d], axis=1)
+    return factor[:, None, None] * d[:, :, None] * d[:, None, :]
+
+
+def calculate_green_lagrange_strains(ref_locations, locations):
+    """Calculate the Green-Lagrange strains of N trusses.
+
+    Parameters
+    ----------
+    ref_locations : ndarray
+        Packed reference coordinates (N, 3, 2).
+    locations : ndarray
+        Packed actual coordinates (N, 3, 2).
+
+    Returns
+    -------
+    epsilon : ndarray
+        Strains (N,).
+    """
+    A1 = _base_vectors(ref_locations)
+    a1 = _base_vectors(locations)
+
+    A1_A1 = np.einsum('ij,ij->i', A1, A1)
+    a1_a1 = np.einsum('ij,ij->i', a1, a1)
+
+    return (a1_a1 - A1_A1) / (2 * A1_A1)
+
+
+def calculate_linear_strains(ref_locations, locations):
+    """Calculate the engineering strains of N trusses.
+
+    Parameters
+    ----------
+    ref_locations : ndarray
+        Packed reference coordinates (N, 3, 2).
+    locations : ndarray
+        Packed actual coordinates (N, 3, 2).
+
+    Returns
+    -------
+    epsilon : ndarray
+        Strains (N,).
+    """
+    A1 = _base_vectors(ref_locations)
+    a1 = _base_vectors(locations)
+
+    L = np.sqrt(np.einsum('ij,ij->i', A1, A1))
+
+    projected_l = np.einsum('ij,ij->i', a1, A1) / L
+
+    return (projected_l - L) / L
+
+
+def calculate_elastic_stiffness_matrices(ref_locations, youngs_modulus, area):
+    """Calculate the elastic stiffness matrices of N trusses.
+
+    Parameters
+    ----------
+    ref_locations : ndarray
+        Packed reference coordinates (N, 3, 2).
+    youngs_modulus : ndarray
+        Youngs modulus (N,).
+    area : ndarray
+        Area of the cross section (N,).
+
+    Returns
+    -------
+    k : ndarray
+        Stack of element matrices (N, 6, 6).
+    """
+    D = _base_vectors(ref_locations)
+    L = np.sqrt(np.einsum('ij,ij->i', D, D))
+
+    return _outer(youngs_modulus * area / L**3, D)
+
+
+def calculate_material_stiffness_matrices(ref_locations, locations, youngs_modulus, area):
+    """Calculate the material stiffness matrices of N trusses.
+
+    Parameters
+    ----------
+    ref_locations : ndarray
+        Packed reference coordinates (N, 3, 2).
+    locations : ndarray
+        Packed actual coordinates (N, 3, 2).
+    youngs_modulus : ndarray
+        Youngs modulus (N,).
+    area : ndarray
+        Area of the cross section (N,).
+
+    Returns
+    -------
+    k : ndarray
+        Stack of element matrices (N, 6, 6).
+    """
+    D = _base_vectors(ref_locations)
+    L = np.sqrt(np.einsum('ij,ij->i', D, D))
+
+    d = _base_vectors(locations)
+
+    return _outer(youngs_modulus * area / L**3, d)
+
+
+def calculate_geometric_stiffness_matrices(ref_locations, locations, youngs_modulus, area, prestress, linear=False):
+    """Calculate the geometric stiffness matrices of N trusses.
+
+    Parameters
+    ----------
+    ref_locations : ndarray
+        Packed reference coordinates (N, 3, 2).
+    locations : ndarray
+        Packed actual coordinates (N, 3, 2).
+    youngs_modulus : ndarray
+        Youngs modulus (N,).
+    area : ndarray
+        Area of the cross section (N,).
+    prestress : ndarray
+        Prestress (N,).
+    linear : bool, optional
+        Flag if the linear strain is used instead of the Green-Lagrange strain.
+
+    Returns
+    -------
+    k : ndarray
+        Stack of element matrices (N, 6, 6).
+    """
+    D = _base_vectors(ref_locations)
+    L = np.sqrt(np.einsum('ij,ij->i', D, D))
+
+    if linear:
+        epsilon = calculate_linear_strains(ref_locations, locations)
+    else:
+        epsilon = calculate_green_lagrange_strains(ref_locations, locations)
+
+    sigma = youngs_modulus * epsilon + prestress
+
+    q = sigma * area / L
+
+    return q[:, None, None] * _GEOMETRIC_PATTERN
+
+
+def calculate_stiffness_matrices(ref_locations, locations, youngs_modulus, area, prestress):
+    """Calculate the tangential stiffness matrices K_m + K_g of N trusses.
+
+    Parameters
+    ----------
+    ref_locations : ndarray
+        Packed reference coordinates (N, 3, 2).
+    locations : ndarray
+        Packed actual coordinates (N, 3, 2).
+    youngs_modulus : ndarray
+        Youngs modulus (N,).
+    area : ndarray
+        Area of the cross section (N,).
+    prestress : ndarray
+        Prestress (N,).
+
+    Returns
+    -------
+    k : ndarray
+        Stack of element matrices (N, 6, 6).
+    """
+    D = _base_vectors(ref_locations)
+    d = _base_vectors(locations)
+
+    D_D = np.einsum('ij,ij->i', D, D)
+    d_d = np.einsum('ij,ij->i', d, d)
+
+    L = np.sqrt(D_D)
+
+    epsilon = (d_d - D_D) / (2 * D_D)
+    sigma = youngs_modulus * epsilon + prestress
+
+    k = _outer(youngs_modulus * area / L**3, d)
+    k += (sigma * area / L)[:, None, None] * _GEOMETRIC_PATTERN
+
+    return k
+
+
+def calculate_internal_forces(ref_locations, locations, youngs_modulus, area, prestress):
+    """Calculate the internal force vectors of N trusses.
+
+    Parameters
+    ----------
+    ref_locations : ndarray
+        Packed reference coordinates (N, 3, 2).
+    locations : ndarray
+        Packed actual coordinates (N, 3, 2).
+    youngs_modulus : ndarray
+        Youngs modulus (N,).
+    area : ndarray
+        Area of the cross section (N,).
+    prestress : ndarray
+        Prestress (N,).
+
+    Returns
+    -------
+    f : ndarray
+        Stack of element vectors (N, 6).
+    """
+    D = _base_vectors(ref_locations)
+    d = _base_vectors(locations)
+
+    D_D = np.einsum('ij,ij->i', D, D)
+    d_d = np.einsum('ij,ij->i', d, d)
+
+    L = np.sqrt(D_D)
+
+    epsilon = (d_d - D_D) / (2 * D_D)
+
+    D_pi = (epsilon * youngs_modulus + prestress) * area * L
+
+    return (D_pi / D_D)[:, None] * np.concatenate([-d, d], axis=1)
+
+
+def calculate_linear_normal_forces(ref_locations, displacements, youngs_modulus, area, prestress):
+    """Calculate the normal forces of N trusses for small displacements.
+
+    Parameters
+    ----------
+    ref_locations : ndarray
+        Packed reference coordinates (N, 3, 2).
+    displacements : ndarray
+        Displacements of node a and node b (..., N, 6) e.g. a stack for several load cases.
+    youngs_modulus : ndarray
+        Youngs modulus (N,).
+    area : ndarray
+        Area of the cross section (N,).
+    prestress : ndarray
+        Prestress (N,).
+
+    Returns
+    -------
+    n : ndarray
+        Normal forces (..., N).
+    """
+    D = _base_vectors(ref_locations)
+
+    D_D = np.einsum('ij,ij->i', D, D)
+
+    delta = displacements[..., 3:] - displacements[..., :3]
+
+    epsilon = np.einsum('...ij,ij->...i', delta, D) / D_D
+
+    return (epsilon * youngs_modulus + prestress) * area
+
+
+class TrussBatch:
+    """A TrussBatch evaluates a list of truss elements with the vectorized kernels.
+
+    The methods have the same names as the methods of a single `Truss` but return a stack
+    with the results of all elements. The Assembler uses the batch for the callbacks of type
+    `ElementMethod` which call one of the `batch_methods`.
+
+    Attributes
+    ----------
+    elements : list
+        List of the truss elements.
+    batch_methods : frozenset
+        Names of the methods which are evaluated for all elements at once.
+    """
+
+    batch_methods = frozenset([
+        'calculate_elastic_stiffness_matrix',
+        'calculate_material_stiffness_matrix',
+        'calculate_initial_displacement_stiffness_matrix',
+        'calculate_geometric_stiffness_matrix',
+        'calculate_stiffness_matrix',
+        'calculate_internal_forces',
+    ])
+
+    def __init__(self, elements):
+        """Create a new TrussBatch
+
+        Parameters
+        ----------
+        elements : list
+            List of truss elements.
+        """
+        self._elements = list(elements)
+        self._get_elements = None
+
+        # if all nodes store their dofs in the same state, the coordinates are gathered
+        # directly from the arrays of the state
+        self._state = None
+        self._location_indices = None
+
+        nodes = [node for e in self.elements for node in (e.node_a, e.node_b)]
+        states = {id(node._dof_x._state): node._dof_x._state for node in nodes}
+
+        if len(states) == 1:
+            first = np.fromiter((node._dof_x._index for node in nodes), int, len(nodes)).reshape(-1, 2)
+            self._state = next(iter(states.values()))
+            self._location_indices = first[:, None, :] + np.arange(3)[None, :, None]
+
+        # the same for the properties if all elements are stored in the same ElementState
+        self._element_state = None
+        self._element_indices = None
+        self._properties = None
+
+        element_states = {id(e._state): e._state for e in self.elements}
+
+        if len(element_states) == 1:
+            self._element_state = next(iter(element_states.values()))
+            self._element_indices = np.fromiter((e._index for e in self.elements), int, len(self.elements))
+
+    def __len__(self):
+        return len(self.elements)
+
+    @property
+    def elements(self):
+        if self._elements is None:
+            self._elements = list(self._get_elements())
+            self._get_elements = None
+        return self._elements
+
+    def _rebind(self, dof_state, element_state, get_elements):
+        # batch for the same trusses of a copy of the model which stores its dofs and
+        # properties in other states. The elements are only requested by the fallbacks
+        if self._state is None or self._element_state is None:
+            return TrussBatch(get_elements())
+        batch = TrussBatch.__new__(TrussBatch)
+        batch._elements = None
+        batch._get_elements = get_elements
+        batch._state = dof_state
+        batch._location_indices = self._location_indices
+        batch._element_state = element_state
+        batch._element_indices = self._element_indices
+        # the revision identifies the properties also in the copy of the state
+        batch._properties = self._properties
+        return batch
+
+    def pack_ref_locations(self):
+        """Get the packed reference coordinates (N, 3, 2) of the elements."""
+        if self._state is not None:
+            return self._state._ref_value[self._location_indices]
+        return np.array([[[a.ref_x, b.ref_x], [a.ref_y, b.ref_y], [a.ref_z, b.ref_z]]
+                         for a, b in ((e.node_a, e.node_b) for e in self.elements)], dtype=float).reshape(-1, 3, 2)
+
+    def pack_locations(self):
+        """Get the packed actual coordinates (N, 3, 2) of the elements."""
+        if self._state is not None:
+            return self._state._value[self._location_indices]
+        return np.array([[[a.x, b.x], [a.y, b.y], [a.z, b.z]]
+                         for a, b in ((e.node_a, e.node_b) for e in self.elements)], dtype=float).reshape(-1, 3, 2)
+
+    def pack_properties(self):
+        """Get the youngs modulus, area and prestress (N,) of the elements.
+
+        If the properties are stored in an `ElementState`, they are packed once and reused
+        until a property is modified.
+        """
+        if self._element_state is not None:
+            state, indices = self._element_state, self._element_indices
+
+            if self._properties is None or self._properties[0] != state.revision:
+                properties = (state.get_values('youngs_modulus', indices), state.get_values('area', indices),
+                              state.get_values('prestress', indices))
+                self._properties = (state.revision, properties)
+
+            return self._properties[1]
+
+        n = len(self.elements)
+        youngs_modulus = np.fromiter((e.youngs_modulus for e in self.elements), float, n)
+        area = np.fromiter((e.area for e in self.elements), float, n)
+        prestress = np.fromiter((e.prestress for e in self.elements), float, n)
+        return youngs_modulus, area, prestress
+
+    def calculate_elastic_stiffness_matrix(self):
+        E, A, _ = self.pack_properties()
+        return calculate_elastic_stiffness_matrices(self.pack_ref_locations(), E, A)
+
+    def calculate_material_stiffness_matrix(self):
+        E, A, _ = self.pack_properties()
+        return calculate_material_stiffness_matrices(self.pack_ref_locations(), self.pack_locations(), E, A)
+
+    def calculate_initial_displacement_stiffness_matrix(self):
+        return self.calculate_material_stiffness_matrix() - self.calculate_elastic_stiffness_matrix()
+
+    def calculate_geometric_stiffness_matrix(self, linear=False):
+        E, A, prestress = self.pack_properties()
+        return calculate_geometric_stiffness_matrices(self.pack_ref_locations(), self.pack_locations(), E, A, prestress, linear)
+
+    def calculate_stiffness_matrix(self):
+        E, A, prestress = self.pack_properties()
+        return calculate_stiffness_matrices(self.pack_ref_locations(), self.pack_locations(), E, A, prestress)
+
+    def calculate_internal_forces(self):
+        E, A, prestress = self.pack_properties()
+        return calculate_internal_forces(self.pack_ref_locations(), self.pack_locations(), E, A, prestress)